@@ -0,0 +1,171 @@
+import threading
+from typing import Any, Dict, Optional
+
+import motor.motor_asyncio
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from pymongo import monitoring
+
+from app.metrics import (
+    MONGO_POOL_CHECKOUT_FAILURES,
+    MONGO_POOL_CONNECTIONS,
+    MONGO_POOL_IN_USE,
+    MONGO_POOL_WAITING,
+    mongo_command_metrics,
+)
+
+
+class PoolStats(monitoring.ConnectionPoolListener):
+    """
+    Connection pool counters across all servers the client talks to:
+    open connections, connections checked out, operations waiting for a
+    connection, and failed checkouts by reason ("timeout" means the wait
+    queue timed out, i.e. the pool is saturated). pymongo calls these hooks
+    from its own threads, hence the lock.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.open = 0
+        self.in_use = 0
+        self.waiting = 0
+        self.max_waiting = 0
+        self.checkouts = 0
+        self.checkout_failures: Dict[str, int] = {}
+        self.pools_cleared = 0
+
+    def _add(self, field: str, delta: int, gauge) -> None:
+        with self._lock:
+            setattr(self, field, getattr(self, field) + delta)
+            if field == "waiting":
+                self.max_waiting = max(self.max_waiting, self.waiting)
+        gauge.inc(delta)
+
+    def pool_created(self, event): pass
+    def pool_ready(self, event): pass
+    def pool_closed(self, event): pass
+
+    def pool_cleared(self, event):
+        with self._lock:
+            self.pools_cleared += 1
+
+    def connection_created(self, event):
+        self._add("open", 1, MONGO_POOL_CONNECTIONS)
+
+    def connection_ready(self, event): pass
+
+    def connection_closed(self, event):
+        self._add("open", -1, MONGO_POOL_CONNECTIONS)
+
+    def connection_check_out_started(self, event):
+        self._add("waiting", 1, MONGO_POOL_WAITING)
+
+    def connection_check_out_failed(self, event):
+        self._add("waiting", -1, MONGO_POOL_WAITING)
+        reason = str(event.reason).lower().replace(" ", "_")
+        with self._lock:
+            self.checkout_failures[reason] = self.checkout_failures.get(reason, 0) + 1
+        MONGO_POOL_CHECKOUT_FAILURES.inc(reason=reason)
+
+    def connection_checked_out(self, event):
+        self._add("waiting", -1, MONGO_POOL_WAITING)
+        self._add("in_use", 1, MONGO_POOL_IN_USE)
+        with self._lock:
+            self.checkouts += 1
+
+    def connection_checked_in(self, event):
+        self._add("in_use", -1, MONGO_POOL_IN_USE)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "open": self.open,
+                "in_use": self.in_use,
+                "waiting": self.waiting,
+                "max_waiting": self.max_waiting,
+                "checkouts": self.checkouts,
+                "checkout_failures": dict(self.checkout_failures),
+                "pools_cleared": self.pools_cleared,
+            }
+
+
+def client_options(settings) -> Dict[str, Any]:
+    """AsyncIOMotorClient keyword arguments from the MONGO_* settings."""
+    options: Dict[str, Any] = {
+        "maxPoolSize": settings.mongo_max_pool_size,
+        "minPoolSize": settings.mongo_min_pool_size,
+        "serverSelectionTimeoutMS": settings.mongo_server_selection_timeout_ms,
+        "connectTimeoutMS": settings.mongo_connect_timeout_ms,
+        "readPreference": settings.mongo_read_preference,
+        "appname": settings.mongo_app_name,
+    }
+    optional = {
+        "maxIdleTimeMS": settings.mongo_max_idle_time_ms,
+        "waitQueueTimeoutMS": settings.mongo_wait_queue_timeout_ms,
+        "socketTimeoutMS": settings.mongo_socket_timeout_ms,
+    }
+    options.update({k: v for k, v in optional.items() if v is not None})
+    if settings.mongo_compressors:
+        options["compressors"] = settings.mongo_compressors
+    return options
+
+
+class Database:
+    """
+    Owns the process's single Motor client.
+
+    The API creates it in its lifespan (see app.main) and closes it on
+    shutdown; scripts and workers that never run the lifespan get it on
+    first use through get_database(). Every Motor call goes through this
+    client's pool, so the pool settings here bound the database
+    concurrency of the whole process.
+    """
+
+    def __init__(self):
+        self.client: Optional[AsyncIOMotorClient] = None
+        self.database_name: Optional[str] = None
+        self.max_pool_size: Optional[int] = None
+        self.pool_stats = PoolStats()
+
+    def connect(self, settings, client: Optional[AsyncIOMotorClient] = None) -> AsyncIOMotorDatabase:
+        """
+        Create the client if there is none yet and return the application
+        database. `client` installs a ready-made client instead (for example
+        mongomock-motor in benchmarks).
+        """
+        if self.client is None:
+            if client is None:
+                options = client_options(settings)
+                client = motor.motor_asyncio.AsyncIOMotorClient(
+                    settings.mongodb_uri,
+                    event_listeners=[mongo_command_metrics, self.pool_stats],
+                    **options,
+                )
+                self.max_pool_size = options["maxPoolSize"]
+            self.client = client
+            self.database_name = settings.database_name
+        return self.client[self.database_name]
+
+    @property
+    def db(self) -> AsyncIOMotorDatabase:
+        if self.client is None:
+            raise RuntimeError("Database is not connected")
+        return self.client[self.database_name]
+
+    def close(self) -> None:
+        if self.client is not None:
+            self.client.close()
+            self.client = None
+            print("MongoDB client closed.")
+
+    def stats(self) -> Dict[str, Any]:
+        out = {
+            "connected": self.client is not None,
+            "max_pool_size": self.max_pool_size,
+            **self.pool_stats.snapshot(),
+        }
+        if self.max_pool_size:
+            out["saturation"] = round(out["in_use"] / self.max_pool_size, 4)
+        return out
+
+
+database = Database()
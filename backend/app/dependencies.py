@@ -4,6 +4,8 @@ from pydantic_settings import BaseSettings
 from typing import AsyncGenerator
 from dotenv import load_dotenv
 
+from app.database import database
+
 load_dotenv()
 
 class Settings(BaseSettings):
@@ -13,23 +15,86 @@ class Settings(BaseSettings):
     jwt_secret_key: str
     jwt_algorithm: str = "HS256"
     access_token_expire_minutes: int = 60
+    user_cache_ttl_seconds: float = 30.0
+    user_cache_max_entries: int = 10000
+    trust_token_claims: bool = False
+    admin_usernames: str = ""  # comma-separated; only these users may read the internal stats endpoints
+
+    bcrypt_rounds: int = 12
+    password_hash_workers: int | None = None  # defaults to the CPU count
+    password_hash_max_pending: int = 64
 
     hf_provider: str
     hf_api_token: str
     hf_model_name: str
+    llm_timeout_seconds: float = 60.0
+    llm_max_concurrency: int = 8
+    llm_cache_max_entries: int = 1024
+    llm_cache_ttl_seconds: int = 3600
+    llm_cache_use_mongo: bool = False
+
+    plan_max_concurrency: int = 8
+    plan_cpu_workers: int = 4
+    plan_fast_path_enabled: bool = True
+    plan_stream_heartbeat_seconds: float = 15.0
+    plan_job_worker_in_process: bool = False  # otherwise run python -m app.jobs.plan_worker
+    plan_job_concurrency: int = 4
+    plan_job_max_attempts: int = 3
+    plan_job_lease_seconds: float = 300.0
+    plan_job_poll_seconds: float = 1.0
+    plan_job_result_ttl_seconds: int = 24 * 3600
+
+    progress_bulk_max_logs: int = 1000
+    export_batch_size: int = 500
+
+    notification_dispatcher_enabled: bool = True
+    notification_transport: str = "stub"  # see app.tools.push_notifier.TRANSPORTS
+    notification_workers: int = 2
+    notification_batch_size: int = 50
+    notification_max_attempts: int = 5
+    notification_backoff_base_seconds: float = 2.0
+    notification_backoff_max_seconds: float = 900.0
+    notification_poll_seconds: float = 1.0
+
+    recipe_db_path: str = ""  # defaults to app/data/recipes.sqlite3
+    recipe_cache_max_entries: int = 512
+    recipe_provider_base_url: str = ""  # empty disables the external provider
+    recipe_provider_api_key: str = ""
+    recipe_provider_timeout_seconds: float = 10.0
+    recipe_provider_max_connections: int = 20
+    recipe_provider_batch_size: int = 10
+    recipe_provider_cache_ttl_seconds: int = 7 * 24 * 3600
+
+    # Motor connection pool, see app.database.client_options
+    mongo_max_pool_size: int = 100
+    mongo_min_pool_size: int = 0
+    mongo_max_idle_time_ms: int | None = None
+    mongo_wait_queue_timeout_ms: int | None = None  # fail fast instead of queueing forever
+    mongo_server_selection_timeout_ms: int = 30000
+    mongo_connect_timeout_ms: int = 20000
+    mongo_socket_timeout_ms: int | None = None
+    mongo_compressors: str = ""  # e.g. "zstd,snappy,zlib"
+    mongo_read_preference: str = "primary"  # or primaryPreferred, secondaryPreferred, nearest, ...
+    mongo_app_name: str = "health-planner-api"
+
+    metrics_enabled: bool = True
+
+    # ETags and compression for complete responses (app.http_cache.HTTPCacheMiddleware)
+    http_cache_enabled: bool = True
+    http_compression_min_bytes: int = 1024
+    http_gzip_level: int = 6
+    http_brotli_quality: int = 4
+
+    # Serve plan endpoints with orjson, skipping response_model re-validation,
+    # and keep the serialized bodies of stored plans (see app.responses).
+    fast_json_responses: bool = False
+    response_cache_max_entries: int = 2048
+    response_cache_ttl_seconds: int = 3600
 
     model_config = {"env_file": ".env"}
 
 settings = Settings()
 
-client: motor.motor_asyncio.AsyncIOMotorClient | None = None
-
 async def get_database() -> AsyncGenerator[motor.motor_asyncio.AsyncIOMotorDatabase, None]:
-    global client
-    if client is None:
-        client = motor.motor_asyncio.AsyncIOMotorClient(settings.mongodb_uri)
-    db = client[settings.database_name]
-    try:
-        yield db
-    finally:
-        pass
+    # The client is closed by the lifespan (or the script) that owns it.
+    yield database.connect(settings)
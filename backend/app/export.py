@@ -0,0 +1,106 @@
+import csv
+import io
+import json
+import zlib
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Literal
+
+from bson import ObjectId
+from fastapi.responses import StreamingResponse
+
+from app.dependencies import settings
+
+ExportFormat = Literal["ndjson", "csv"]
+
+# Flush to the client once this much text has been buffered.
+CHUNK_BYTES = 64 * 1024
+
+_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, ObjectId):
+        return str(value)
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _csv_value(value: Any) -> Any:
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=_json_default, separators=(",", ":"))
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+async def ndjson_chunks(rows: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[bytes]:
+    buffer: List[str] = []
+    size = 0
+    async for row in rows:
+        line = json.dumps(row, default=_json_default, separators=(",", ":")) + "\n"
+        buffer.append(line)
+        size += len(line)
+        if size >= CHUNK_BYTES:
+            yield "".join(buffer).encode("utf-8")
+            buffer, size = [], 0
+    if buffer:
+        yield "".join(buffer).encode("utf-8")
+
+
+async def csv_chunks(
+    rows: AsyncIterator[Dict[str, Any]], fields: List[str]
+) -> AsyncIterator[bytes]:
+    """CSV with a header row; nested values are written as JSON."""
+    out = io.StringIO()
+    writer = csv.DictWriter(out, fieldnames=fields, extrasaction="ignore")
+    writer.writeheader()
+    async for row in rows:
+        writer.writerow({k: _csv_value(row.get(k)) for k in fields})
+        if out.tell() >= CHUNK_BYTES:
+            yield out.getvalue().encode("utf-8")
+            out.seek(0)
+            out.truncate()
+    if out.tell():
+        yield out.getvalue().encode("utf-8")
+
+
+async def gzip_chunks(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    async for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def export_response(
+    rows: AsyncIterator[Dict[str, Any]],
+    fmt: ExportFormat,
+    filename: str,
+    csv_fields: List[str],
+    compress: bool = False,
+) -> StreamingResponse:
+    """
+    Stream `rows` (normally straight off a Motor cursor) as NDJSON or CSV,
+    optionally gzipped into a .gz download. Nothing is materialized: memory
+    is bounded by the cursor batch and CHUNK_BYTES.
+    """
+    body = ndjson_chunks(rows) if fmt == "ndjson" else csv_chunks(rows, csv_fields)
+    name = f"{filename}.{fmt}"
+    media_type = _MEDIA_TYPES[fmt]
+    if compress:
+        body = gzip_chunks(body)
+        name += ".gz"
+        media_type = "application/gzip"
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{name}"'},
+    )
+
+
+async def cursor_rows(cursor: Any) -> AsyncIterator[Dict[str, Any]]:
+    """Iterate a Motor cursor with the export batch size applied."""
+    async for row in cursor.batch_size(settings.export_batch_size):
+        yield row
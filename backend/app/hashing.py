@@ -0,0 +1,115 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, Optional, Tuple
+
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+
+from app.dependencies import settings
+
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.bcrypt_rounds,
+)
+
+
+class PasswordHasherPool:
+    """
+    Runs bcrypt on a dedicated, size-limited thread pool so hashing never
+    blocks the event loop. bcrypt releases the GIL, so throughput scales with
+    the number of workers.
+
+    Admission control: once `max_pending` jobs are queued or running, new
+    requests are rejected immediately with 503 instead of piling up. A job
+    stays pending until its thread finishes, even if the caller that
+    submitted it was cancelled, since the thread is still busy.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="bcrypt"
+            )
+        return self._executor
+
+    async def _run(self, fn, *args):
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Authentication service is busy, please retry",
+                headers={"Retry-After": "1"},
+            )
+        with self._lock:
+            self.pending += 1
+        try:
+            job = self._get_executor().submit(fn, *args)
+        except BaseException:
+            with self._lock:
+                self.pending -= 1
+            raise
+        job.add_done_callback(self._job_done)
+        return await asyncio.wrap_future(job)
+
+    def _job_done(self, job: Future) -> None:
+        # Runs on the worker thread (or the loop, if the job was cancelled
+        # before it started).
+        with self._lock:
+            self.pending -= 1
+            if job.cancelled():
+                return
+            if job.exception() is None:
+                self.completed += 1
+            else:
+                self.failed += 1
+
+    async def hash(self, password: str) -> str:
+        return await self._run(pwd_context.hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(pwd_context.verify, plain_password, hashed_password)
+
+    async def verify_and_update(
+        self, plain_password: str, hashed_password: str
+    ) -> Tuple[bool, Optional[str]]:
+        """
+        Like `verify`, but also returns a new hash when the stored one uses an
+        outdated cost factor.
+        """
+        return await self._run(pwd_context.verify_and_update, plain_password, hashed_password)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "pending": self.pending,
+            "queued": max(0, self.pending - self.workers),
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "bcrypt_rounds": settings.bcrypt_rounds,
+        }
+
+
+password_hasher = PasswordHasherPool(
+    workers=settings.password_hash_workers or os.cpu_count() or 1,
+    max_pending=settings.password_hash_max_pending,
+)
@@ -0,0 +1,262 @@
+import gzip
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import List, Optional, Tuple
+
+from fastapi import Request, Response
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import brotli
+except ImportError:  # optional; without it only gzip is offered
+    brotli = None
+
+
+def make_etag(token: str, weak: bool = False) -> str:
+    return f'{"W/" if weak else ""}"{token}"'
+
+
+def version_etag(*parts: object) -> str:
+    """
+    Weak ETag for a representation identified by a version, e.g.
+    (user_id, profile["updated_at"]), without serializing it.
+    """
+    token = hashlib.blake2b("|".join(str(p) for p in parts).encode(), digest_size=12).hexdigest()
+    return make_etag(token, weak=True)
+
+
+def content_etag(body: bytes) -> str:
+    """Weak ETag from a hash of the (uncompressed) body."""
+    return make_etag(hashlib.blake2b(body, digest_size=12).hexdigest(), weak=True)
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    True when the request's If-None-Match header covers `etag`. Comparison is
+    weak, as RFC 9110 requires for If-None-Match.
+    """
+    return _none_match_covers(request.headers.get("if-none-match"), etag)
+
+
+def _none_match_covers(header: Optional[str], etag: str) -> bool:
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    wanted = etag[2:] if etag.startswith("W/") else etag
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == wanted:
+            return True
+    return False
+
+
+def modified_since(request: Request, last_modified: datetime) -> bool:
+    """
+    False when If-Modified-Since is at or after `last_modified` (naive UTC),
+    at the one-second resolution of HTTP dates.
+    """
+    header = request.headers.get("if-modified-since")
+    if not header:
+        return True
+    try:
+        since = parsedate_to_datetime(header)
+    except (TypeError, ValueError):
+        return True
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    modified = last_modified.replace(tzinfo=timezone.utc, microsecond=0)
+    return modified > since
+
+
+def is_fresh(request: Request, etag: str, last_modified: Optional[datetime] = None) -> bool:
+    """
+    True when the client's cached copy is current. If-None-Match takes
+    precedence over If-Modified-Since (RFC 9110, 13.2.2).
+    """
+    if request.headers.get("if-none-match"):
+        return etag_matches(request, etag)
+    if last_modified is not None and request.headers.get("if-modified-since"):
+        return not modified_since(request, last_modified)
+    return False
+
+
+def http_date(value: datetime) -> str:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def set_cache_headers(
+    response: Response, etag: str, last_modified: Optional[datetime] = None
+) -> None:
+    response.headers["ETag"] = etag
+    # Personal data: browsers may keep it, but must revalidate every time.
+    response.headers["Cache-Control"] = "private, no-cache"
+    if last_modified is not None:
+        response.headers["Last-Modified"] = http_date(last_modified)
+
+
+def not_modified(etag: str, last_modified: Optional[datetime] = None) -> Response:
+    response = Response(status_code=304)
+    set_cache_headers(response, etag, last_modified)
+    return response
+
+
+def conditional(
+    request: Request, response: Response, etag: str, last_modified: Optional[datetime] = None
+) -> Optional[Response]:
+    """
+    Return a 304 if the client's copy is current; otherwise set the caching
+    headers on `response` and return None so the handler builds the body.
+    """
+    if is_fresh(request, etag, last_modified):
+        return not_modified(etag, last_modified)
+    set_cache_headers(response, etag, last_modified)
+    return None
+
+
+COMPRESSIBLE_TYPES = ("application/json", "text/", "application/javascript", "image/svg+xml")
+# Headers a 304 must repeat from the 200 it stands for.
+_NOT_MODIFIED_HEADERS = {b"etag", b"cache-control", b"last-modified", b"vary", b"expires"}
+
+
+def _accepted_encodings(header: str) -> List[str]:
+    accepted = []
+    for part in header.split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if q > 0:
+            accepted.append(name.strip().lower())
+    return accepted
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    accepted = _accepted_encodings(accept_encoding)
+    if brotli is not None and ("br" in accepted or "*" in accepted):
+        return "br"
+    if "gzip" in accepted or "*" in accepted:
+        return "gzip"
+    return None
+
+
+class HTTPCacheMiddleware:
+    """
+    ASGI middleware for complete (non-streaming) responses:
+
+    - GET 200 responses without an ETag get a weak one from a hash of the
+      body, and a "private, no-cache" Cache-Control unless they set one;
+    - a GET whose If-None-Match matches the response's ETag (computed here or
+      set by the handler) gets a bodiless 304;
+    - bodies of at least `minimum_size` bytes of a text or JSON type are
+      compressed with brotli or gzip, per Accept-Encoding.
+
+    Handlers with a cheap version (profile updated_at, plan id) should call
+    conditional() themselves so a 304 skips building the body; this layer
+    catches everything else. Streaming responses pass through untouched.
+    """
+
+    def __init__(
+        self,
+        app,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        auto_etag: bool = True,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.auto_etag = auto_etag
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = Headers(scope=scope)
+        is_get = scope["method"] == "GET"
+        start: Optional[dict] = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start, passthrough
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+            if message.get("more_body", False):
+                # Streaming response: send as is.
+                passthrough = True
+                await send(start)
+                await send(message)
+                return
+            for out in self._finish(start, message.get("body", b""), request_headers, is_get):
+                await send(out)
+
+        await self.app(scope, receive, send_wrapper)
+
+    def _finish(
+        self, start: dict, body: bytes, request_headers: Headers, is_get: bool
+    ) -> Tuple[dict, ...]:
+        headers = MutableHeaders(raw=start["headers"])
+        status_code = start["status"]
+        if status_code == 304:
+            # Same Vary as the (possibly compressed) 200 it stands for.
+            headers.add_vary_header("Accept-Encoding")
+
+        if is_get and status_code == 200:
+            if self.auto_etag and "etag" not in headers and body:
+                headers["ETag"] = content_etag(body)
+                if "cache-control" not in headers:
+                    headers["Cache-Control"] = "private, no-cache"
+            etag = headers.get("etag")
+            if etag and _none_match_covers(request_headers.get("if-none-match"), etag):
+                headers.add_vary_header("Accept-Encoding")
+                raw = [(k, v) for k, v in headers.raw if k.lower() in _NOT_MODIFIED_HEADERS]
+                return (
+                    {"type": "http.response.start", "status": 304, "headers": raw},
+                    {"type": "http.response.body", "body": b""},
+                )
+
+        content_type = headers.get("content-type", "")
+        if (
+            len(body) >= self.minimum_size
+            and "content-encoding" not in headers
+            and content_type.startswith(COMPRESSIBLE_TYPES)
+        ):
+            headers.add_vary_header("Accept-Encoding")
+            encoding = choose_encoding(request_headers.get("accept-encoding", ""))
+            if encoding is not None:
+                if encoding == "br":
+                    body = brotli.compress(body, quality=self.brotli_quality)
+                else:
+                    body = gzip.compress(body, compresslevel=self.gzip_level)
+                headers["Content-Encoding"] = encoding
+                headers["Content-Length"] = str(len(body))
+                etag = headers.get("etag")
+                if etag and not etag.startswith("W/"):
+                    # The encoded bytes differ, so a strong validator no longer holds.
+                    headers["ETag"] = "W/" + etag
+
+        return (
+            {**start, "headers": headers.raw},
+            {"type": "http.response.body", "body": body},
+        )
+
@@ -0,0 +1,119 @@
+from datetime import datetime
+from typing import Any, Dict, List
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import PyMongoError
+
+# Every index the application relies on, per collection. create_indexes is
+# idempotent, so this is safe to run on every startup.
+INDEX_SPECS: Dict[str, List[IndexModel]] = {
+    "users": [
+        IndexModel([("username", ASCENDING)], unique=True, name="username_unique"),
+        IndexModel([("email", ASCENDING)], unique=True, name="email_unique"),
+    ],
+    "health_profiles": [
+        IndexModel([("user_id", ASCENDING)], unique=True, name="user_id_unique"),
+    ],
+    "plans": [
+        IndexModel(
+            [("user_id", ASCENDING), ("plan_type", ASCENDING), ("version", DESCENDING)],
+            unique=True,
+            name="user_plan_version_unique",
+        ),
+        IndexModel(
+            [
+                ("user_id", ASCENDING),
+                ("plan_type", ASCENDING),
+                ("profile_version", DESCENDING),
+                ("version", DESCENDING),
+            ],
+            name="user_plan_profile_version",
+        ),
+    ],
+    "llm_cache": [
+        IndexModel([("expires_at", ASCENDING)], expireAfterSeconds=0, name="expires_at_ttl"),
+    ],
+    "daily_logs": [
+        IndexModel(
+            [("user_id", ASCENDING), ("date", ASCENDING), ("created_at", ASCENDING)],
+            name="user_date_created",
+        ),
+    ],
+    "progress_rollups": [
+        IndexModel(
+            [("user_id", ASCENDING), ("period", ASCENDING), ("key", DESCENDING)],
+            name="user_period_key",
+        ),
+    ],
+    "notification_outbox": [
+        IndexModel([("status", ASCENDING), ("next_attempt_at", ASCENDING)], name="status_next_attempt"),
+        IndexModel([("claim", ASCENDING)], sparse=True, name="claim"),
+        IndexModel(
+            [("dedupe_key", ASCENDING)],
+            unique=True,
+            partialFilterExpression={"dedupe_key": {"$exists": True}},
+            name="dedupe_key_unique",
+        ),
+    ],
+    "reminders": [
+        IndexModel([("active", ASCENDING), ("next_run_at", ASCENDING)], name="active_next_run"),
+        IndexModel([("user_id", ASCENDING)], name="user_id"),
+    ],
+    "recipe_cache": [
+        IndexModel([("expires_at", ASCENDING)], expireAfterSeconds=0, name="expires_at_ttl"),
+    ],
+    "plan_jobs": [
+        IndexModel([("status", ASCENDING), ("created_at", ASCENDING)], name="status_created"),
+        IndexModel(
+            [("active_key", ASCENDING)],
+            unique=True,
+            partialFilterExpression={"active_key": {"$exists": True}},
+            name="active_key_unique",
+        ),
+        IndexModel([("expires_at", ASCENDING)], expireAfterSeconds=0, name="expires_at_ttl"),
+    ],
+}
+
+# Collections that must be created as MongoDB time-series collections before
+# their indexes. On servers without time-series support (< 5.0) they are
+# reported as failed and fall back to ordinary collections on first insert.
+TIMESERIES_COLLECTIONS: Dict[str, Dict[str, Any]] = {
+    "daily_logs": {"timeField": "ts", "metaField": "user_id", "granularity": "hours"},
+}
+
+# Result of the last ensure_indexes() run, served by GET /api/health/indexes.
+index_status: Dict[str, Any] = {"checked_at": None, "collections": {}}
+
+
+async def ensure_indexes(db: AsyncIOMotorDatabase) -> Dict[str, Any]:
+    """
+    Create the TIMESERIES_COLLECTIONS, then declare all indexes in INDEX_SPECS.
+    A failure on one collection (for example existing duplicate usernames
+    blocking a unique index) is recorded and reported, but does not stop the
+    others or the application.
+    """
+    collections: Dict[str, Any] = {}
+    try:
+        existing = set(await db.list_collection_names())
+    except PyMongoError:
+        existing = set()
+    for collection, options in TIMESERIES_COLLECTIONS.items():
+        if collection in existing:
+            continue
+        try:
+            await db.create_collection(collection, timeseries=options)
+        except PyMongoError as e:
+            collections[f"{collection} (time-series)"] = {"status": "failed", "error": str(e)}
+
+    for collection, models in INDEX_SPECS.items():
+        names = [m.document["name"] for m in models]
+        try:
+            await db[collection].create_indexes(models)
+            collections[collection] = {"indexes": names, "status": "ready"}
+        except PyMongoError as e:
+            collections[collection] = {"indexes": names, "status": "failed", "error": str(e)}
+
+    index_status["checked_at"] = datetime.utcnow()
+    index_status["collections"] = collections
+    return index_status
@@ -0,0 +1,51 @@
+"""
+Run queued plan jobs (POST /api/health/plan?background=true).
+
+Claims jobs from the `plan_jobs` collection and runs the same orchestration
+as the synchronous endpoint, at most --concurrency at a time. Several worker
+processes can share one queue.
+
+    python -m app.jobs.plan_worker --concurrency 8
+"""
+import argparse
+import asyncio
+
+from ..database import database
+from ..dependencies import get_database
+from ..lmm_client import close_hf_client
+from ..orchestration.executor import plan_executor
+from ..plan_jobs import plan_job_worker
+from ..recipe_provider import recipe_provider
+from ..routers.health import orchestrate_plan
+from ..tools.recipe_store import recipe_store
+from ..tools.workout_generator import warm_cache as warm_workout_cache
+
+
+async def _main(args: argparse.Namespace) -> None:
+    if args.concurrency:
+        plan_job_worker.concurrency = args.concurrency
+    recipe_store.load()
+    warm_workout_cache()
+    async for db in get_database():
+        recipe_provider.attach_database(db)
+        plan_job_worker.start(db, orchestrate_plan)
+        print(f"Plan job worker running with concurrency {plan_job_worker.concurrency}")
+        try:
+            await plan_job_worker.wait()
+        finally:
+            await plan_job_worker.stop()
+            await close_hf_client()
+            await recipe_provider.close()
+            plan_executor.shutdown()
+            recipe_store.close()
+            database.close()
+        break
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=0, help="defaults to PLAN_JOB_CONCURRENCY")
+    try:
+        asyncio.run(_main(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,127 @@
+"""
+Re-plan every stored health profile, e.g. after a food catalog change.
+
+Streams `health_profiles` from Mongo in batches, computes BMR for the whole
+batch with NumPy, generates the meal plans and bulk-writes them as new
+versions in the `plans` collection. Profiles missing a field the plan needs
+are skipped and listed.
+
+    python -m app.jobs.replan_cohort --batch-size 2000
+"""
+import argparse
+import asyncio
+import time
+from numbers import Real
+from typing import Any, Dict, List
+
+import numpy as np
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from ..database import database
+from ..dependencies import get_database
+from ..repositories.plans import save_plans_bulk
+from ..repositories.profiles import PROFILES_COLLECTION
+from ..tools.bmr_calculator import ACTIVITY_FACTOR, calculate_bmr_batch, encode_genders
+from ..tools.meal_planner import generate_meal_plans
+
+PROFILE_PROJECTION = {
+    "_id": 0,
+    "user_id": 1,
+    "age": 1,
+    "weight": 1,
+    "height": 1,
+    "gender": 1,
+    "dietary_preferences": 1,
+    "updated_at": 1,
+}
+NUMERIC_FIELDS = ("age", "weight", "height")
+
+
+def missing_fields(profile: Dict[str, Any]) -> List[str]:
+    """Fields plan_batch needs that are absent or unusable in `profile`."""
+    missing = [
+        f for f in NUMERIC_FIELDS
+        if not isinstance(profile.get(f), Real) or isinstance(profile.get(f), bool)
+    ]
+    missing += [f for f in ("user_id", "gender", "updated_at") if profile.get(f) is None]
+    return missing
+
+
+def plan_batch(profiles: List[Dict[str, Any]], days: int) -> List[Dict[str, Any]]:
+    """
+    Build meal plan payloads (same shape as GET /mealplan) for a batch.
+    """
+    bmr = calculate_bmr_batch(
+        age=np.fromiter((p["age"] for p in profiles), dtype=np.float64, count=len(profiles)),
+        weight=np.fromiter((p["weight"] for p in profiles), dtype=np.float64, count=len(profiles)),
+        height=np.fromiter((p["height"] for p in profiles), dtype=np.float64, count=len(profiles)),
+        gender_codes=encode_genders(p["gender"] for p in profiles),
+    )
+    calorie_targets = np.round(bmr * ACTIVITY_FACTOR, 2)
+    plans = generate_meal_plans(
+        calorie_targets.tolist(),
+        [p.get("dietary_preferences") or [] for p in profiles],
+        days=days,
+    )
+    return [
+        {"calorie_target": target, "days": days_list}
+        for target, days_list in zip(calorie_targets.tolist(), plans)
+    ]
+
+
+async def replan_cohort(
+    db: AsyncIOMotorDatabase, batch_size: int, days: int, dry_run: bool = False
+) -> Dict[str, Any]:
+    started = time.perf_counter()
+    seen = planned = stored = skipped = 0
+    batch: List[Dict[str, Any]] = []
+
+    async def flush() -> None:
+        nonlocal planned, stored
+        payloads = plan_batch(batch, days)
+        planned += len(payloads)
+        if not dry_run:
+            stored += await save_plans_bulk(
+                db,
+                "meal",
+                [(p["user_id"], p["updated_at"], payload) for p, payload in zip(batch, payloads)],
+            )
+        batch.clear()
+
+    cursor = db[PROFILES_COLLECTION].find({}, PROFILE_PROJECTION).batch_size(batch_size)
+    async for profile in cursor:
+        seen += 1
+        missing = missing_fields(profile)
+        if missing:
+            skipped += 1
+            print(f"Skipping profile of user {profile.get('user_id')}: missing {', '.join(missing)}")
+            continue
+        batch.append(profile)
+        if len(batch) >= batch_size:
+            await flush()
+    if batch:
+        await flush()
+
+    return {
+        "profiles": seen,
+        "planned": planned,
+        "stored": stored,
+        "skipped": skipped,
+        "seconds": round(time.perf_counter() - started, 3),
+    }
+
+
+async def _main(args: argparse.Namespace) -> None:
+    async for db in get_database():
+        summary = await replan_cohort(db, args.batch_size, args.days, args.dry_run)
+        print(summary)
+        break
+    database.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--days", type=int, default=7)
+    parser.add_argument("--dry-run", action="store_true", help="plan but do not write")
+    asyncio.run(_main(parser.parse_args()))
@@ -0,0 +1,91 @@
+import hashlib
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from app.dependencies import settings
+from app.ttl_cache import TTLCache
+
+LLM_CACHE_COLLECTION = "llm_cache"
+
+
+class LLMResponseCache:
+    """
+    Content-addressed cache of LLM completions, keyed by sha256(model + prompt).
+
+    Tier 1 is an in-process LRU with TTL. Tier 2 is an optional Mongo
+    collection shared by every worker; entries there expire via the TTL
+    index declared in app.indexes.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: int, use_mongo: bool):
+        self.memory: TTLCache[str] = TTLCache(max_entries, ttl_seconds)
+        self.ttl_seconds = ttl_seconds
+        self.use_mongo = use_mongo
+        self.mongo_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(prompt: str, model: Optional[str] = None) -> str:
+        model = model or settings.hf_model_name
+        return hashlib.sha256(f"{model}\0{prompt}".encode("utf-8")).hexdigest()
+
+    async def get(self, prompt: str, db: Optional[AsyncIOMotorDatabase] = None) -> Optional[str]:
+        key = self.key(prompt)
+        value = self.memory.get(key)
+        if value is not None:
+            return value
+
+        if self.use_mongo and db is not None:
+            # The TTL monitor only runs once a minute, so check expiry here too.
+            row = await db[LLM_CACHE_COLLECTION].find_one(
+                {"_id": key, "expires_at": {"$gt": datetime.utcnow()}}
+            )
+            if row:
+                self.mongo_hits += 1
+                self.memory.set(key, row["response"])
+                return row["response"]
+
+        self.misses += 1
+        return None
+
+    async def set(
+        self, prompt: str, response: str, db: Optional[AsyncIOMotorDatabase] = None
+    ) -> None:
+        key = self.key(prompt)
+        self.memory.set(key, response)
+
+        if self.use_mongo and db is not None:
+            now = datetime.utcnow()
+            await db[LLM_CACHE_COLLECTION].update_one(
+                {"_id": key},
+                {"$set": {
+                    "model": settings.hf_model_name,
+                    "response": response,
+                    "created_at": now,
+                    "expires_at": now + timedelta(seconds=self.ttl_seconds),
+                }},
+                upsert=True,
+            )
+
+    def stats(self) -> Dict[str, Any]:
+        memory_hits = self.memory.hits
+        hits = memory_hits + self.mongo_hits
+        total = hits + self.misses
+        return {
+            "hits": hits,
+            "memory_hits": memory_hits,
+            "mongo_hits": self.mongo_hits,
+            "misses": self.misses,
+            "hit_rate": round(hits / total, 4) if total else 0.0,
+            "memory_size": len(self.memory),
+            "mongo_enabled": self.use_mongo,
+        }
+
+
+llm_cache = LLMResponseCache(
+    max_entries=settings.llm_cache_max_entries,
+    ttl_seconds=settings.llm_cache_ttl_seconds,
+    use_mongo=settings.llm_cache_use_mongo,
+)
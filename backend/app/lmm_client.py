@@ -1,36 +1,132 @@
+import asyncio
+import time
+from contextlib import contextmanager
+from typing import AsyncIterator, Iterator
+
 from fastapi import HTTPException
-from huggingface_hub import InferenceClient
-from app.dependencies import settings 
+from huggingface_hub import AsyncInferenceClient
+from app.dependencies import settings
+from app.metrics import LLM_IN_FLIGHT, LLM_LATENCY
+
+_client: AsyncInferenceClient | None = None
+_semaphore: asyncio.Semaphore | None = None
 
-_client: InferenceClient | None = None
 
-def get_hf_client() -> InferenceClient:
+def get_hf_client() -> AsyncInferenceClient:
+    """
+    Return the process-wide async inference client. The client keeps a single
+    HTTP session open, so connections to the provider are reused across calls.
+    """
     global _client
     if _client is None:
-        _client = InferenceClient(
+        _client = AsyncInferenceClient(
             provider=settings.hf_provider,
             api_key=settings.hf_api_token,
+            timeout=settings.llm_timeout_seconds,
         )
     return _client
 
-def ask_llm(prompt: str) -> str:
-    client = get_hf_client()
+
+def _get_semaphore() -> asyncio.Semaphore:
+    global _semaphore
+    if _semaphore is None:
+        _semaphore = asyncio.Semaphore(settings.llm_max_concurrency)
+    return _semaphore
+
+
+async def close_hf_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
+
+
+@contextmanager
+def _instrument(mode: str) -> Iterator[None]:
+    """Record an LLM call in the llm_request_duration_seconds histogram."""
+    started = time.perf_counter()
+    outcome = "ok"
+    LLM_IN_FLIGHT.inc()
     try:
-        completion = client.chat.completions.create(
-            model=settings.hf_model_name,
-            messages=[{"role": "user", "content": prompt}],
+        yield
+    except HTTPException as e:
+        outcome = "timeout" if e.status_code == 504 else "error"
+        raise
+    except BaseException:
+        outcome = "cancelled"
+        raise
+    finally:
+        LLM_IN_FLIGHT.dec()
+        LLM_LATENCY.observe(time.perf_counter() - started, mode=mode, outcome=outcome)
+
+
+async def ask_llm(prompt: str, timeout: float | None = None) -> str:
+    with _instrument("complete"):
+        client = get_hf_client()
+        timeout = timeout if timeout is not None else settings.llm_timeout_seconds
+
+        async with _get_semaphore():
+            try:
+                completion = await asyncio.wait_for(
+                    client.chat.completions.create(
+                        model=settings.hf_model_name,
+                        messages=[{"role": "user", "content": prompt}],
+                    ),
+                    timeout=timeout,
+                )
+            except asyncio.TimeoutError:
+                raise HTTPException(status_code=504, detail="LLM inference timed out")
+            except Exception as e:
+                raise HTTPException(status_code=502, detail=f"LLM inference error: {e}")
+
+        if (
+            hasattr(completion, "choices")
+            and len(completion.choices) > 0
+            and hasattr(completion.choices[0], "message")
+        ):
+            return completion.choices[0].message.content
+
+        raise HTTPException(
+            status_code=502,
+            detail="LLM did not return a valid completion structure"
         )
-    except Exception as e:
-        raise HTTPException(status_code=502, detail=f"LLM inference error: {e}")
-
-    if (
-        hasattr(completion, "choices")
-        and len(completion.choices) > 0
-        and hasattr(completion.choices[0], "message")
-    ):
-        return completion.choices[0].message.content
-
-    raise HTTPException(
-        status_code=502,
-        detail="LLM did not return a valid completion structure"
-    )
+
+
+async def ask_llm_stream(prompt: str, timeout: float | None = None) -> AsyncIterator[str]:
+    """
+    Stream the completion as text deltas. `timeout` bounds the whole stream,
+    not each chunk.
+    """
+    with _instrument("stream"):
+        client = get_hf_client()
+        timeout = timeout if timeout is not None else settings.llm_timeout_seconds
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+
+        async with _get_semaphore():
+            try:
+                stream = await asyncio.wait_for(
+                    client.chat.completions.create(
+                        model=settings.hf_model_name,
+                        messages=[{"role": "user", "content": prompt}],
+                        stream=True,
+                    ),
+                    timeout=timeout,
+                )
+                iterator = stream.__aiter__()
+                while True:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        raise asyncio.TimeoutError
+                    try:
+                        chunk = await asyncio.wait_for(iterator.__anext__(), timeout=remaining)
+                    except StopAsyncIteration:
+                        break
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        yield chunk.choices[0].delta.content
+            except asyncio.TimeoutError:
+                raise HTTPException(status_code=504, detail="LLM inference timed out")
+            except HTTPException:
+                raise
+            except Exception as e:
+                raise HTTPException(status_code=502, detail=f"LLM inference error: {e}")
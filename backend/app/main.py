@@ -1,12 +1,60 @@
+from contextlib import asynccontextmanager
+
 import uvicorn
 from fastapi import FastAPI
-from .dependencies import settings, client
-from .routers import health, auth
+from fastapi.responses import PlainTextResponse
+from .dependencies import settings
+from .database import database
+from .routers import health, auth, progress, notifications
+from .lmm_client import close_hf_client
+from .hashing import password_hasher
+from .indexes import ensure_indexes
+from .orchestration.executor import plan_executor
+from .tools.recipe_store import recipe_store
+from .tools.workout_generator import warm_cache as warm_workout_cache
+from .recipe_provider import recipe_provider
+from .notifications import notification_dispatcher
+from .plan_jobs import plan_job_worker
+from .metrics import REGISTRY, MetricsMiddleware
+from .http_cache import HTTPCacheMiddleware
 from fastapi.middleware.cors import CORSMiddleware
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Creates the one Motor client for the process and starts the background
+    workers; on shutdown stops them and closes the client, the LLM HTTP
+    session and the worker pools.
+    """
+    db = database.connect(settings)
+    report = await ensure_indexes(db)
+    recipe_provider.attach_database(db)
+    if settings.notification_dispatcher_enabled:
+        notification_dispatcher.start(db)
+    if settings.plan_job_worker_in_process:
+        plan_job_worker.start(db, health.orchestrate_plan)
+    print(f"Connected to MongoDB at {settings.mongodb_uri}, DB: {settings.database_name}")
+    for name, info in report["collections"].items():
+        print(f"Indexes on {name}: {info['status']} {info.get('error', '')}".rstrip())
+    recipe_store.load()
+    warm_workout_cache()
+
+    yield
+
+    await notification_dispatcher.stop()
+    await plan_job_worker.stop()
+    database.close()
+    await close_hf_client()
+    password_hasher.shutdown()
+    plan_executor.shutdown()
+    recipe_store.close()
+    await recipe_provider.close()
+
+
 app = FastAPI(
     title="Personalized Health & Fitness Planner API",
-    version="0.1.0"
+    version="0.1.0",
+    lifespan=lifespan,
 )
 app.add_middleware(
     CORSMiddleware,
@@ -15,30 +63,29 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+if settings.http_cache_enabled:
+    app.add_middleware(
+        HTTPCacheMiddleware,
+        minimum_size=settings.http_compression_min_bytes,
+        gzip_level=settings.http_gzip_level,
+        brotli_quality=settings.http_brotli_quality,
+    )
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware)
 
 app.include_router(auth.router)
 app.include_router(health.router, prefix="/api/health", tags=["health"])
+app.include_router(progress.router)
+app.include_router(notifications.router)
 
-@app.on_event("startup")
-async def startup_db_client():
- 
-    global client
-    if client is None:
-       
-        from .dependencies import get_database
-        async for _ in get_database():
-            break
-    print(f"Connected to MongoDB at {settings.mongodb_uri}, DB: {settings.database_name}")
 
-@app.on_event("shutdown")
-async def shutdown_db_client():
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
     """
-    Closes the global Motor client when the application shuts down.
+    Request, MongoDB, LLM and tool-step timings in the Prometheus text format.
     """
-    global client
-    if client:
-        client.close()
-        print("MongoDB client closed.")
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
 
 if __name__ == "__main__":
     uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True)
@@ -1,9 +1,10 @@
 # backend/app/models/schemas.py
 
-from typing import Optional, List, Dict, Any
-from datetime import datetime
+from typing import Optional, List, Dict, Any, Literal
+from datetime import datetime, date as date_type
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
-from pydantic import BaseModel, EmailStr, field_validator, ConfigDict
+from pydantic import BaseModel, EmailStr, Field, field_validator, ConfigDict
 from bson import ObjectId
 
 
@@ -88,6 +89,8 @@ class HealthProfileResponse(HealthProfileBase):
 class MealPlanDay(BaseModel):
     day: int
     meals: Dict[str, str]  # e.g., {"breakfast": "Oatmeal", "lunch": "Salad", ...}
+    servings: Optional[Dict[str, float]] = None  # e.g., {"breakfast": 1.25, "snack_1": 1.0, ...}
+    totals: Optional["NutritionInfo"] = None
 
 class MealPlanResponse(BaseModel):
     calorie_target: float
@@ -104,9 +107,11 @@ class ExerciseItem(BaseModel):
     name: str
     reps: Optional[str]
     duration: Optional[str]
+    rest: Optional[str] = None
 
 class WorkoutPlanDay(BaseModel):
     day: int
+    focus: Optional[str] = None  # e.g. "Upper body", "Active recovery"
     exercises: List[ExerciseItem]
 
 class WorkoutPlanResponse(BaseModel):
@@ -133,6 +138,10 @@ class RecipeResponse(BaseModel):
 
     model_config = ConfigDict(from_attributes=True)
 
+class MealPlanRecipesResponse(BaseModel):
+    recipes: Dict[str, RecipeResponse]  # keyed by dish name as it appears in the plan
+    missing: List[str] = []
+
 
 # ============================
 # PROGRESS TRACKER SCHEMAS
@@ -140,9 +149,17 @@ class RecipeResponse(BaseModel):
 
 class DailyLogBase(BaseModel):
     date: str            # ISO date string, e.g. "2025-06-01"
-    weight: float
-    calories_in: int
-    calories_out: int
+    weight: float = Field(gt=0)
+    calories_in: int = Field(ge=0)
+    calories_out: int = Field(ge=0)
+
+    @field_validator("date")
+    @classmethod
+    def check_iso_date(cls, v: str) -> str:
+        try:
+            return date_type.fromisoformat(v).isoformat()
+        except ValueError:
+            raise ValueError("date must be an ISO date, e.g. 2025-06-01")
 
 class DailyLogCreate(DailyLogBase):
     pass
@@ -166,3 +183,98 @@ class ProgressSummary(BaseModel):
     weight_change: float  # last_weight - first_weight
 
     model_config = ConfigDict(from_attributes=True)
+
+class ProgressRollup(BaseModel):
+    period: str          # "week" or "month"
+    key: str             # ISO week ("2025-W23") or month ("2025-06")
+    days_logged: int
+    start_weight: float
+    end_weight: float
+    weight_change: float
+    avg_weight: float
+    calories_in: int
+    calories_out: int
+    calorie_balance: int  # calories_in - calories_out
+
+class BulkImportResponse(BaseModel):
+    received: int
+    imported: int        # distinct dates written
+
+
+# ============================
+# NOTIFICATION SCHEMAS
+# ============================
+
+class NotificationQueued(BaseModel):
+    id: str
+    status: str  # "pending" until a worker delivers it
+    user_id: str
+    message: str
+
+class NotificationStatus(BaseModel):
+    id: str
+    status: str  # pending | sending | sent | failed
+    attempts: int
+    created_at: datetime
+    next_attempt_at: Optional[datetime] = None
+    sent_at: Optional[datetime] = None
+    last_error: Optional[str] = None
+
+class PlanJobStatus(BaseModel):
+    id: str
+    status: str  # pending | running | done | failed
+    goal: str
+    attempts: int
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    error: Optional[Dict[str, Any]] = None  # {"status", "detail"} when failed
+    deduplicated: bool = False  # an identical job was already queued
+
+class ReminderCreate(BaseModel):
+    message: str = Field(min_length=1)
+    local_time: str = Field(pattern=r"^([01]\d|2[0-3]):[0-5]\d$")  # "20:00"
+    timezone: str = "UTC"  # IANA name, e.g. "Europe/Berlin"
+
+    @field_validator("timezone")
+    @classmethod
+    def check_timezone(cls, v: str) -> str:
+        try:
+            ZoneInfo(v)
+        except (ZoneInfoNotFoundError, ValueError):
+            raise ValueError(f"Unknown timezone '{v}'")
+        return v
+
+class ReminderResponse(BaseModel):
+    id: str
+    message: str
+    local_time: str
+    timezone: str
+    active: bool
+    next_run_at: datetime
+
+
+# ============================
+# ORCHESTRATOR TOOL ARGUMENT SCHEMAS
+# ============================
+
+class CalculateBmrArgs(BaseModel):
+    age: int
+    weight: float
+    height: float
+    gender: str
+
+class GenerateMealPlanArgs(BaseModel):
+    calorie_target: float = Field(gt=0)
+    dietary_pref: List[str] = []
+    days: int = Field(7, ge=1, le=31)
+
+class GenerateWorkoutPlanArgs(BaseModel):
+    goal: str
+    days_per_week: int = Field(ge=1, le=7)
+    conditions: List[str] = []
+    intensity: Literal["low", "standard", "high"] = "standard"
+    equipment: Optional[List[str]] = None
+
+class FetchRecipeArgs(BaseModel):
+    meal_name: str = Field(min_length=1)
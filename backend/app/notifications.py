@@ -0,0 +1,325 @@
+import asyncio
+import random
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+from zoneinfo import ZoneInfo
+
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import UpdateOne
+from pymongo.errors import DuplicateKeyError
+
+from app.dependencies import settings
+from app.tools.push_notifier import PushTransport, get_transport
+
+OUTBOX_COLLECTION = "notification_outbox"
+REMINDERS_COLLECTION = "reminders"
+
+
+def next_local_run(local_time: str, tz_name: str, after: datetime) -> datetime:
+    """
+    First moment strictly after `after` (naive UTC) at which the wall clock in
+    `tz_name` reads `local_time` ("HH:MM"). Returned as naive UTC, like every
+    other timestamp in the database. Daylight-saving changes keep the local
+    time fixed.
+    """
+    tz = ZoneInfo(tz_name)
+    hour, minute = (int(part) for part in local_time.split(":"))
+    local_after = after.replace(tzinfo=timezone.utc).astimezone(tz)
+    candidate = local_after.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if candidate <= local_after:
+        candidate += timedelta(days=1)
+    return candidate.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+class NotificationDispatcher:
+    """
+    Outbox-based push delivery.
+
+    enqueue() writes a "pending" document to the outbox and returns at once.
+    A pool of asyncio workers claims due documents in batches (lease-based,
+    so several processes can share one outbox and a crashed worker's batch
+    is picked up again once its lease runs out), hands each batch to the
+    transport and records the outcome. Failures are retried with jittered
+    exponential backoff until max_attempts, then marked "failed".
+
+    A scheduler task turns due reminders into outbox entries and moves each
+    reminder to its next local run time.
+    """
+
+    def __init__(
+        self,
+        transport: PushTransport,
+        workers: int = 2,
+        batch_size: int = 50,
+        max_attempts: int = 5,
+        backoff_base_seconds: float = 2.0,
+        backoff_max_seconds: float = 900.0,
+        poll_seconds: float = 1.0,
+        lease_seconds: float = 60.0,
+        send_timeout_seconds: float = 30.0,
+    ):
+        self.transport = transport
+        self.workers = workers
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.backoff_base_seconds = backoff_base_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+        self.poll_seconds = poll_seconds
+        self.lease_seconds = lease_seconds
+        self.send_timeout_seconds = send_timeout_seconds
+
+        self.db: Optional[AsyncIOMotorDatabase] = None
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self.counters = {"enqueued": 0, "sent": 0, "retried": 0, "failed": 0, "batches": 0}
+
+    # ---- producer side ----
+
+    async def enqueue(
+        self,
+        db: AsyncIOMotorDatabase,
+        user_id: str,
+        message: str,
+        send_at: Optional[datetime] = None,
+        dedupe_key: Optional[str] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Queue a notification. Returns the outbox document, or None if
+        `dedupe_key` was already used.
+        """
+        now = datetime.utcnow()
+        doc = {
+            "user_id": user_id,
+            "message": message,
+            "status": "pending",
+            "attempts": 0,
+            "next_attempt_at": send_at or now,
+            "created_at": now,
+        }
+        if dedupe_key:
+            doc["dedupe_key"] = dedupe_key
+        try:
+            result = await db[OUTBOX_COLLECTION].insert_one(doc)
+        except DuplicateKeyError:
+            return None
+        doc["_id"] = result.inserted_id
+        self.counters["enqueued"] += 1
+        if self._wakeup is not None and doc["next_attempt_at"] <= now:
+            self._wakeup.set()
+        return doc
+
+    # ---- lifecycle ----
+
+    def start(self, db: AsyncIOMotorDatabase) -> None:
+        if self._tasks:
+            return
+        self.db = db
+        self._wakeup = asyncio.Event()
+        self._tasks = [
+            asyncio.create_task(self._worker_loop(), name=f"notification-worker-{i}")
+            for i in range(self.workers)
+        ]
+        self._tasks.append(asyncio.create_task(self._scheduler_loop(), name="reminder-scheduler"))
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        await self.transport.close()
+
+    # ---- consumer side ----
+
+    async def _worker_loop(self) -> None:
+        while True:
+            try:
+                delivered = await self.drain_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Notification worker error: {e}")
+                delivered = 0
+            if delivered == 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_seconds)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+
+    def _due_filter(self, now: datetime) -> Dict[str, Any]:
+        return {"$or": [
+            {"status": "pending", "next_attempt_at": {"$lte": now}},
+            {"status": "sending", "locked_until": {"$lte": now}},
+        ]}
+
+    async def _claim(self) -> List[Dict[str, Any]]:
+        outbox = self.db[OUTBOX_COLLECTION]
+        now = datetime.utcnow()
+        due = self._due_filter(now)
+        ids = [
+            row["_id"] async for row in
+            outbox.find(due, {"_id": 1}).sort("next_attempt_at", 1).limit(self.batch_size)
+        ]
+        if not ids:
+            return []
+        token = uuid.uuid4().hex
+        await outbox.update_many(
+            {"_id": {"$in": ids}, **due},
+            {"$set": {
+                "status": "sending",
+                "claim": token,
+                "locked_until": now + timedelta(seconds=self.lease_seconds),
+            }},
+        )
+        return [row async for row in outbox.find({"claim": token})]
+
+    def _backoff(self, attempts: int) -> float:
+        delay = min(self.backoff_max_seconds, self.backoff_base_seconds * 2 ** (attempts - 1))
+        return delay * (0.5 + random.random() / 2)
+
+    async def drain_once(self) -> int:
+        """Claim and deliver one batch; returns how many were claimed."""
+        batch = await self._claim()
+        if not batch:
+            return 0
+        self.counters["batches"] += 1
+
+        try:
+            results = await asyncio.wait_for(
+                self.transport.send_batch(batch), timeout=self.send_timeout_seconds
+            )
+        except asyncio.TimeoutError:
+            results = ["transport timed out"] * len(batch)
+        except Exception as e:
+            results = [f"{type(e).__name__}: {e}"] * len(batch)
+
+        now = datetime.utcnow()
+        ops = []
+        for doc, error in zip(batch, results):
+            attempts = doc.get("attempts", 0) + 1
+            unset = {"claim": "", "locked_until": ""}
+            if error is None:
+                self.counters["sent"] += 1
+                update = {"$set": {"status": "sent", "attempts": attempts, "sent_at": now}}
+                unset["last_error"] = ""
+            elif attempts >= self.max_attempts:
+                self.counters["failed"] += 1
+                update = {"$set": {"status": "failed", "attempts": attempts, "last_error": error}}
+            else:
+                self.counters["retried"] += 1
+                update = {"$set": {
+                    "status": "pending",
+                    "attempts": attempts,
+                    "last_error": error,
+                    "next_attempt_at": now + timedelta(seconds=self._backoff(attempts)),
+                }}
+            update["$unset"] = unset
+            # Only touch documents this worker still holds the lease for.
+            ops.append(UpdateOne({"_id": doc["_id"], "claim": doc["claim"]}, update))
+        await self.db[OUTBOX_COLLECTION].bulk_write(ops, ordered=False)
+        return len(batch)
+
+    # ---- reminders ----
+
+    async def _scheduler_loop(self) -> None:
+        while True:
+            try:
+                await self.run_due_reminders()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Reminder scheduler error: {e}")
+            await asyncio.sleep(self.poll_seconds)
+
+    async def run_due_reminders(self, now: Optional[datetime] = None) -> int:
+        """
+        Enqueue every due reminder once and advance it to its next run.
+        The enqueue comes first and is idempotent through its dedupe_key, so
+        a failure before the advance only means the run is retried; the
+        conditional advance makes this safe to run in several processes.
+        After downtime a reminder fires once, not once per missed day.
+        """
+        now = now or datetime.utcnow()
+        reminders = self.db[REMINDERS_COLLECTION]
+        queued = 0
+        cursor = reminders.find({"active": True, "next_run_at": {"$lte": now}}).limit(self.batch_size)
+        async for reminder in cursor:
+            doc = await self.enqueue(
+                self.db,
+                reminder["user_id"],
+                reminder["message"],
+                dedupe_key=f"reminder:{reminder['_id']}:{reminder['next_run_at'].isoformat()}",
+            )
+            queued += doc is not None
+            next_run = next_local_run(reminder["local_time"], reminder["timezone"], now)
+            await reminders.update_one(
+                {"_id": reminder["_id"], "next_run_at": reminder["next_run_at"]},
+                {"$set": {"next_run_at": next_run, "last_run_at": now}},
+            )
+        return queued
+
+    async def stats(self) -> Dict[str, Any]:
+        out: Dict[str, Any] = {
+            "transport": self.transport.name,
+            "workers": self.workers,
+            "running": bool(self._tasks),
+            **self.counters,
+        }
+        if self.db is not None:
+            out["pending"] = await self.db[OUTBOX_COLLECTION].count_documents({"status": "pending"})
+        return out
+
+
+async def create_reminder(
+    db: AsyncIOMotorDatabase, user_id: str, message: str, local_time: str, tz_name: str
+) -> Dict[str, Any]:
+    now = datetime.utcnow()
+    doc = {
+        "user_id": user_id,
+        "message": message,
+        "local_time": local_time,
+        "timezone": tz_name,
+        "active": True,
+        "next_run_at": next_local_run(local_time, tz_name, now),
+        "created_at": now,
+    }
+    result = await db[REMINDERS_COLLECTION].insert_one(doc)
+    doc["_id"] = result.inserted_id
+    return doc
+
+
+async def list_reminders(db: AsyncIOMotorDatabase, user_id: str) -> List[Dict[str, Any]]:
+    cursor = db[REMINDERS_COLLECTION].find({"user_id": user_id}).sort("created_at", 1)
+    return [row async for row in cursor]
+
+
+async def delete_reminder(db: AsyncIOMotorDatabase, user_id: str, reminder_id: str) -> bool:
+    if not ObjectId.is_valid(reminder_id):
+        return False
+    result = await db[REMINDERS_COLLECTION].delete_one(
+        {"_id": ObjectId(reminder_id), "user_id": user_id}
+    )
+    return result.deleted_count == 1
+
+
+async def get_notification(
+    db: AsyncIOMotorDatabase, user_id: str, notification_id: str
+) -> Optional[Dict[str, Any]]:
+    if not ObjectId.is_valid(notification_id):
+        return None
+    return await db[OUTBOX_COLLECTION].find_one(
+        {"_id": ObjectId(notification_id), "user_id": user_id}
+    )
+
+
+notification_dispatcher = NotificationDispatcher(
+    transport=get_transport(settings.notification_transport),
+    workers=settings.notification_workers,
+    batch_size=settings.notification_batch_size,
+    max_attempts=settings.notification_max_attempts,
+    backoff_base_seconds=settings.notification_backoff_base_seconds,
+    backoff_max_seconds=settings.notification_backoff_max_seconds,
+    poll_seconds=settings.notification_poll_seconds,
+)
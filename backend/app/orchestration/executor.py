@@ -0,0 +1,225 @@
+import asyncio
+import inspect
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Collection, Dict, List, Optional, Set, Type
+
+from fastapi import HTTPException
+from pydantic import BaseModel, ValidationError
+
+from app.dependencies import settings
+from app.metrics import PLAN_STEP_LATENCY, PLAN_STEPS_IN_FLIGHT
+
+
+@dataclass
+class ToolBinding:
+    """
+    How the executor runs one tool.
+
+    kind="cpu" tools run on the executor's thread pool so they never block the
+    event loop; kind="io" tools are awaited (or called inline if synchronous).
+    The tool's return value is stored under `result_key`, or appended to a
+    list there when `accumulate` is set. When `args_model` is given, args that
+    were filled in from "$key" references are validated against it.
+    """
+    fn: Callable[..., Any]
+    result_key: str
+    kind: str = "cpu"
+    accumulate: bool = False
+    args_model: Optional[Type[BaseModel]] = None
+
+
+def reference_key(value: Any, result_keys: Collection[str]) -> Optional[str]:
+    """
+    The <key> of a "$<key>" arg when <key> is one of `result_keys`, else None,
+    so literal strings that merely start with "$" are passed through as-is.
+    """
+    if isinstance(value, str) and value.startswith("$") and value[1:] in result_keys:
+        return value[1:]
+    return None
+
+
+def build_dependency_graph(
+    steps: List[Dict[str, Any]], bindings: Dict[str, ToolBinding]
+) -> List[Set[int]]:
+    """
+    Return, for each step, the indexes of the steps it must wait for.
+
+    A step depends on an earlier step when it lists it in "depends_on", or
+    when one of its args is a "$<result_key>" reference to an output that an
+    earlier step produces. Steps may only depend on earlier steps, so the
+    graph is acyclic by construction. Like an invalid step in
+    ToolRegistry.validate_steps, a bad dependency is a 500: the plan came
+    from the LLM, not the client.
+    """
+    result_keys = {binding.result_key for binding in bindings.values()}
+    producers: Dict[str, List[int]] = {}
+    graph: List[Set[int]] = []
+
+    for i, step in enumerate(steps):
+        deps: Set[int] = set()
+
+        for d in step.get("depends_on", []) or []:
+            if not isinstance(d, int) or not 0 <= d < i:
+                raise HTTPException(
+                    status_code=500,
+                    detail=f"Step {i} has invalid depends_on entry: {d!r}",
+                )
+            deps.add(d)
+
+        for value in (step.get("args") or {}).values():
+            key = reference_key(value, result_keys)
+            if key is not None:
+                if key not in producers:
+                    raise HTTPException(
+                        status_code=500,
+                        detail=f"Step {i} references {value} before any step produces it",
+                    )
+                deps.update(producers[key])
+
+        graph.append(deps)
+
+        binding = bindings.get(step.get("tool"))
+        if binding is not None:
+            producers.setdefault(binding.result_key, []).append(i)
+
+    return graph
+
+
+class PlanExecutor:
+    """
+    Runs orchestrator steps as a DAG: every step starts as soon as the steps
+    it depends on have finished, with at most `max_concurrency` steps running
+    at once. Results are merged in step order, so the output is the same as a
+    sequential run.
+    """
+
+    def __init__(self, max_concurrency: int, cpu_workers: int):
+        self.max_concurrency = max_concurrency
+        self.cpu_workers = cpu_workers
+        self._pool: Optional[ThreadPoolExecutor] = None
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(
+                max_workers=self.cpu_workers, thread_name_prefix="plan-step"
+            )
+        return self._pool
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
+
+    @staticmethod
+    def _resolve_args(args: Dict[str, Any], outputs: Dict[str, Any]) -> Dict[str, Any]:
+        resolved = {}
+        for name, value in args.items():
+            key = reference_key(value, outputs)
+            if key is not None:
+                value = outputs[key]
+            resolved[name] = value
+        return resolved
+
+    async def _call(self, binding: ToolBinding, args: Dict[str, Any]) -> Any:
+        if inspect.iscoroutinefunction(binding.fn):
+            return await binding.fn(**args)
+        if binding.kind == "cpu":
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_pool(), lambda: binding.fn(**args))
+        return binding.fn(**args)
+
+    async def execute(
+        self,
+        steps: List[Dict[str, Any]],
+        bindings: Dict[str, ToolBinding],
+        on_step: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Run `steps` and merge their results by result_key. When `on_step` is
+        given it is awaited as each step finishes, in completion order, with
+        the step's timing plus its "result_key" and "value".
+        """
+        for step in steps:
+            if step.get("tool") not in bindings:
+                raise HTTPException(status_code=500, detail=f"Unknown tool: {step.get('tool')}")
+
+        graph = build_dependency_graph(steps, bindings)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        started = time.perf_counter()
+        values: List[Any] = [None] * len(steps)
+        timings: List[Dict[str, Any]] = [{} for _ in steps]
+        tasks: List[asyncio.Task] = []
+
+        async def run_step(i: int) -> None:
+            if graph[i]:
+                await asyncio.gather(*(tasks[d] for d in graph[i]))
+            step = steps[i]
+            binding = bindings[step["tool"]]
+            # "$key" resolves to the latest dependency that produced `key`.
+            outputs = {}
+            for d in sorted(graph[i]):
+                outputs[bindings[steps[d]["tool"]].result_key] = values[d]
+            raw_args = step.get("args") or {}
+            args = self._resolve_args(raw_args, outputs)
+            if binding.args_model is not None and args != raw_args:
+                try:
+                    model = binding.args_model.model_validate(args)
+                except ValidationError as e:
+                    raise HTTPException(
+                        status_code=500,
+                        detail=f"Step {i} ({step['tool']}) got invalid referenced args: {e}",
+                    )
+                args = {k: getattr(model, k) for k in model.model_fields}
+
+            async with semaphore:
+                t0 = time.perf_counter()
+                outcome = "error"
+                try:
+                    with PLAN_STEPS_IN_FLIGHT.track_inprogress(tool=step["tool"]):
+                        values[i] = await self._call(binding, args)
+                    outcome = "ok"
+                finally:
+                    t1 = time.perf_counter()
+                    PLAN_STEP_LATENCY.observe(t1 - t0, tool=step["tool"], outcome=outcome)
+
+            timings[i] = {
+                "index": i,
+                "tool": step["tool"],
+                "start_ms": round((t0 - started) * 1000, 3),
+                "duration_ms": round((t1 - t0) * 1000, 3),
+            }
+            if on_step is not None:
+                await on_step({**timings[i], "result_key": binding.result_key, "value": values[i]})
+
+        for i in range(len(steps)):
+            tasks.append(asyncio.create_task(run_step(i)))
+
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+        result: Dict[str, Any] = {}
+        for step, value in zip(steps, values):
+            binding = bindings[step["tool"]]
+            if binding.accumulate:
+                result.setdefault(binding.result_key, []).append(value)
+            else:
+                result[binding.result_key] = value
+
+        result["meta"] = {
+            "steps": timings,
+            "total_ms": round((time.perf_counter() - started) * 1000, 3),
+        }
+        return result
+
+
+plan_executor = PlanExecutor(
+    max_concurrency=settings.plan_max_concurrency,
+    cpu_workers=settings.plan_cpu_workers,
+)
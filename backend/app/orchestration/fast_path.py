@@ -0,0 +1,137 @@
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from ..dependencies import settings
+from ..tools.bmr_calculator import ACTIVITY_FACTOR, MIN_CALORIE_TARGET, calculate_bmr
+
+
+@dataclass(frozen=True)
+class GoalIntent:
+    name: str
+    # Canonical goal text handed to generate_workout_plan.
+    workout_goal: str
+    calorie_adjustment: float
+    days_per_week: int
+    pattern: "re.Pattern[str]"
+
+
+def _phrases(*phrases: str) -> "re.Pattern[str]":
+    return re.compile(r"\b(?:" + "|".join(phrases) + r")\b")
+
+
+GOAL_INTENTS: List[GoalIntent] = [
+    GoalIntent(
+        name="lose_weight",
+        workout_goal="lose weight",
+        calorie_adjustment=-500,
+        days_per_week=5,
+        pattern=_phrases(
+            r"lose (?:some )?weight", r"weight loss", r"lose fat", r"fat loss",
+            r"burn fat", r"slim down", r"get lean(?:er)?", r"lose \d+ ?(?:kg|kgs|lbs?|pounds)",
+        ),
+    ),
+    GoalIntent(
+        name="build_muscle",
+        workout_goal="build muscle",
+        calorie_adjustment=300,
+        days_per_week=4,
+        pattern=_phrases(
+            r"build (?:some )?muscles?", r"gain muscles?", r"muscle gain", r"bulk(?: up)?",
+            r"get stronger", r"gain strength", r"build strength", r"gain weight",
+        ),
+    ),
+    GoalIntent(
+        name="maintain",
+        workout_goal="maintain weight",
+        calorie_adjustment=0,
+        days_per_week=3,
+        pattern=_phrases(
+            r"maintain(?: my)? weight", r"stay (?:healthy|fit|in shape)", r"get fit",
+            r"general fitness", r"be healthier", r"eat healthier", r"keep fit",
+        ),
+    ),
+]
+
+# Goals mentioning any of these carry nuance only the LLM should interpret.
+_NEGATION = _phrases(r"not", r"don'?t", r"without", r"avoid", r"instead", r"but")
+_MAX_GOAL_WORDS = 12
+
+
+def classify_goal(goal: str) -> Optional[GoalIntent]:
+    """
+    Return the single intent a short goal clearly expresses, or None when the
+    goal is unknown, ambiguous, negated or too long to trust a rule for.
+    """
+    text = " ".join(goal.lower().split())
+    if not text or len(text.split()) > _MAX_GOAL_WORDS or _NEGATION.search(text):
+        return None
+    matches = [intent for intent in GOAL_INTENTS if intent.pattern.search(text)]
+    if len(matches) != 1:
+        return None
+    return matches[0]
+
+
+class FastPathPlanner:
+    """
+    Builds the standard calculate_bmr -> generate_meal_plan ->
+    generate_workout_plan step list locally for well-known goals, so those
+    plans skip LLM inference entirely.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+
+    def plan(self, profile: Dict[str, Any], goal: str) -> Optional[List[Dict[str, Any]]]:
+        if not self.enabled:
+            return None
+        intent = classify_goal(goal)
+        if intent is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+
+        bmr_args = {
+            "age": profile["age"],
+            "weight": profile["weight"],
+            "height": profile["height"],
+            "gender": profile["gender"],
+        }
+        calorie_target = round(
+            calculate_bmr(**bmr_args) * ACTIVITY_FACTOR + intent.calorie_adjustment, 2
+        )
+        floor = MIN_CALORIE_TARGET.get(profile["gender"], MIN_CALORIE_TARGET["other"])
+        calorie_target = max(calorie_target, floor)
+        return [
+            {"tool": "calculate_bmr", "args": bmr_args},
+            {
+                "tool": "generate_meal_plan",
+                "args": {
+                    "calorie_target": calorie_target,
+                    "dietary_pref": profile.get("dietary_preferences", []),
+                    "days": 7,
+                },
+            },
+            {
+                "tool": "generate_workout_plan",
+                "args": {
+                    "goal": intent.workout_goal,
+                    "days_per_week": intent.days_per_week,
+                    "conditions": profile.get("existing_conditions", []),
+                },
+            },
+        ]
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+fast_path_planner = FastPathPlanner(enabled=settings.plan_fast_path_enabled)
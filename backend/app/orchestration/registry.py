@@ -0,0 +1,170 @@
+import typing
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Type
+
+from fastapi import HTTPException
+from pydantic import BaseModel, ValidationError
+
+from ..models.schemas import (
+    CalculateBmrArgs,
+    FetchRecipeArgs,
+    GenerateMealPlanArgs,
+    GenerateWorkoutPlanArgs,
+)
+from ..tools.bmr_calculator import calculate_bmr
+from ..tools.meal_planner import generate_meal_plan
+from ..tools.recipe_fetcher import find_recipe
+from ..tools.workout_generator import generate_workout_plan
+from .executor import ToolBinding, reference_key
+
+
+@dataclass
+class ToolSpec:
+    name: str
+    fn: Callable[..., Any]
+    args_model: Type[BaseModel]
+    result_key: str
+    returns: str
+    kind: str = "cpu"
+    accumulate: bool = False
+
+
+def _type_name(annotation: Any) -> str:
+    origin = typing.get_origin(annotation)
+    if origin is None:
+        return getattr(annotation, "__name__", str(annotation))
+    args = ", ".join(_type_name(a) for a in typing.get_args(annotation))
+    return f"{origin.__name__.capitalize()}[{args}]"
+
+
+class ToolRegistry:
+    """
+    Single source of truth for orchestrator tools: the argument model used to
+    validate LLM steps, the executor binding used to dispatch them, and the
+    tool list rendered into the orchestrator prompt.
+    """
+
+    def __init__(self):
+        self._specs: Dict[str, ToolSpec] = {}
+        self._bindings: Dict[str, ToolBinding] = {}
+        self._prompt_tools: Optional[str] = None
+
+    def register(self, spec: ToolSpec) -> None:
+        self._specs[spec.name] = spec
+        self._bindings[spec.name] = ToolBinding(
+            fn=spec.fn,
+            result_key=spec.result_key,
+            kind=spec.kind,
+            accumulate=spec.accumulate,
+            args_model=spec.args_model,
+        )
+        self._prompt_tools = None
+
+    @property
+    def bindings(self) -> Dict[str, ToolBinding]:
+        return self._bindings
+
+    def prompt_tool_list(self) -> str:
+        if self._prompt_tools is None:
+            lines = []
+            for n, spec in enumerate(self._specs.values(), start=1):
+                params = ", ".join(
+                    f"{name}: {_type_name(field.annotation)}"
+                    for name, field in spec.args_model.model_fields.items()
+                )
+                lines.append(f"{n}. {spec.name}({params}) -> {spec.returns}")
+            self._prompt_tools = "\n".join(lines)
+        return self._prompt_tools
+
+    def validate_steps(self, steps: Any) -> List[Dict[str, Any]]:
+        """
+        Validate every step before any of them runs and return normalized
+        copies with coerced args. All problems are reported together.
+
+        Args holding "$<result_key>" references are checked for shape only;
+        the executor validates them once the referenced output exists.
+        """
+        if not isinstance(steps, list):
+            raise HTTPException(status_code=500, detail="LLM plan 'steps' must be a list")
+
+        result_keys = {spec.result_key for spec in self._specs.values()}
+        errors: List[Dict[str, Any]] = []
+        validated: List[Dict[str, Any]] = []
+
+        for i, step in enumerate(steps):
+            if not isinstance(step, dict):
+                errors.append({"step": i, "error": "step must be an object"})
+                continue
+            tool_name = step.get("tool")
+            spec = self._specs.get(tool_name)
+            if spec is None:
+                errors.append({"step": i, "tool": tool_name, "error": "unknown tool"})
+                continue
+            args = step.get("args") or {}
+            if not isinstance(args, dict):
+                errors.append({"step": i, "tool": tool_name, "error": "args must be an object"})
+                continue
+
+            refs = {
+                k: v for k, v in args.items()
+                if reference_key(v, result_keys) is not None
+            }
+            literals = {k: v for k, v in args.items() if k not in refs}
+            try:
+                model = spec.args_model.model_validate(literals)
+                coerced = {k: getattr(model, k) for k in model.model_fields}
+            except ValidationError as e:
+                step_errors = [
+                    err for err in e.errors(include_url=False, include_input=False)
+                    if not (err["loc"] and err["loc"][0] in refs)
+                ]
+                if step_errors:
+                    errors.append({"step": i, "tool": tool_name, "errors": step_errors})
+                    continue
+                coerced = literals
+
+            normalized = {"tool": tool_name, "args": {**coerced, **refs}}
+            if "depends_on" in step:
+                normalized["depends_on"] = step["depends_on"]
+            validated.append(normalized)
+
+        if errors:
+            raise HTTPException(
+                status_code=500,
+                detail={"message": "LLM returned an invalid plan", "errors": errors},
+            )
+        return validated
+
+
+tool_registry = ToolRegistry()
+
+tool_registry.register(ToolSpec(
+    name="calculate_bmr",
+    fn=calculate_bmr,
+    args_model=CalculateBmrArgs,
+    result_key="bmr",
+    returns='{ "bmr": float }',
+))
+tool_registry.register(ToolSpec(
+    name="generate_meal_plan",
+    fn=generate_meal_plan,
+    args_model=GenerateMealPlanArgs,
+    result_key="meal_plan",
+    returns="[ … ]",
+))
+tool_registry.register(ToolSpec(
+    name="generate_workout_plan",
+    fn=generate_workout_plan,
+    args_model=GenerateWorkoutPlanArgs,
+    result_key="workout_plan",
+    returns="[ … ]",
+))
+tool_registry.register(ToolSpec(
+    name="fetch_recipe",
+    fn=find_recipe,
+    args_model=FetchRecipeArgs,
+    result_key="recipes",
+    returns="{ … } or null if unknown",
+    kind="io",
+    accumulate=True,
+))
@@ -0,0 +1,263 @@
+import asyncio
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from bson import ObjectId
+from fastapi import HTTPException
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from app.dependencies import settings
+from app.models.schemas import UserInDB
+from app.routers.auth import get_user_by_username
+
+PLAN_JOBS_COLLECTION = "plan_jobs"
+
+
+class _LeaseLost(Exception):
+    """Another worker took over the job after this one's lease ran out."""
+
+
+# orchestrate_plan(db, user, goal) -> plan document
+PlanRunner = Callable[[AsyncIOMotorDatabase, UserInDB, str], Awaitable[Dict[str, Any]]]
+
+
+def active_key(user_id: str, goal: str) -> str:
+    """Identifies "the same plan request" for de-duplication."""
+    return f"{user_id}:{' '.join(goal.lower().split())}"
+
+
+async def submit_plan_job(
+    db: AsyncIOMotorDatabase, user: UserInDB, goal: str
+) -> Tuple[Dict[str, Any], bool]:
+    """
+    Queue a plan job, or return the one already pending or running for this
+    user and goal. Returns (job, created).
+
+    Queued and running jobs carry an `active_key`, which has a unique index;
+    it is removed when the job finishes, so the same goal can be planned
+    again afterwards.
+    """
+    key = active_key(user.id, goal)
+    now = datetime.utcnow()
+    doc = {
+        "user_id": user.id,
+        "username": user.username,
+        "goal": goal,
+        "status": "pending",
+        "attempts": 0,
+        "active_key": key,
+        "created_at": now,
+    }
+    try:
+        result = await db[PLAN_JOBS_COLLECTION].insert_one(doc)
+    except DuplicateKeyError:
+        existing = await db[PLAN_JOBS_COLLECTION].find_one({"active_key": key})
+        if existing is not None:
+            return existing, False
+        # The other job finished in between; queue a fresh one.
+        return await submit_plan_job(db, user, goal)
+    doc["_id"] = result.inserted_id
+    return doc, True
+
+
+async def get_plan_job(
+    db: AsyncIOMotorDatabase, user_id: str, job_id: str
+) -> Optional[Dict[str, Any]]:
+    if not ObjectId.is_valid(job_id):
+        return None
+    return await db[PLAN_JOBS_COLLECTION].find_one({"_id": ObjectId(job_id), "user_id": user_id})
+
+
+class PlanJobWorker:
+    """
+    Runs queued plan jobs with at most `concurrency` in flight.
+
+    Each worker task claims the oldest due job with one findOneAndUpdate,
+    which sets a claim token and a lease. The lease is renewed every third
+    of `lease_seconds` while the job runs, so only a job whose worker
+    crashed or stalled is claimed again, up to max_attempts. Jobs are normally
+    run by the separate worker process (python -m app.jobs.plan_worker);
+    several processes can share one queue.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = 4,
+        max_attempts: int = 3,
+        lease_seconds: float = 300.0,
+        poll_seconds: float = 1.0,
+        result_ttl_seconds: int = 24 * 3600,
+    ):
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+        self.lease_seconds = lease_seconds
+        self.poll_seconds = poll_seconds
+        self.result_ttl_seconds = result_ttl_seconds
+
+        self.db: Optional[AsyncIOMotorDatabase] = None
+        self.runner: Optional[PlanRunner] = None
+        self._tasks: List[asyncio.Task] = []
+        self.counters = {"claimed": 0, "succeeded": 0, "failed": 0, "abandoned": 0, "lost": 0}
+
+    def start(self, db: AsyncIOMotorDatabase, runner: PlanRunner) -> None:
+        if self._tasks:
+            return
+        self.db = db
+        self.runner = runner
+        self._tasks = [
+            asyncio.create_task(self._worker_loop(), name=f"plan-job-worker-{i}")
+            for i in range(self.concurrency)
+        ]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def wait(self) -> None:
+        await asyncio.gather(*self._tasks)
+
+    async def _worker_loop(self) -> None:
+        while True:
+            try:
+                ran = await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Plan job worker error: {e}")
+                ran = False
+            if not ran:
+                await asyncio.sleep(self.poll_seconds)
+
+    async def _claim(self) -> Optional[Dict[str, Any]]:
+        now = datetime.utcnow()
+        return await self.db[PLAN_JOBS_COLLECTION].find_one_and_update(
+            {"$or": [
+                {"status": "pending"},
+                {"status": "running", "locked_until": {"$lte": now}},
+            ]},
+            {
+                "$set": {
+                    "status": "running",
+                    "claim": uuid.uuid4().hex,
+                    "locked_until": now + timedelta(seconds=self.lease_seconds),
+                    "started_at": now,
+                },
+                "$inc": {"attempts": 1},
+            },
+            sort=[("created_at", 1)],
+            return_document=ReturnDocument.AFTER,
+        )
+
+    async def _finish(self, job: Dict[str, Any], fields: Dict[str, Any]) -> None:
+        now = datetime.utcnow()
+        await self.db[PLAN_JOBS_COLLECTION].update_one(
+            {"_id": job["_id"], "claim": job["claim"]},
+            {
+                "$set": {
+                    **fields,
+                    "finished_at": now,
+                    "expires_at": now + timedelta(seconds=self.result_ttl_seconds),
+                },
+                "$unset": {"active_key": "", "claim": "", "locked_until": ""},
+            },
+        )
+
+    async def _extend_lease(self, job: Dict[str, Any]) -> bool:
+        result = await self.db[PLAN_JOBS_COLLECTION].update_one(
+            {"_id": job["_id"], "claim": job["claim"]},
+            {"$set": {"locked_until": datetime.utcnow() + timedelta(seconds=self.lease_seconds)}},
+        )
+        return result.matched_count > 0
+
+    async def _run_leased(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Run the job while renewing its lease. If the claim is gone (the lease
+        expired and another worker took the job), the run is cancelled and
+        _LeaseLost raised.
+        """
+        run = asyncio.ensure_future(self._run(job))
+        lost = False
+
+        async def renew() -> None:
+            nonlocal lost
+            while not run.done():
+                await asyncio.sleep(self.lease_seconds / 3)
+                if not await self._extend_lease(job):
+                    lost = True
+                    run.cancel()
+                    return
+
+        renewer = asyncio.create_task(renew())
+        try:
+            return await run
+        except asyncio.CancelledError:
+            if lost:
+                raise _LeaseLost() from None
+            raise
+        finally:
+            renewer.cancel()
+
+    async def _run(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        user = await get_user_by_username(self.db, job["username"])
+        if user is None:
+            raise HTTPException(status_code=404, detail="User not found")
+        return await self.runner(self.db, user, job["goal"])
+
+    async def run_once(self) -> bool:
+        """Claim and run one job; returns False when the queue was empty."""
+        job = await self._claim()
+        if job is None:
+            return False
+        self.counters["claimed"] += 1
+
+        if job["attempts"] > self.max_attempts:
+            self.counters["abandoned"] += 1
+            await self._finish(job, {
+                "status": "failed",
+                "error": {"status": 500, "detail": "Plan job was abandoned by its worker too often"},
+            })
+            return True
+
+        try:
+            plan = await self._run_leased(job)
+        except asyncio.CancelledError:
+            raise
+        except _LeaseLost:
+            self.counters["lost"] += 1
+            return True
+        except HTTPException as e:
+            self.counters["failed"] += 1
+            await self._finish(job, {"status": "failed", "error": {"status": e.status_code, "detail": e.detail}})
+        except Exception as e:
+            self.counters["failed"] += 1
+            await self._finish(job, {"status": "failed", "error": {"status": 500, "detail": str(e)}})
+        else:
+            self.counters["succeeded"] += 1
+            await self._finish(job, {"status": "done", "result": plan})
+        return True
+
+    async def stats(self) -> Dict[str, Any]:
+        out: Dict[str, Any] = {
+            "concurrency": self.concurrency,
+            "running": bool(self._tasks),
+            **self.counters,
+        }
+        if self.db is not None:
+            jobs = self.db[PLAN_JOBS_COLLECTION]
+            out["pending"] = await jobs.count_documents({"status": "pending"})
+            out["in_progress"] = await jobs.count_documents({"status": "running"})
+        return out
+
+
+plan_job_worker = PlanJobWorker(
+    concurrency=settings.plan_job_concurrency,
+    max_attempts=settings.plan_job_max_attempts,
+    lease_seconds=settings.plan_job_lease_seconds,
+    poll_seconds=settings.plan_job_poll_seconds,
+    result_ttl_seconds=settings.plan_job_result_ttl_seconds,
+)
@@ -0,0 +1,288 @@
+"""
+Async client for an external recipe provider, used for dishes the local
+recipe store does not know.
+
+The provider is expected to answer
+
+    POST {base_url}/recipes/lookup   {"names": ["Pad thai", ...]}
+    -> {"recipes": {"Pad thai": {meal_name, ingredients, instructions, nutrition} | null, ...}}
+
+Adapting a vendor API (e.g. Spoonacular) means mapping it onto this call;
+app.stubs.recipe_provider implements it locally for development.
+"""
+import asyncio
+from datetime import datetime, timedelta
+from typing import Any, Coroutine, Dict, Iterable, List, Optional, Set
+
+import httpx
+from fastapi import HTTPException
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from app.dependencies import settings
+from app.tools.recipe_store import normalize_name
+from app.ttl_cache import TTLCache
+
+RECIPE_CACHE_COLLECTION = "recipe_cache"
+
+# Memory-cache marker for names the provider does not know; TTLCache treats
+# None as a miss.
+_NOT_FOUND: Dict[str, Any] = {}
+
+
+class RecipeProviderClient:
+    """
+    Pooled, coalescing, cached access to the recipe provider.
+
+    - One httpx.AsyncClient per process, so connections are kept alive.
+    - Single flight: concurrent lookups of the same dish share one future.
+      Callers wait on it through asyncio.shield, and the lookup itself runs
+      in a task owned by the client, so a caller that goes away (e.g. a
+      disconnected request) does not cancel it for the others.
+    - Batching: names missing from both caches are queued for a short window
+      and sent upstream together, at most `batch_size` per request.
+    - Two cache tiers: an in-process TTL LRU and a Mongo collection that
+      expires through the TTL index declared in app.indexes. Misses are
+      cached too, for `negative_ttl_seconds`.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        api_key: str = "",
+        timeout_seconds: float = 10.0,
+        max_connections: int = 20,
+        batch_size: int = 10,
+        batch_window_seconds: float = 0.005,
+        cache_ttl_seconds: int = 7 * 24 * 3600,
+        negative_ttl_seconds: int = 3600,
+        memory_max_entries: int = 2048,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key
+        self.timeout_seconds = timeout_seconds
+        self.max_connections = max_connections
+        self.batch_size = batch_size
+        self.batch_window_seconds = batch_window_seconds
+        self.cache_ttl_seconds = cache_ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self.memory: TTLCache[Dict[str, Any]] = TTLCache(memory_max_entries, cache_ttl_seconds)
+        self.db: Optional[AsyncIOMotorDatabase] = None
+
+        self._http: Optional[httpx.AsyncClient] = None
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._queued: Dict[str, str] = {}  # normalized -> name sent upstream
+        self._flush_task: Optional[asyncio.Task] = None
+        self._tasks: Set[asyncio.Task] = set()
+        self.upstream_requests = 0
+        self.coalesced = 0
+        self.mongo_hits = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.base_url)
+
+    def attach_database(self, db: AsyncIOMotorDatabase) -> None:
+        """Enable the Mongo cache tier."""
+        self.db = db
+
+    def _get_http(self) -> httpx.AsyncClient:
+        if self._http is None:
+            headers = {"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
+            self._http = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers=headers,
+                timeout=self.timeout_seconds,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+            )
+        return self._http
+
+    def _spawn(self, coro: Coroutine[Any, Any, None]) -> asyncio.Task:
+        """Run `coro` in a task the client keeps a reference to until it ends."""
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._task_done)
+        return task
+
+    def _task_done(self, task: asyncio.Task) -> None:
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            print(f"recipe provider task failed: {task.exception()!r}")
+
+    async def close(self) -> None:
+        self._flush_task = None
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._fail(
+            dict.fromkeys(self._inflight, ""),
+            HTTPException(status_code=503, detail="Recipe provider is shutting down"),
+        )
+        self._queued.clear()
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+    async def get(self, meal_name: str) -> Optional[Dict[str, Any]]:
+        return (await self.get_many([meal_name]))[meal_name]
+
+    async def get_many(self, meal_names: Iterable[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Look up many dishes; returns {requested name: recipe or None}.
+        Raises 502/504 HTTPException if the provider fails.
+        """
+        if not self.enabled:
+            return {name: None for name in meal_names}
+
+        by_norm: Dict[str, str] = {}
+        found: Dict[str, Optional[Dict[str, Any]]] = {}
+        for name in meal_names:
+            norm = normalize_name(name)
+            if norm:
+                by_norm.setdefault(norm, name)
+
+        waiting: Dict[str, asyncio.Future] = {}
+        owned: List[str] = []
+        loop = asyncio.get_running_loop()
+        for norm in by_norm:
+            cached = self.memory.get(norm)
+            if cached is not None:
+                found[norm] = cached or None
+            elif norm in self._inflight:
+                self.coalesced += 1
+                waiting[norm] = self._inflight[norm]
+            else:
+                future = waiting[norm] = self._inflight[norm] = loop.create_future()
+                future.add_done_callback(lambda f, norm=norm: self._forget(norm, f))
+                owned.append(norm)
+
+        if owned:
+            self._spawn(self._resolve(owned, by_norm))
+
+        for norm, future in waiting.items():
+            found[norm] = await asyncio.shield(future)
+
+        return {
+            name: found.get(normalize_name(name))
+            for name in meal_names
+        }
+
+    def _forget(self, norm: str, future: asyncio.Future) -> None:
+        if self._inflight.get(norm) is future:
+            del self._inflight[norm]
+        if not future.cancelled():
+            # Mark the error as seen even if every waiter went away.
+            future.exception()
+
+    async def _resolve(self, norms: List[str], by_norm: Dict[str, str]) -> None:
+        """Fill the futures for `norms`: Mongo first, the rest via the batcher."""
+        try:
+            remaining = list(norms)
+            if self.db is not None:
+                cursor = self.db[RECIPE_CACHE_COLLECTION].find(
+                    {"_id": {"$in": remaining}, "expires_at": {"$gt": datetime.utcnow()}}
+                )
+                async for row in cursor:
+                    self.mongo_hits += 1
+                    self._finish(row["_id"], row.get("recipe"), store=False)
+                remaining = [n for n in remaining if n in self._inflight]
+        except Exception as e:
+            # The Mongo tier is an optimization; fall through to the provider.
+            print(f"recipe_cache read failed: {e}")
+            remaining = [n for n in norms if n in self._inflight]
+
+        for norm in remaining:
+            self._queued[norm] = by_norm[norm]
+        if len(self._queued) >= self.batch_size:
+            self._flush()
+        elif remaining and self._flush_task is None:
+            self._flush_task = self._spawn(self._flush_later())
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.batch_window_seconds)
+        self._flush_task = None
+        self._flush()
+
+    def _flush(self) -> None:
+        """Send everything queued, one task per batch of `batch_size`."""
+        while self._queued:
+            batch = dict(list(self._queued.items())[: self.batch_size])
+            for norm in batch:
+                del self._queued[norm]
+            self._spawn(self._request_batch(batch))
+
+    async def _request_batch(self, batch: Dict[str, str]) -> None:
+        self.upstream_requests += 1
+        try:
+            response = await self._get_http().post(
+                "/recipes/lookup", json={"names": list(batch.values())}
+            )
+            response.raise_for_status()
+            body = response.json()
+            recipes = body.get("recipes") or {}
+            if not isinstance(recipes, dict):
+                raise ValueError("'recipes' is not an object")
+            results = {normalize_name(k): v for k, v in recipes.items()}
+            for norm in batch:
+                self._finish(norm, results.get(norm), store=True)
+        except httpx.TimeoutException:
+            self._fail(batch, HTTPException(status_code=504, detail="Recipe provider timed out"))
+        except Exception as e:
+            self._fail(batch, HTTPException(status_code=502, detail=f"Recipe provider error: {e}"))
+        finally:
+            # Also covers cancellation: nobody may be left waiting on this batch.
+            self._fail(batch, HTTPException(status_code=503, detail="Recipe lookup was cancelled"))
+
+    def _finish(self, norm: str, recipe: Optional[Dict[str, Any]], store: bool) -> None:
+        ttl = self.cache_ttl_seconds if recipe else self.negative_ttl_seconds
+        self.memory.set(norm, recipe or _NOT_FOUND, ttl_seconds=ttl)
+        future = self._inflight.pop(norm, None)
+        if future is not None and not future.done():
+            future.set_result(recipe)
+        if store and self.db is not None:
+            self._spawn(self._store(norm, recipe, ttl))
+
+    def _fail(self, batch: Dict[str, str], error: Exception) -> None:
+        for norm in batch:
+            future = self._inflight.pop(norm, None)
+            if future is not None and not future.done():
+                future.set_exception(error)
+
+    async def _store(self, norm: str, recipe: Optional[Dict[str, Any]], ttl: int) -> None:
+        now = datetime.utcnow()
+        try:
+            await self.db[RECIPE_CACHE_COLLECTION].update_one(
+                {"_id": norm},
+                {"$set": {
+                    "recipe": recipe,
+                    "created_at": now,
+                    "expires_at": now + timedelta(seconds=ttl),
+                }},
+                upsert=True,
+            )
+        except Exception as e:
+            print(f"recipe_cache write failed: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "upstream_requests": self.upstream_requests,
+            "coalesced": self.coalesced,
+            "memory_hits": self.memory.hits,
+            "mongo_hits": self.mongo_hits,
+            "memory_size": len(self.memory),
+            "inflight": len(self._inflight),
+            "tasks": len(self._tasks),
+        }
+
+
+recipe_provider = RecipeProviderClient(
+    base_url=settings.recipe_provider_base_url,
+    api_key=settings.recipe_provider_api_key,
+    timeout_seconds=settings.recipe_provider_timeout_seconds,
+    max_connections=settings.recipe_provider_max_connections,
+    batch_size=settings.recipe_provider_batch_size,
+    cache_ttl_seconds=settings.recipe_provider_cache_ttl_seconds,
+)
@@ -0,0 +1,171 @@
+import asyncio
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ASCENDING, DESCENDING
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+PLANS_COLLECTION = "plans"
+SAVE_PLAN_MAX_ATTEMPTS = 5
+_DUPLICATE_KEY = 11000
+
+PlanBuilder = Callable[[Dict[str, Any]], Dict[str, Any]]
+
+
+async def get_latest_plan(
+    db: AsyncIOMotorDatabase, user_id: str, plan_type: str
+) -> Optional[Dict[str, Any]]:
+    return await db[PLANS_COLLECTION].find_one(
+        {"user_id": user_id, "plan_type": plan_type},
+        sort=[("version", DESCENDING)],
+    )
+
+
+async def get_current_plan(
+    db: AsyncIOMotorDatabase, user_id: str, plan_type: str, profile_version: datetime
+) -> Optional[Dict[str, Any]]:
+    """
+    Latest stored plan generated from this exact profile version, if any.
+    """
+    return await db[PLANS_COLLECTION].find_one(
+        {"user_id": user_id, "plan_type": plan_type, "profile_version": profile_version},
+        sort=[("version", DESCENDING)],
+    )
+
+
+async def save_plan(
+    db: AsyncIOMotorDatabase,
+    user_id: str,
+    plan_type: str,
+    profile_version: datetime,
+    payload: Dict[str, Any],
+    reuse_current: bool = False,
+) -> Dict[str, Any]:
+    """
+    Store a new version of the plan. Versions are numbered per user and plan
+    type; if a concurrent save takes the same number, retry with the next one,
+    up to SAVE_PLAN_MAX_ATTEMPTS times. With `reuse_current`, a latest version
+    already generated from `profile_version` (typically by the request that
+    won the race) is returned instead of storing another one.
+    """
+    for _ in range(SAVE_PLAN_MAX_ATTEMPTS):
+        latest = await get_latest_plan(db, user_id, plan_type)
+        if reuse_current and latest and latest["profile_version"] == profile_version:
+            return latest
+        doc = {
+            "user_id": user_id,
+            "plan_type": plan_type,
+            "profile_version": profile_version,
+            "version": (latest["version"] + 1) if latest else 1,
+            "payload": payload,
+            "created_at": datetime.utcnow(),
+        }
+        try:
+            result = await db[PLANS_COLLECTION].insert_one(doc)
+        except DuplicateKeyError:
+            continue
+        doc["_id"] = result.inserted_id
+        return doc
+    raise HTTPException(
+        status_code=503,
+        detail="Plan is being updated concurrently, please retry",
+        headers={"Retry-After": "1"},
+    )
+
+
+# In-process single flight for get_or_create_plan, keyed by
+# (user_id, plan_type, profile_version).
+_building: Dict[Tuple[str, str, datetime], "asyncio.Task[Dict[str, Any]]"] = {}
+
+
+async def get_or_create_plan(
+    db: AsyncIOMotorDatabase,
+    user_id: str,
+    plan_type: str,
+    profile: Dict[str, Any],
+    build: PlanBuilder,
+) -> Dict[str, Any]:
+    """
+    Return the stored plan for the profile's current `updated_at`, generating
+    and saving one only when the profile has changed since the last plan.
+
+    Concurrent requests for the same profile version share one build in this
+    process; across processes, the request that loses the insert race reads
+    back the winner's version instead of storing a duplicate.
+    """
+    plan = await get_current_plan(db, user_id, plan_type, profile["updated_at"])
+    if plan is not None:
+        return plan
+
+    key = (user_id, plan_type, profile["updated_at"])
+    task = _building.get(key)
+    if task is None:
+        task = asyncio.ensure_future(save_plan(
+            db, user_id, plan_type, profile["updated_at"], build(profile), reuse_current=True
+        ))
+        _building[key] = task
+        task.add_done_callback(lambda _: _building.pop(key, None))
+    # Shielded, so a caller that goes away does not cancel the others' build.
+    return await asyncio.shield(task)
+
+
+async def save_plans_bulk(
+    db: AsyncIOMotorDatabase,
+    plan_type: str,
+    entries: List[Tuple[str, datetime, Dict[str, Any]]],
+) -> int:
+    """
+    Store a new plan version for many users at once. `entries` holds
+    (user_id, profile_version, payload) tuples. Costs one aggregation to find
+    the current versions plus one unordered insert_many; rows that lose a
+    version race to a concurrent save are skipped. Returns the number stored;
+    any other write error is raised.
+    """
+    if not entries:
+        return 0
+    user_ids = [user_id for user_id, _, _ in entries]
+    latest: Dict[str, int] = {}
+    async for row in db[PLANS_COLLECTION].aggregate([
+        {"$match": {"user_id": {"$in": user_ids}, "plan_type": plan_type}},
+        {"$group": {"_id": "$user_id", "version": {"$max": "$version"}}},
+    ]):
+        latest[row["_id"]] = row["version"]
+
+    now = datetime.utcnow()
+    docs = [
+        {
+            "user_id": user_id,
+            "plan_type": plan_type,
+            "profile_version": profile_version,
+            "version": latest.get(user_id, 0) + 1,
+            "payload": payload,
+            "created_at": now,
+        }
+        for user_id, profile_version, payload in entries
+    ]
+    try:
+        result = await db[PLANS_COLLECTION].insert_many(docs, ordered=False)
+        return len(result.inserted_ids)
+    except BulkWriteError as e:
+        errors = e.details.get("writeErrors", [])
+        if e.details.get("writeConcernErrors") or any(err.get("code") != _DUPLICATE_KEY for err in errors):
+            raise
+        return e.details.get("nInserted", 0)
+
+
+def plan_history_cursor(
+    db: AsyncIOMotorDatabase, user_id: str, plan_type: Optional[str] = None
+) -> Any:
+    """
+    Every stored plan version for the user, newest first per plan type.
+    The sort follows user_plan_version_unique, so Mongo streams it from the
+    index without an in-memory sort.
+    """
+    query: Dict[str, Any] = {"user_id": user_id}
+    if plan_type:
+        query["plan_type"] = plan_type
+    return db[PLANS_COLLECTION].find(
+        query, {"_id": 0, "user_id": 0}
+    ).sort([("plan_type", ASCENDING), ("version", DESCENDING)])
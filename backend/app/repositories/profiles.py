@@ -0,0 +1,63 @@
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from fastapi import HTTPException
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReturnDocument
+
+from ..models.schemas import HealthProfileCreate, HealthProfileResponse
+
+PROFILES_COLLECTION = "health_profiles"
+
+
+async def get_profile(db: AsyncIOMotorDatabase, user_id: str) -> Optional[Dict[str, Any]]:
+    return await db[PROFILES_COLLECTION].find_one({"user_id": user_id})
+
+
+async def require_profile(db: AsyncIOMotorDatabase, user_id: str) -> Dict[str, Any]:
+    """
+    Like get_profile, but raises 404 when the user has no profile yet.
+    """
+    profile = await get_profile(db, user_id)
+    if not profile:
+        raise HTTPException(status_code=404, detail="Health profile not found")
+    return profile
+
+
+async def upsert_profile(
+    db: AsyncIOMotorDatabase, user_id: str, profile_in: HealthProfileCreate
+) -> Dict[str, Any]:
+    """
+    Create or replace the user's profile in one atomic round trip and return
+    the stored document. created_at is only written on insert.
+    """
+    now = datetime.utcnow()
+    profile_data = {
+        "age": profile_in.age,
+        "gender": profile_in.gender,
+        "weight": profile_in.weight,
+        "height": profile_in.height,
+        "dietary_preferences": profile_in.dietary_preferences or [],
+        "existing_conditions": profile_in.existing_conditions or [],
+        "user_id": user_id,
+        "updated_at": now,
+    }
+    return await db[PROFILES_COLLECTION].find_one_and_update(
+        {"user_id": user_id},
+        {"$set": profile_data, "$setOnInsert": {"created_at": now}},
+        upsert=True,
+        return_document=ReturnDocument.AFTER,
+    )
+
+
+def to_profile_response(profile: Dict[str, Any]) -> HealthProfileResponse:
+    return HealthProfileResponse(
+        age=profile["age"],
+        gender=profile["gender"],
+        weight=profile["weight"],
+        height=profile["height"],
+        dietary_preferences=profile.get("dietary_preferences", []),
+        existing_conditions=profile.get("existing_conditions", []),
+        created_at=profile["created_at"],
+        updated_at=profile["updated_at"],
+    )
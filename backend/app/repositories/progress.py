@@ -0,0 +1,176 @@
+from datetime import date, datetime
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import DESCENDING, UpdateOne
+from pymongo.errors import BulkWriteError
+
+from ..models.schemas import DailyLogCreate
+from ..tools.progress_tracker import (
+    build_rollups,
+    effective_logs,
+    merge_rollups,
+    period_keys,
+    period_span,
+    rollup_id,
+)
+
+# Time-series collection (see app.indexes): one document per submitted log,
+# never updated. The newest submission for a date is the effective one.
+DAILY_LOGS_COLLECTION = "daily_logs"
+ROLLUPS_COLLECTION = "progress_rollups"
+
+
+async def _write_rollups(db: AsyncIOMotorDatabase, rollups: Dict[str, Dict[str, Any]]) -> None:
+    """
+    Replace each rollup unless the stored one already covers more log
+    submissions. A newer rollup makes the upsert collide on _id; that
+    duplicate key error is the expected outcome and ignored.
+    """
+    if not rollups:
+        return
+    now = datetime.utcnow()
+    try:
+        await db[ROLLUPS_COLLECTION].bulk_write(
+            [
+                UpdateOne(
+                    {"_id": _id, "log_count": {"$not": {"$gt": doc["log_count"]}}},
+                    {"$set": {**doc, "updated_at": now}},
+                    upsert=True,
+                )
+                for _id, doc in rollups.items()
+            ],
+            ordered=False,
+        )
+    except BulkWriteError as e:
+        if any(err.get("code") != 11000 for err in e.details.get("writeErrors", [])):
+            raise
+
+
+async def refresh_rollups(db: AsyncIOMotorDatabase, user_id: str, dates: List[str]) -> None:
+    """
+    Recompute the week and month rollups containing `dates` from the stored
+    logs, then the all-time rollup from the month rollups. Recomputing
+    (rather than adding deltas) makes repeated or concurrent submissions for
+    a date count once, and any earlier failed refresh of the same periods is
+    repaired by the next one.
+    """
+    days = [date.fromisoformat(d) for d in dates]
+    keys = {
+        (period, key)
+        for day in days
+        for period, key in period_keys(day).items()
+        if period != "all"
+    }
+    spans = [period_span(day) for day in days]
+    cursor = db[DAILY_LOGS_COLLECTION].find(
+        {
+            "user_id": user_id,
+            "date": {"$gte": min(s for s, _ in spans), "$lte": max(e for _, e in spans)},
+        },
+        {"_id": 0, "date": 1, "weight": 1, "calories_in": 1, "calories_out": 1, "created_at": 1},
+    ).sort([("date", 1), ("created_at", 1)])
+    logs = effective_logs([row async for row in cursor])
+    await _write_rollups(db, build_rollups(user_id, logs, keys))
+
+    months = [
+        row async for row in db[ROLLUPS_COLLECTION].find({"user_id": user_id, "period": "month"})
+    ]
+    if months:
+        await _write_rollups(db, {rollup_id(user_id, "all", "all"): merge_rollups(user_id, months)})
+
+
+async def record_logs(
+    db: AsyncIOMotorDatabase, user_id: str, logs: List[DailyLogCreate]
+) -> List[Dict[str, Any]]:
+    """
+    Store daily logs and refresh the user's week/month/all-time rollups for
+    the affected periods. If a date appears twice, the last wins. Returns
+    the stored documents.
+    """
+    by_date = {log.date: log for log in logs}
+    if not by_date:
+        return []
+
+    now = datetime.utcnow()
+    docs = [
+        {
+            "user_id": user_id,
+            "ts": datetime.fromisoformat(day),
+            "date": day,
+            "weight": log.weight,
+            "calories_in": log.calories_in,
+            "calories_out": log.calories_out,
+            "created_at": now,
+        }
+        for day, log in sorted(by_date.items())
+    ]
+    await db[DAILY_LOGS_COLLECTION].insert_many([dict(d) for d in docs], ordered=False)
+    await refresh_rollups(db, user_id, list(by_date))
+    return docs
+
+
+async def list_logs(
+    db: AsyncIOMotorDatabase,
+    user_id: str,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    limit: int = 366,
+) -> List[Dict[str, Any]]:
+    date_range: Dict[str, str] = {}
+    if start:
+        date_range["$gte"] = start
+    if end:
+        date_range["$lte"] = end
+    match: Dict[str, Any] = {"user_id": user_id}
+    if date_range:
+        match["date"] = date_range
+    pipeline = [
+        {"$match": match},
+        {"$sort": {"date": 1, "created_at": 1}},
+        {"$group": {
+            "_id": "$date",
+            "date": {"$last": "$date"},
+            "weight": {"$last": "$weight"},
+            "calories_in": {"$last": "$calories_in"},
+            "calories_out": {"$last": "$calories_out"},
+            "created_at": {"$last": "$created_at"},
+        }},
+        {"$sort": {"_id": 1}},
+        {"$limit": limit},
+    ]
+    return [row async for row in db[DAILY_LOGS_COLLECTION].aggregate(pipeline)]
+
+
+async def get_summary_rollup(db: AsyncIOMotorDatabase, user_id: str) -> Optional[Dict[str, Any]]:
+    return await db[ROLLUPS_COLLECTION].find_one({"_id": rollup_id(user_id, "all", "all")})
+
+
+async def list_rollups(
+    db: AsyncIOMotorDatabase, user_id: str, period: str, limit: int
+) -> List[Dict[str, Any]]:
+    cursor = db[ROLLUPS_COLLECTION].find(
+        {"user_id": user_id, "period": period}
+    ).sort("key", DESCENDING).limit(limit)
+    return [row async for row in cursor]
+
+
+async def iter_logs(
+    db: AsyncIOMotorDatabase, user_id: str, batch_size: int
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Every effective daily log in date order, streamed from the cursor. Rows
+    arrive sorted by (date, created_at), so only the current date is held to
+    drop superseded submissions.
+    """
+    cursor = db[DAILY_LOGS_COLLECTION].find(
+        {"user_id": user_id},
+        {"_id": 0, "user_id": 0, "ts": 0},
+    ).sort([("date", 1), ("created_at", 1)]).batch_size(batch_size)
+    pending: Optional[Dict[str, Any]] = None
+    async for row in cursor:
+        if pending is not None and pending["date"] != row["date"]:
+            yield pending
+        pending = row
+    if pending is not None:
+        yield pending
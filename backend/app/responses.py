@@ -0,0 +1,70 @@
+from typing import Any, Dict, Hashable, Optional, Type
+
+import orjson
+from bson import ObjectId
+from fastapi import Response
+from pydantic import BaseModel
+
+from app.dependencies import settings
+from app.ttl_cache import TTLCache
+
+_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, default=_default, option=_OPTIONS)
+
+
+class ORJSONResponse(Response):
+    """
+    JSON response encoded with orjson. Returning a Response from an endpoint
+    also skips FastAPI's response_model validation, so only use it for data
+    the application built itself.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, (bytes, bytearray)):
+            return bytes(content)
+        return dumps(content)
+
+
+class PayloadCache:
+    """
+    Serialized JSON bodies for immutable documents (stored plan versions,
+    finished plan jobs), keyed by document id. A body is validated against
+    its response model once, when it is first serialized; after that the
+    same bytes are served unchanged.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self._cache: TTLCache[bytes] = TTLCache(max_entries, ttl_seconds)
+
+    def serialize(
+        self, key: Hashable, payload: Any, model: Optional[Type[BaseModel]] = None
+    ) -> bytes:
+        body = self._cache.get(key)
+        if body is None:
+            if model is not None:
+                payload = model.model_validate(payload).model_dump()
+            body = dumps(payload)
+            self._cache.set(key, body)
+        return body
+
+    def stats(self) -> Dict[str, Any]:
+        return {"enabled": settings.fast_json_responses, **self._cache.stats()}
+
+
+payload_cache = PayloadCache(
+    max_entries=settings.response_cache_max_entries,
+    ttl_seconds=settings.response_cache_ttl_seconds,
+)
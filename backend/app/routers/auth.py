@@ -2,12 +2,14 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from typing import Optional
 from datetime import datetime, timedelta
-from passlib.context import CryptContext
 from jose import JWTError, jwt
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from bson.objectid import ObjectId
+from pymongo.errors import DuplicateKeyError
 
 from ..dependencies import get_database, settings
+from ..hashing import password_hasher
+from ..ttl_cache import TTLCache
 from ..models.schemas import (
     UserCreate,
     UserInDB,
@@ -18,17 +20,27 @@ from ..models.schemas import (
 )
 
 router = APIRouter(prefix="/api/auth", tags=["auth"])
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
+# Short-lived cache of authenticated users, keyed by username. Staleness is
+# bounded by the TTL; call invalidate_cached_user() whenever a user changes.
+user_cache: TTLCache[UserInDB] = TTLCache(
+    max_entries=settings.user_cache_max_entries,
+    ttl_seconds=settings.user_cache_ttl_seconds,
+)
+
+
+def invalidate_cached_user(username: str) -> None:
+    user_cache.pop(username)
 
-def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
 
+async def get_password_hash(password: str) -> str:
+    return await password_hasher.hash(password)
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return await password_hasher.verify(plain_password, hashed_password)
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -75,11 +87,36 @@ async def authenticate_user(
     user = await get_user_by_username(db, username)
     if not user:
         return None
-    if not verify_password(password, user.hashed_password):
+    verified, new_hash = await password_hasher.verify_and_update(password, user.hashed_password)
+    if not verified:
         return None
+    if new_hash:
+        # Stored hash used an older cost factor; upgrade it transparently.
+        await db["users"].update_one(
+            {"username": user.username}, {"$set": {"hashed_password": new_hash}}
+        )
+        invalidate_cached_user(user.username)
     return user
 
 
+def user_from_token_claims(payload: dict) -> Optional[UserInDB]:
+    """
+    Build the user from signed token claims alone, without a database lookup.
+    Returns None for tokens issued before the claims were added.
+    hashed_password is left empty; it is never needed downstream of auth.
+    """
+    try:
+        return UserInDB(
+            id=payload["uid"],
+            username=payload["sub"],
+            email=payload["email"],
+            hashed_password="",
+            created_at=datetime.fromisoformat(payload["created_at"]),
+        )
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: AsyncIOMotorDatabase = Depends(get_database),
@@ -100,17 +137,38 @@ async def get_current_user(
     except JWTError:
         raise credentials_exception
 
+    if settings.trust_token_claims:
+        claimed = user_from_token_claims(payload)
+        if claimed is not None:
+            return claimed
+
+    cached = user_cache.get(token_data.username)
+    if cached is not None:
+        return cached
+
     user_row = await db["users"].find_one({"username": token_data.username})
     if not user_row:
         raise credentials_exception
 
-    return UserInDB(
+    user = UserInDB(
         id=str(user_row["_id"]),
         username=user_row["username"],
         email=user_row["email"],
         hashed_password=user_row["hashed_password"],
         created_at=user_row["created_at"],
     )
+    user_cache.set(user.username, user)
+    return user
+
+
+async def get_admin_user(current_user: UserInDB = Depends(get_current_user)) -> UserInDB:
+    """
+    Restricts internal stats endpoints to the users listed in ADMIN_USERNAMES.
+    """
+    admins = {name.strip() for name in settings.admin_usernames.split(",") if name.strip()}
+    if current_user.username not in admins:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required")
+    return current_user
 
 
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
@@ -118,21 +176,23 @@ async def register(
     user_in: UserCreate,
     db: AsyncIOMotorDatabase = Depends(get_database),
 ):
-    # Check if username or email already exists
-    if await db["users"].find_one({"username": user_in.username}):
-        raise HTTPException(status_code=400, detail="Username already registered")
-    if await db["users"].find_one({"email": user_in.email}):
-        raise HTTPException(status_code=400, detail="Email already registered")
-
-    hashed_password = get_password_hash(user_in.password)
+    hashed_password = await get_password_hash(user_in.password)
     user_doc = {
         "username": user_in.username,
         "email": user_in.email,
         "hashed_password": hashed_password,
         "created_at": datetime.utcnow(),
     }
-    result = await db["users"].insert_one(user_doc)
+    # Uniqueness of username and email is enforced by the indexes in app.indexes.
+    try:
+        result = await db["users"].insert_one(user_doc)
+    except DuplicateKeyError as e:
+        key_pattern = (e.details or {}).get("keyPattern", {})
+        if "email" in key_pattern:
+            raise HTTPException(status_code=400, detail="Email already registered")
+        raise HTTPException(status_code=400, detail="Username already registered")
     user_doc["_id"] = result.inserted_id
+    invalidate_cached_user(user_doc["username"])
 
     return UserResponse(
         id=str(user_doc["_id"]),
@@ -157,11 +217,25 @@ async def login(
 
     access_token_expires = timedelta(minutes=settings.access_token_expire_minutes)
     access_token = create_access_token(
-        data={"sub": user.username}, expires_delta=access_token_expires
+        data={
+            "sub": user.username,
+            "uid": user.id,
+            "email": user.email,
+            "created_at": user.created_at.isoformat(),
+        },
+        expires_delta=access_token_expires,
     )
     return {"access_token": access_token, "token_type": "bearer"}
 
 
+@router.get("/hash-pool", dependencies=[Depends(get_admin_user)])
+async def hash_pool_stats():
+    """
+    Queue depth and admission counters for the password hashing pool.
+    """
+    return password_hasher.stats()
+
+
 @router.get("/me", response_model=UserResponse)
 async def read_users_me(current_user: UserInDB = Depends(get_current_user)):
     return UserResponse(
@@ -1,12 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.responses import StreamingResponse
 from motor.motor_asyncio import AsyncIOMotorDatabase
+import asyncio
 import json
 from bson import ObjectId
-from datetime import datetime
-from typing import Dict, Any
+from pydantic import BaseModel
+from typing import Dict, Any, List, AsyncIterator, Literal, Optional, Tuple, Type
 import traceback
 import sys
-from ..dependencies import get_database
+from ..dependencies import get_database, settings
 from ..models.schemas import (
     HealthProfileCreate,
     HealthProfileResponse,
@@ -15,16 +17,31 @@ from ..models.schemas import (
     MealPlanDay,
     UserInDB,
 )
-from ..routers.auth import get_current_user
-from ..tools.bmr_calculator import calculate_bmr
+from ..routers.auth import get_admin_user, get_current_user
+from ..repositories.profiles import require_profile, upsert_profile, to_profile_response
+from ..repositories.plans import get_or_create_plan, plan_history_cursor, save_plan
+from ..export import ExportFormat, cursor_rows, export_response
+from ..http_cache import conditional, make_etag, set_cache_headers, version_etag
+from ..responses import ORJSONResponse, payload_cache
+from ..tools.bmr_calculator import ACTIVITY_FACTOR, calculate_bmr
 from ..tools.meal_planner import generate_meal_plan
 from ..tools.workout_generator import generate_workout_plan
 from ..models.schemas import WorkoutPlanResponse, WorkoutPlanDay, ExerciseItem
-from ..tools.recipe_fetcher import fetch_recipe
-from ..models.schemas import RecipeResponse
-from ..tools.push_notifier import send_push_notification
-from ..models.schemas import UserResponse
-from ..lmm_client import ask_llm
+from ..tools.recipe_fetcher import fetch_meal_plan_recipes, find_recipe
+from ..tools.recipe_store import recipe_store
+from ..recipe_provider import recipe_provider
+from ..models.schemas import MealPlanRecipesResponse, RecipeResponse
+from ..notifications import notification_dispatcher
+from ..models.schemas import NotificationQueued, UserResponse
+from ..models.schemas import PlanJobStatus
+from ..plan_jobs import get_plan_job, plan_job_worker, submit_plan_job
+from ..lmm_client import ask_llm, ask_llm_stream
+from ..llm_cache import llm_cache
+from ..indexes import index_status
+from ..database import database
+from ..orchestration.executor import plan_executor
+from ..orchestration.registry import tool_registry
+from ..orchestration.fast_path import fast_path_planner
 
 router = APIRouter()
 
@@ -37,6 +54,47 @@ async def ping(db: AsyncIOMotorDatabase = Depends(get_database)):
     return {"status": "alive", "collections": collections}
 
 
+@router.get("/indexes", dependencies=[Depends(get_admin_user)])
+async def index_build_status():
+    """
+    Outcome of the startup index check (see app.indexes).
+    """
+    return index_status
+
+
+@router.get("/db/pool", dependencies=[Depends(get_admin_user)])
+async def db_pool_stats():
+    """
+    MongoDB connection pool usage: open and checked-out connections,
+    operations waiting for one, and failed checkouts.
+    """
+    return database.stats()
+
+
+@router.get("/llm/cache", dependencies=[Depends(get_admin_user)])
+async def llm_cache_stats():
+    """
+    Hit/miss counters for the orchestrator's LLM response cache.
+    """
+    return llm_cache.stats()
+
+
+@router.get("/responses/cache", dependencies=[Depends(get_admin_user)])
+async def response_cache_stats():
+    """
+    Hit/miss counters for the serialized plan bodies (FAST_JSON_RESPONSES).
+    """
+    return payload_cache.stats()
+
+
+@router.get("/plan/fast-path", dependencies=[Depends(get_admin_user)])
+async def fast_path_stats():
+    """
+    How many /plan requests were planned locally instead of by the LLM.
+    """
+    return fast_path_planner.stats()
+
+
 @router.post(
     "/profile",
     response_model=HealthProfileResponse,
@@ -56,51 +114,8 @@ async def create_or_update_profile(
     if not ObjectId.is_valid(user_id_str):
         raise HTTPException(status_code=400, detail="Invalid user ID")
 
-    existing = await db["health_profiles"].find_one({"user_id": user_id_str})
-    now = datetime.utcnow()
-    profile_data = {
-        "age": profile_in.age,
-        "gender": profile_in.gender,
-        "weight": profile_in.weight,
-        "height": profile_in.height,
-        "dietary_preferences": profile_in.dietary_preferences or [],
-        "existing_conditions": profile_in.existing_conditions or [],
-        "user_id": user_id_str,
-        "updated_at": now,
-    }
-
-    if existing:
-        # Update existing document
-        await db["health_profiles"].update_one(
-            {"_id": existing["_id"]},
-            {"$set": profile_data}
-        )
-        updated = await db["health_profiles"].find_one({"_id": existing["_id"]})
-        return HealthProfileResponse(
-            age=updated["age"],
-            gender=updated["gender"],
-            weight=updated["weight"],
-            height=updated["height"],
-            dietary_preferences=updated.get("dietary_preferences", []),
-            existing_conditions=updated.get("existing_conditions", []),
-            created_at=updated["created_at"],
-            updated_at=updated["updated_at"],
-        )
-    else:
-        # Insert a new document
-        profile_data["created_at"] = now
-        result = await db["health_profiles"].insert_one(profile_data)
-        inserted = await db["health_profiles"].find_one({"_id": result.inserted_id})
-        return HealthProfileResponse(
-            age=inserted["age"],
-            gender=inserted["gender"],
-            weight=inserted["weight"],
-            height=inserted["height"],
-            dietary_preferences=inserted.get("dietary_preferences", []),
-            existing_conditions=inserted.get("existing_conditions", []),
-            created_at=inserted["created_at"],
-            updated_at=inserted["updated_at"],
-        )
+    profile = await upsert_profile(db, user_id_str, profile_in)
+    return to_profile_response(profile)
 
 
 @router.get(
@@ -109,32 +124,27 @@ async def create_or_update_profile(
     status_code=status.HTTP_200_OK,
 )
 async def read_profile(
+    request: Request,
+    response: Response,
     db: AsyncIOMotorDatabase = Depends(get_database),
     current_user: UserInDB = Depends(get_current_user),
 ):
     """
     Get the health profile of the currently authenticated user.
-    Returns 404 if no profile exists.
+    Returns 404 if no profile exists. Supports If-None-Match and
+    If-Modified-Since.
     """
     user_id_str = current_user.id
 
     if not ObjectId.is_valid(user_id_str):
         raise HTTPException(status_code=400, detail="Invalid user ID")
 
-    existing = await db["health_profiles"].find_one({"user_id": user_id_str})
-    if not existing:
-        raise HTTPException(status_code=404, detail="Health profile not found")
-
-    return HealthProfileResponse(
-        age=existing["age"],
-        gender=existing["gender"],
-        weight=existing["weight"],
-        height=existing["height"],
-        dietary_preferences=existing.get("dietary_preferences", []),
-        existing_conditions=existing.get("existing_conditions", []),
-        created_at=existing["created_at"],
-        updated_at=existing["updated_at"],
-    )
+    existing = await require_profile(db, user_id_str)
+    etag = version_etag(user_id_str, existing["updated_at"].isoformat())
+    cached = conditional(request, response, etag, existing["updated_at"])
+    if cached is not None:
+        return cached
+    return to_profile_response(existing)
 
 
 @router.get(
@@ -143,18 +153,23 @@ async def read_profile(
     status_code=status.HTTP_200_OK,
 )
 async def get_bmr(
+    request: Request,
+    response: Response,
     db: AsyncIOMotorDatabase = Depends(get_database),
     current_user: UserInDB = Depends(get_current_user),
 ):
     """
     Compute and return the BMR for the current user's stored profile.
-    If no profile exists, return 404.
+    If no profile exists, return 404. Supports If-None-Match and
+    If-Modified-Since.
     """
     user_id_str = current_user.id
 
-    existing = await db["health_profiles"].find_one({"user_id": user_id_str})
-    if not existing:
-        raise HTTPException(status_code=404, detail="Health profile not found")
+    existing = await require_profile(db, user_id_str)
+    etag = version_etag(user_id_str, existing["updated_at"].isoformat())
+    cached = conditional(request, response, etag, existing["updated_at"])
+    if cached is not None:
+        return cached
 
     age = existing["age"]
     gender = existing["gender"]
@@ -166,45 +181,134 @@ async def get_bmr(
 
 
 
-@router.post(
+def build_meal_plan(profile: Dict[str, Any]) -> Dict[str, Any]:
+    bmr_value = calculate_bmr(
+        age=profile["age"],
+        weight=profile["weight"],
+        height=profile["height"],
+        gender=profile["gender"],
+    )
+    calorie_target = round(bmr_value * ACTIVITY_FACTOR, 2)
+
+    plan_list = generate_meal_plan(
+        calorie_target=calorie_target,
+        dietary_pref=profile.get("dietary_preferences", []),
+        days=7
+    )
+
+    days_response = [MealPlanDay(**day) for day in plan_list]
+    return MealPlanResponse(calorie_target=calorie_target, days=days_response).model_dump()
+
+
+def workout_intensity(profile: Dict[str, Any]) -> str:
+    """
+    Ease off for older users and a BMI in the obese range.
+    """
+    height_m = profile["height"] / 100
+    bmi = profile["weight"] / (height_m * height_m) if height_m else 0
+    return "low" if profile["age"] >= 60 or bmi >= 30 else "standard"
+
+
+def build_workout_plan(profile: Dict[str, Any]) -> Dict[str, Any]:
+    plan_list = generate_workout_plan(
+        goal="general fitness",
+        days_per_week=7,
+        conditions=profile.get("existing_conditions", []),
+        intensity=workout_intensity(profile),
+    )
+
+    days_response = []
+    for day_dict in plan_list:
+        exercises_items = [
+            ExerciseItem(
+                name=ex["name"], reps=ex.get("reps"), duration=ex.get("duration"), rest=ex.get("rest")
+            )
+            for ex in day_dict["exercises"]
+        ]
+        days_response.append(
+            WorkoutPlanDay(day=day_dict["day"], focus=day_dict.get("focus"), exercises=exercises_items)
+        )
+    return WorkoutPlanResponse(days=days_response).model_dump()
+
+
+def _stored_plan_response(
+    request: Request, response: Response, plan: Dict[str, Any], model: Type[BaseModel]
+) -> Any:
+    etag = make_etag(str(plan["_id"]))
+    cached = conditional(request, response, etag, plan["created_at"])
+    if cached is not None:
+        return cached
+    if settings.fast_json_responses:
+        # Stored plan versions never change, so their body is serialized once.
+        body = payload_cache.serialize(("plan", str(plan["_id"])), plan["payload"], model)
+        response = ORJSONResponse(body)
+        set_cache_headers(response, etag, plan["created_at"])
+        return response
+    return plan["payload"]
+
+
+@router.get(
     "/mealplan",
     response_model=MealPlanResponse,
     status_code=status.HTTP_200_OK,
 )
-async def create_meal_plan(
+async def read_meal_plan(
+    request: Request,
+    response: Response,
     db: AsyncIOMotorDatabase = Depends(get_database),
     current_user: UserInDB = Depends(get_current_user),
 ):
-    user_id_str = current_user.id
-
-    existing = await db["health_profiles"].find_one({"user_id": user_id_str})
-    if not existing:
-        raise HTTPException(status_code=404, detail="Health profile not found")
-
-    age = existing["age"]
-    gender = existing["gender"]
-    weight = existing["weight"]
-    height = existing["height"]
-    bmr_value = calculate_bmr(age=age, weight=weight, height=height, gender=gender)
+    """
+    Return the stored meal plan for the current profile version, generating
+    one only if the profile changed since the last plan. Supports If-None-Match.
+    """
+    existing = await require_profile(db, current_user.id)
+    plan = await get_or_create_plan(db, current_user.id, "meal", existing, build_meal_plan)
+    return _stored_plan_response(request, response, plan, MealPlanResponse)
 
-    calorie_target = round(bmr_value * 1.2, 2)
 
-    dietary_preferences = existing.get("dietary_preferences", [])
-    plan_list = generate_meal_plan(
-        calorie_target=calorie_target,
-        dietary_pref=dietary_preferences,
-        days=7
+@router.post(
+    "/mealplan",
+    response_model=MealPlanResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def create_meal_plan(
+    request: Request,
+    response: Response,
+    db: AsyncIOMotorDatabase = Depends(get_database),
+    current_user: UserInDB = Depends(get_current_user),
+):
+    """
+    Explicitly regenerate the meal plan and store it as a new version.
+    """
+    existing = await require_profile(db, current_user.id)
+    plan = await save_plan(
+        db, current_user.id, "meal", existing["updated_at"], build_meal_plan(existing)
     )
+    return _stored_plan_response(request, response, plan, MealPlanResponse)
 
-    days_response = [MealPlanDay(day=day["day"], meals=day["meals"]) for day in plan_list]
 
-    return MealPlanResponse(
-        calorie_target=calorie_target,
-        days=days_response
-    )    
+########################################
 
+@router.get(
+    "/workoutplan",
+    response_model=WorkoutPlanResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def read_workout_plan(
+    request: Request,
+    response: Response,
+    db: AsyncIOMotorDatabase = Depends(get_database),
+    current_user: UserInDB = Depends(get_current_user),
+):
+    """
+    Return the stored workout plan for the current profile version, generating
+    one only if the profile changed since the last plan. Supports If-None-Match.
+    """
+    existing = await require_profile(db, current_user.id)
+    plan = await get_or_create_plan(db, current_user.id, "workout", existing, build_workout_plan)
+    return _stored_plan_response(request, response, plan, WorkoutPlanResponse)
 
-########################################
 
 @router.post(
     "/workoutplan",
@@ -212,30 +316,41 @@ async def create_meal_plan(
     status_code=status.HTTP_200_OK,
 )
 async def create_workout_plan(
+    request: Request,
+    response: Response,
     db: AsyncIOMotorDatabase = Depends(get_database),
     current_user: UserInDB = Depends(get_current_user),
 ):
-    user_id_str = current_user.id
-
-    # 1. Fetch profile
-    existing = await db["health_profiles"].find_one({"user_id": user_id_str})
-    if not existing:
-        raise HTTPException(status_code=404, detail="Health profile not found")
-
-    existing_conditions = existing.get("existing_conditions", [])
-
-    plan_list = generate_workout_plan(existing_conditions=existing_conditions, days=7)
+    """
+    Explicitly regenerate the workout plan and store it as a new version.
+    """
+    existing = await require_profile(db, current_user.id)
+    plan = await save_plan(
+        db, current_user.id, "workout", existing["updated_at"], build_workout_plan(existing)
+    )
+    return _stored_plan_response(request, response, plan, WorkoutPlanResponse)
 
-    days_response = []
-    for day_dict in plan_list:
-        exercises_items = [
-            ExerciseItem(name=ex["name"], reps=ex.get("reps"), duration=ex.get("duration"))
-            for ex in day_dict["exercises"]
-        ]
-        days_response.append(WorkoutPlanDay(day=day_dict["day"], exercises=exercises_items))
 
-    return WorkoutPlanResponse(days=days_response)
 
+@router.get("/plans/export")
+async def export_plan_history(
+    format: ExportFormat = "ndjson",
+    plan_type: Optional[Literal["meal", "workout"]] = None,
+    gzip: bool = False,
+    db: AsyncIOMotorDatabase = Depends(get_database),
+    current_user: UserInDB = Depends(get_current_user),
+):
+    """
+    Download every stored plan version as NDJSON or CSV, streamed from the
+    database. In CSV the plan body is a JSON-encoded "payload" column.
+    """
+    return export_response(
+        cursor_rows(plan_history_cursor(db, current_user.id, plan_type)),
+        format,
+        filename="plans",
+        csv_fields=["plan_type", "version", "profile_version", "created_at", "payload"],
+        compress=gzip,
+    )
 
 
 #########################################################
@@ -249,18 +364,69 @@ async def get_recipe(
     meal_name: str,
     current_user: UserInDB = Depends(get_current_user),
 ):
-
-    recipe_data = fetch_recipe(meal_name)
+    """
+    Look a recipe up in the local store (exact, then word prefix, then fuzzy
+    name match), falling back to the external provider if one is configured.
+    """
+    recipe_data = await find_recipe(meal_name)
+    if recipe_data is None:
+        raise HTTPException(status_code=404, detail=f"No recipe found for '{meal_name}'")
     return RecipeResponse(**recipe_data)
 
 
+@router.get(
+    "/recipes/search",
+    response_model=List[RecipeResponse],
+    status_code=status.HTTP_200_OK,
+)
+async def search_recipes(
+    q: str,
+    limit: int = 10,
+    current_user: UserInDB = Depends(get_current_user),
+):
+    """
+    Prefix search over recipe names and ingredients.
+    """
+    return await recipe_store.search(q, limit=min(max(limit, 1), 50))
+
+
+@router.get("/recipes/cache", dependencies=[Depends(get_admin_user)])
+async def recipe_cache_stats():
+    """
+    Size of the recipe store, its hot-recipe LRU counters and the external
+    provider's request/coalescing counters.
+    """
+    return {"store": recipe_store.stats(), "provider": recipe_provider.stats()}
+
+
+@router.get(
+    "/mealplan/recipes",
+    response_model=MealPlanRecipesResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def read_meal_plan_recipes(
+    db: AsyncIOMotorDatabase = Depends(get_database),
+    current_user: UserInDB = Depends(get_current_user),
+):
+    """
+    Recipes for every dish in the current meal plan, resolved in one batch.
+    """
+    existing = await require_profile(db, current_user.id)
+    plan = await get_or_create_plan(db, current_user.id, "meal", existing, build_meal_plan)
+    found = await fetch_meal_plan_recipes(plan["payload"]["days"])
+    return MealPlanRecipesResponse(
+        recipes={name: recipe for name, recipe in found.items() if recipe is not None},
+        missing=[name for name, recipe in found.items() if recipe is None],
+    )
+
+
 
 #######################
 
 @router.post(
     "/notify",
-    response_model=Dict[str, Any],
-    status_code=status.HTTP_200_OK,
+    response_model=NotificationQueued,
+    status_code=status.HTTP_202_ACCEPTED,
 )
 async def notify_now(
     payload: Dict[str, str],  # expects {"message": "..."}
@@ -268,18 +434,19 @@ async def notify_now(
     current_user: UserInDB = Depends(get_current_user),
 ):
     """
-    Trigger a push notification for the current user immediately.
+    Queue a push notification for the current user and return immediately;
+    the notification dispatcher delivers it. Poll
+    /api/notifications/{id} for the delivery status.
     Body: { "message": "Your custom reminder text" }
     """
     message = payload.get("message")
     if not message:
         raise HTTPException(status_code=400, detail="Message is required")
 
-    user_id_str = current_user.id
-
-    # Call our stub tool
-    result = send_push_notification(user_id=user_id_str, message=message)
-    return result
+    doc = await notification_dispatcher.enqueue(db, current_user.id, message)
+    return NotificationQueued(
+        id=str(doc["_id"]), status=doc["status"], user_id=doc["user_id"], message=doc["message"]
+    )
 
 
 
@@ -291,10 +458,7 @@ LLM_ORCHESTRATOR_PROMPT = """
 You are an orchestrator. Output ONLY valid JSON with no extra text or markdown fences.
 
 Available tools:
-1. calculate_bmr(age: int, weight: float, height: float, gender: str) -> {{ "bmr": float }}
-2. generate_meal_plan(calorie_target: float, dietary_pref: List[str], days: int) -> [ … ]
-3. generate_workout_plan(goal: str, days_per_week: int, conditions: List[str]) -> [ … ]
-4. fetch_recipe(meal_name: str) -> {{ … }}
+{tools}
 
 Return a single JSON object with a top‐level key "steps" whose value is a list of:
   {{ "tool": "<tool_name>", "args": {{ … }} }}
@@ -302,15 +466,15 @@ Return a single JSON object with a top‐level key "steps" whose value is a list
 Do NOT output any fences or commentary—only the JSON.
 
 User profile:
-  age: {{age}}
-  weight: {{weight}}
-  height: {{height}}
-  gender: "{{gender}}"
-  dietary_preferences: {{dietary_preferences}}
-  existing_conditions: {{existing_conditions}}
+  age: {age}
+  weight: {weight}
+  height: {height}
+  gender: "{gender}"
+  dietary_preferences: {dietary_preferences}
+  existing_conditions: {existing_conditions}
 
 User’s goal:
-  "{{goal}}"
+  "{goal}"
 """
 
 def clean_llm_output(raw: str) -> str:
@@ -325,33 +489,20 @@ def clean_llm_output(raw: str) -> str:
         return "\n".join(cleaned).strip()
     return raw
 
-async def orchestrate_plan(
-    db: AsyncIOMotorDatabase, user: UserInDB, goal: str
-) -> Dict[str, Any]:
-    prof = await db["health_profiles"].find_one({"user_id": user.id})
-    if not prof:
-        raise HTTPException(status_code=404, detail="Health profile not found")
-
-    age = prof["age"]
-    weight = prof["weight"]
-    height = prof["height"]
-    gender = prof["gender"]
-    dietary_preferences = prof.get("dietary_preferences", [])
-    existing_conditions = prof.get("existing_conditions", [])
-
-    prompt = LLM_ORCHESTRATOR_PROMPT.format(
-        age=age,
-        weight=weight,
-        height=height,
-        gender=gender,
-        dietary_preferences=dietary_preferences,
-        existing_conditions=existing_conditions,
+def build_orchestrator_prompt(prof: Dict[str, Any], goal: str) -> str:
+    return LLM_ORCHESTRATOR_PROMPT.format(
+        tools=tool_registry.prompt_tool_list(),
+        age=prof["age"],
+        weight=prof["weight"],
+        height=prof["height"],
+        gender=prof["gender"],
+        dietary_preferences=prof.get("dietary_preferences", []),
+        existing_conditions=prof.get("existing_conditions", []),
         goal=goal.replace('"', '\\"'),
     )
 
-    llm_output = ask_llm(prompt)
-    print("⏺ LLM raw output:\n", llm_output, file=sys.stderr)
 
+def parse_llm_steps(llm_output: str) -> List[Dict[str, Any]]:
     llm_clean = clean_llm_output(llm_output)
     try:
         doc = json.loads(llm_clean)
@@ -360,52 +511,169 @@ async def orchestrate_plan(
             status_code=500,
             detail=f"LLM returned invalid JSON:\n{llm_output}"
         )
+    return tool_registry.validate_steps(doc.get("steps", []))
 
-    steps = doc.get("steps", [])
-    result: Dict[str, Any] = {}
 
-    for step in steps:
-        tool_name = step.get("tool")
-        args = step.get("args", {})
+async def execute_steps(steps: List[Dict[str, Any]]) -> Dict[str, Any]:
+    return await plan_executor.execute(steps, tool_registry.bindings)
 
-        if tool_name == "calculate_bmr":
-            b = calculate_bmr(
-                age=args["age"],
-                weight=args["weight"],
-                height=args["height"],
-                gender=args["gender"],
-            )
-            result["bmr"] = b
 
-        elif tool_name == "generate_meal_plan":
-            mp = generate_meal_plan(
-                calorie_target=args["calorie_target"],
-                dietary_pref=args["dietary_pref"],
-                days=args["days"],
-            )
-            result["meal_plan"] = mp
+async def orchestrate_plan(
+    db: AsyncIOMotorDatabase, user: UserInDB, goal: str
+) -> Dict[str, Any]:
+    prof = await require_profile(db, user.id)
 
-        elif tool_name == "generate_workout_plan":
-            wp = generate_workout_plan(
-                goal=args["goal"],
-                days_per_week=args["days_per_week"],
-                conditions=args["conditions"],
-            )
-            result["workout_plan"] = wp    
+    steps = fast_path_planner.plan(prof, goal)
+    if steps is not None:
+        planner = "fast_path"
+        steps = tool_registry.validate_steps(steps)
+    else:
+        prompt = build_orchestrator_prompt(prof, goal)
+        llm_output = await llm_cache.get(prompt, db)
+        if llm_output is None:
+            planner = "llm"
+            llm_output = await ask_llm(prompt)
+            print("⏺ LLM raw output:\n", llm_output, file=sys.stderr)
+            steps = parse_llm_steps(llm_output)
+            # Only cache completions that parsed, so a bad answer is not pinned.
+            await llm_cache.set(prompt, llm_output, db)
+        else:
+            planner = "llm_cache"
+            steps = parse_llm_steps(llm_output)
 
-        elif tool_name == "fetch_recipe":
-         
-            meal_name = args.get("meal_name", "")
-            if not meal_name:
-                raise HTTPException(status_code=400, detail="fetch_recipe requires meal_name")
-            recipe = fetch_recipe(meal_name=meal_name)
-           
-            result.setdefault("recipes", []).append(recipe)
+    plan = await execute_steps(steps)
+    plan["meta"]["planner"] = planner
+    return plan
 
-        else:
-            raise HTTPException(status_code=500, detail=f"Unknown tool: {tool_name}")
 
-    return result
+async def plan_events(
+    db: AsyncIOMotorDatabase,
+    user: UserInDB,
+    goal: str,
+    heartbeat_seconds: Optional[float] = None,
+) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+    """
+    The stages of `orchestrate_plan` as (event, data) pairs, yielded as soon
+    as each one happens:
+
+        started   at once, before any work
+        llm       {"delta"} per model token ({"delta", "cached": true} on a cache hit)
+        plan      {"planner", "steps"} once the steps are parsed and validated
+        step      {"index", "tool", "result_key", "value", "duration_ms", ...}
+                  per finished tool step, in completion order
+        result    {"plan"}, the same document orchestrate_plan returns
+        error     {"status", "detail"}; nothing follows it
+
+    The work runs in a separate task feeding a queue, so tool steps keep
+    running while a slow client drains earlier events. With
+    `heartbeat_seconds`, a "ping" event is yielded whenever nothing else
+    happened for that long. Closing the generator cancels the work.
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def emit(event: str, data: Dict[str, Any]) -> None:
+        await queue.put((event, data))
+
+    async def on_step(step: Dict[str, Any]) -> None:
+        await emit("step", step)
+
+    async def produce() -> None:
+        try:
+            prof = await require_profile(db, user.id)
+
+            steps = fast_path_planner.plan(prof, goal)
+            if steps is not None:
+                planner = "fast_path"
+                steps = tool_registry.validate_steps(steps)
+            else:
+                prompt = build_orchestrator_prompt(prof, goal)
+                llm_output = await llm_cache.get(prompt, db)
+                if llm_output is not None:
+                    planner = "llm_cache"
+                    await emit("llm", {"delta": llm_output, "cached": True})
+                    steps = parse_llm_steps(llm_output)
+                else:
+                    planner = "llm"
+                    chunks: List[str] = []
+                    async for delta in ask_llm_stream(prompt):
+                        chunks.append(delta)
+                        await emit("llm", {"delta": delta})
+
+                    llm_output = "".join(chunks)
+                    print("⏺ LLM raw output:\n", llm_output, file=sys.stderr)
+                    steps = parse_llm_steps(llm_output)
+                    await llm_cache.set(prompt, llm_output, db)
+            await emit("plan", {"planner": planner, "steps": steps})
+
+            plan = await plan_executor.execute(steps, tool_registry.bindings, on_step=on_step)
+            plan["meta"]["planner"] = planner
+            await emit("result", {"plan": plan})
+        except HTTPException as e:
+            await emit("error", {"status": e.status_code, "detail": e.detail})
+        except Exception as e:
+            traceback.print_exc()
+            await emit("error", {"status": 500, "detail": str(e)})
+        finally:
+            await queue.put(None)
+
+    yield "started", {"goal": goal}
+    task = asyncio.create_task(produce())
+    try:
+        while True:
+            try:
+                item = await asyncio.wait_for(queue.get(), timeout=heartbeat_seconds)
+            except asyncio.TimeoutError:
+                yield "ping", {}
+                continue
+            if item is None:
+                break
+            yield item
+    finally:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+
+async def stream_orchestrate_plan(
+    db: AsyncIOMotorDatabase, user: UserInDB, goal: str
+) -> AsyncIterator[bytes]:
+    """
+    Same as `orchestrate_plan`, but yields NDJSON lines as the model produces
+    tokens, followed by a final "result" (or "error") line.
+    """
+    async for event, data in plan_events(db, user, goal):
+        if event in ("llm", "result", "error"):
+            yield (json.dumps({"type": event, **data}) + "\n").encode()
+
+
+def sse_event(event: str, data: Dict[str, Any], event_id: Optional[int] = None) -> bytes:
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data, default=str)}")
+    return ("\n".join(lines) + "\n\n").encode()
+
+
+async def sse_orchestrate_plan(
+    db: AsyncIOMotorDatabase, user: UserInDB, goal: str
+) -> AsyncIterator[bytes]:
+    """
+    `plan_events` as Server-Sent Events. Heartbeats are sent as SSE comments
+    so idle proxies keep the connection open during a slow completion.
+    """
+    event_id = 0
+    async for event, data in plan_events(
+        db, user, goal, heartbeat_seconds=settings.plan_stream_heartbeat_seconds
+    ):
+        if event == "ping":
+            yield b": ping\n\n"
+            continue
+        yield sse_event(event, data, event_id)
+        event_id += 1
+
+
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
 
 @router.post(
     "/plan",
@@ -414,6 +682,10 @@ async def orchestrate_plan(
 )
 async def create_full_plan(
     payload: Dict[str, str],
+    request: Request,
+    response: Response,
+    stream: bool = False,
+    background: bool = False,
     db: AsyncIOMotorDatabase = Depends(get_database),
     current_user: UserInDB = Depends(get_current_user),
 ):
@@ -421,9 +693,104 @@ async def create_full_plan(
     if not goal:
         raise HTTPException(status_code=400, detail="Goal is required")
 
+    # ?background=true queues the plan for the job worker and returns at once.
+    if background:
+        job, created = await submit_plan_job(db, current_user, goal)
+        response.status_code = status.HTTP_202_ACCEPTED
+        response.headers["Location"] = f"{request.url.path}/jobs/{job['_id']}"
+        return plan_job_status(job, deduplicated=not created).model_dump(mode="json")
+
+    # Accept: text/event-stream gets the SSE variant, with a "step" event per
+    # finished tool step (BMR, meal plan, each recipe, ...).
+    if "text/event-stream" in request.headers.get("accept", ""):
+        return StreamingResponse(
+            sse_orchestrate_plan(db, current_user, goal),
+            media_type="text/event-stream",
+            headers=SSE_HEADERS,
+        )
+
+    if stream:
+        return StreamingResponse(
+            stream_orchestrate_plan(db, current_user, goal),
+            media_type="application/x-ndjson",
+        )
+
     try:
         plan = await orchestrate_plan(db, current_user, goal)
+        if settings.fast_json_responses:
+            return ORJSONResponse(plan)
         return plan
+    except HTTPException:
+        raise
     except Exception as e:
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
+
+
+def plan_job_status(job: Dict[str, Any], deduplicated: bool = False) -> PlanJobStatus:
+    return PlanJobStatus(
+        id=str(job["_id"]),
+        status=job["status"],
+        goal=job["goal"],
+        attempts=job.get("attempts", 0),
+        created_at=job["created_at"],
+        started_at=job.get("started_at"),
+        finished_at=job.get("finished_at"),
+        error=job.get("error"),
+        deduplicated=deduplicated,
+    )
+
+
+@router.get("/plan/jobs/stats", dependencies=[Depends(get_admin_user)])
+async def plan_job_stats():
+    """
+    Queue depth, plus counters for the job worker if it runs in this process.
+    """
+    return await plan_job_worker.stats()
+
+
+@router.get(
+    "/plan/jobs/{job_id}",
+    response_model=PlanJobStatus,
+    status_code=status.HTTP_200_OK,
+)
+async def read_plan_job(
+    job_id: str,
+    db: AsyncIOMotorDatabase = Depends(get_database),
+    current_user: UserInDB = Depends(get_current_user),
+):
+    """
+    Status of a job queued with POST /plan?background=true.
+    """
+    job = await get_plan_job(db, current_user.id, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Plan job not found")
+    return plan_job_status(job)
+
+
+@router.get("/plan/jobs/{job_id}/result", response_model=Dict[str, Any])
+async def read_plan_job_result(
+    job_id: str,
+    response: Response,
+    db: AsyncIOMotorDatabase = Depends(get_database),
+    current_user: UserInDB = Depends(get_current_user),
+):
+    """
+    The finished plan (same body as POST /plan). While the job is still
+    queued or running this returns 202 with the job status. A failed job
+    returns the status and detail POST /plan would have: the HTTPException
+    the orchestration raised, or 500 with the error message.
+    """
+    job = await get_plan_job(db, current_user.id, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Plan job not found")
+    if job["status"] == "done":
+        if settings.fast_json_responses:
+            return ORJSONResponse(payload_cache.serialize(("plan_job", job_id), job["result"]))
+        return job["result"]
+    if job["status"] == "failed":
+        error = job.get("error") or {}
+        raise HTTPException(status_code=error.get("status", 500), detail=error.get("detail"))
+    response.status_code = status.HTTP_202_ACCEPTED
+    response.headers["Retry-After"] = "1"
+    return plan_job_status(job).model_dump(mode="json")
@@ -0,0 +1,111 @@
+from typing import Any, Dict, List
+
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from ..dependencies import get_database
+from ..models.schemas import (
+    NotificationStatus,
+    ReminderCreate,
+    ReminderResponse,
+    UserInDB,
+)
+from ..notifications import (
+    create_reminder,
+    delete_reminder,
+    get_notification,
+    list_reminders,
+    notification_dispatcher,
+)
+from ..routers.auth import get_admin_user, get_current_user
+
+router = APIRouter(prefix="/api/notifications", tags=["notifications"])
+
+
+def _reminder_response(doc: Dict[str, Any]) -> ReminderResponse:
+    return ReminderResponse(
+        id=str(doc["_id"]),
+        message=doc["message"],
+        local_time=doc["local_time"],
+        timezone=doc["timezone"],
+        active=doc["active"],
+        next_run_at=doc["next_run_at"],
+    )
+
+
+@router.get("/stats", dependencies=[Depends(get_admin_user)])
+async def dispatcher_stats():
+    """
+    Delivery counters for this process and the current outbox backlog.
+    """
+    return await notification_dispatcher.stats()
+
+
+@router.post(
+    "/reminders",
+    response_model=ReminderResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+async def add_reminder(
+    reminder_in: ReminderCreate,
+    db: AsyncIOMotorDatabase = Depends(get_database),
+    current_user: UserInDB = Depends(get_current_user),
+):
+    """
+    Daily reminder at a local wall-clock time, e.g.
+    { "message": "Log today's weight", "local_time": "20:00", "timezone": "Europe/Berlin" }
+    """
+    doc = await create_reminder(
+        db, current_user.id, reminder_in.message, reminder_in.local_time, reminder_in.timezone
+    )
+    return _reminder_response(doc)
+
+
+@router.get(
+    "/reminders",
+    response_model=List[ReminderResponse],
+    status_code=status.HTTP_200_OK,
+)
+async def read_reminders(
+    db: AsyncIOMotorDatabase = Depends(get_database),
+    current_user: UserInDB = Depends(get_current_user),
+):
+    return [_reminder_response(doc) for doc in await list_reminders(db, current_user.id)]
+
+
+@router.delete("/reminders/{reminder_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def remove_reminder(
+    reminder_id: str,
+    db: AsyncIOMotorDatabase = Depends(get_database),
+    current_user: UserInDB = Depends(get_current_user),
+):
+    if not await delete_reminder(db, current_user.id, reminder_id):
+        raise HTTPException(status_code=404, detail="Reminder not found")
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+@router.get(
+    "/{notification_id}",
+    response_model=NotificationStatus,
+    status_code=status.HTTP_200_OK,
+)
+async def read_notification(
+    notification_id: str,
+    db: AsyncIOMotorDatabase = Depends(get_database),
+    current_user: UserInDB = Depends(get_current_user),
+):
+    """
+    Delivery status of a notification queued via /api/health/notify.
+    """
+    doc = await get_notification(db, current_user.id, notification_id)
+    if not doc:
+        raise HTTPException(status_code=404, detail="Notification not found")
+    return NotificationStatus(
+        id=str(doc["_id"]),
+        status=doc["status"],
+        attempts=doc.get("attempts", 0),
+        created_at=doc["created_at"],
+        next_attempt_at=doc.get("next_attempt_at") if doc["status"] == "pending" else None,
+        sent_at=doc.get("sent_at"),
+        last_error=doc.get("last_error"),
+    )
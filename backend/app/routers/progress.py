@@ -0,0 +1,140 @@
+from typing import List, Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from ..dependencies import get_database, settings
+from ..models.schemas import (
+    BulkImportResponse,
+    DailyLogCreate,
+    DailyLogResponse,
+    ProgressRollup,
+    ProgressSummary,
+    UserInDB,
+)
+from ..export import ExportFormat, export_response
+from ..repositories.progress import (
+    get_summary_rollup,
+    iter_logs,
+    list_logs,
+    list_rollups,
+    record_logs,
+)
+from ..routers.auth import get_current_user
+from ..tools.progress_tracker import rollup_view, summary_from_rollup
+
+router = APIRouter(prefix="/api/progress", tags=["progress"])
+
+
+@router.post(
+    "/log",
+    response_model=DailyLogResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+async def log_day(
+    log_in: DailyLogCreate,
+    db: AsyncIOMotorDatabase = Depends(get_database),
+    current_user: UserInDB = Depends(get_current_user),
+):
+    """
+    Record one day. Logging a date again replaces the earlier entry.
+    """
+    docs = await record_logs(db, current_user.id, [log_in])
+    return DailyLogResponse(**docs[0])
+
+
+@router.post(
+    "/logs/bulk",
+    response_model=BulkImportResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+async def import_logs(
+    logs_in: List[DailyLogCreate],
+    db: AsyncIOMotorDatabase = Depends(get_database),
+    current_user: UserInDB = Depends(get_current_user),
+):
+    """
+    Record many days in one request, e.g. when importing from another app.
+    """
+    if len(logs_in) > settings.progress_bulk_max_logs:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {settings.progress_bulk_max_logs} logs per request",
+        )
+    docs = await record_logs(db, current_user.id, logs_in)
+    return BulkImportResponse(received=len(logs_in), imported=len(docs))
+
+
+@router.get(
+    "/logs",
+    response_model=List[DailyLogResponse],
+    status_code=status.HTTP_200_OK,
+)
+async def read_logs(
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    limit: int = Query(366, ge=1, le=5000),
+    db: AsyncIOMotorDatabase = Depends(get_database),
+    current_user: UserInDB = Depends(get_current_user),
+):
+    """
+    Daily logs in date order, optionally between two ISO dates (inclusive).
+    """
+    rows = await list_logs(db, current_user.id, start, end, limit)
+    return [DailyLogResponse(**row) for row in rows]
+
+
+@router.get(
+    "/summary",
+    response_model=ProgressSummary,
+    status_code=status.HTTP_200_OK,
+)
+async def read_summary(
+    db: AsyncIOMotorDatabase = Depends(get_database),
+    current_user: UserInDB = Depends(get_current_user),
+):
+    """
+    First and latest weight, read from the precomputed all-time rollup.
+    """
+    rollup = await get_summary_rollup(db, current_user.id)
+    if not rollup:
+        raise HTTPException(status_code=404, detail="No progress logged yet")
+    return ProgressSummary(**summary_from_rollup(rollup))
+
+
+@router.get(
+    "/rollups",
+    response_model=List[ProgressRollup],
+    status_code=status.HTTP_200_OK,
+)
+async def read_rollups(
+    period: Literal["week", "month"] = "week",
+    limit: int = Query(12, ge=1, le=520),
+    db: AsyncIOMotorDatabase = Depends(get_database),
+    current_user: UserInDB = Depends(get_current_user),
+):
+    """
+    Weekly or monthly weight trend and calorie balance, newest first.
+    """
+    rows = await list_rollups(db, current_user.id, period, limit)
+    return [ProgressRollup(**rollup_view(row)) for row in rows]
+
+
+@router.get("/export")
+async def export_logs(
+    format: ExportFormat = "ndjson",
+    gzip: bool = False,
+    db: AsyncIOMotorDatabase = Depends(get_database),
+    current_user: UserInDB = Depends(get_current_user),
+):
+    """
+    Download the full daily-log history as NDJSON or CSV, streamed from the
+    database. gzip=true compresses on the fly into a .gz file.
+    """
+    return export_response(
+        iter_logs(db, current_user.id, settings.export_batch_size),
+        format,
+        filename="progress",
+        csv_fields=["date", "weight", "calories_in", "calories_out", "created_at"],
+        compress=gzip,
+    )
@@ -0,0 +1,47 @@
+"""
+Local stand-in for the external recipe provider (see app.recipe_provider).
+
+    RECIPE_PROVIDER_BASE_URL=http://localhost:8100
+    uvicorn app.stubs.recipe_provider:app --port 8100
+
+Recipes come from RECIPE_STUB_DATASET (a JSON list shaped like
+app/data/recipes.json, which is the default). RECIPE_STUB_LATENCY_MS adds an
+artificial delay per request.
+"""
+import asyncio
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List
+
+from fastapi import FastAPI
+from pydantic import BaseModel
+
+from app.tools.recipe_store import DATASET_PATH, normalize_name
+
+DATASET = Path(os.getenv("RECIPE_STUB_DATASET", str(DATASET_PATH)))
+LATENCY_SECONDS = float(os.getenv("RECIPE_STUB_LATENCY_MS", "0")) / 1000
+
+RECIPES: Dict[str, Dict[str, Any]] = {
+    normalize_name(r["meal_name"]): r for r in json.loads(DATASET.read_text())
+}
+calls: List[List[str]] = []
+
+app = FastAPI(title="Recipe provider stub")
+
+
+class LookupRequest(BaseModel):
+    names: List[str]
+
+
+@app.post("/recipes/lookup")
+async def lookup(body: LookupRequest):
+    calls.append(body.names)
+    if LATENCY_SECONDS:
+        await asyncio.sleep(LATENCY_SECONDS)
+    return {"recipes": {name: RECIPES.get(normalize_name(name)) for name in body.names}}
+
+
+@app.get("/stats")
+async def stats():
+    return {"requests": len(calls), "names": sum(len(c) for c in calls)}
@@ -1,4 +1,19 @@
-from typing import Literal
+from typing import Iterable, Literal
+
+import numpy as np
+
+# Gender codes used by the batch API. "other" averages the male and female
+# constants, like calculate_bmr does.
+GENDER_CODES = {"male": 0, "female": 1, "other": 2}
+_GENDER_OFFSETS = np.array([5.0, -161.0, -78.0])
+
+# Sedentary activity multiplier turning BMR into a daily calorie target.
+ACTIVITY_FACTOR = 1.2
+
+# Lowest daily calorie target a generated plan may prescribe without
+# medical supervision.
+MIN_CALORIE_TARGET = {"male": 1500.0, "female": 1200.0, "other": 1350.0}
+
 
 def calculate_bmr(
     age: int, weight: float, height: float, gender: Literal["male", "female", "other"]
@@ -14,3 +29,26 @@ def calculate_bmr(
         bmr = (bmr_male + bmr_female) / 2
 
     return float(round(bmr, 2))
+
+
+def encode_genders(genders: Iterable[str]) -> np.ndarray:
+    """
+    Map gender strings to GENDER_CODES; anything unrecognised becomes "other",
+    exactly as calculate_bmr treats it.
+    """
+    other = GENDER_CODES["other"]
+    return np.fromiter((GENDER_CODES.get(g, other) for g in genders), dtype=np.int8)
+
+
+def calculate_bmr_batch(
+    age: np.ndarray, weight: np.ndarray, height: np.ndarray, gender_codes: np.ndarray
+) -> np.ndarray:
+    """
+    Mifflin–St Jeor BMR for many people at once. All arguments are equal-length
+    arrays; gender_codes uses GENDER_CODES. Matches calculate_bmr element-wise.
+    """
+    age = np.asarray(age, dtype=np.float64)
+    weight = np.asarray(weight, dtype=np.float64)
+    height = np.asarray(height, dtype=np.float64)
+    offsets = _GENDER_OFFSETS[np.asarray(gender_codes, dtype=np.intp)]
+    return np.round(10 * weight + 6.25 * height - 5 * age + offsets, 2)
@@ -0,0 +1,174 @@
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+CATEGORIES = ("strength", "cardio", "mobility")
+MUSCLE_GROUPS = ("chest", "back", "shoulders", "arms", "legs", "glutes", "core", "full_body")
+EQUIPMENT = (
+    "none", "dumbbells", "band", "bench", "machine", "pullup_bar",
+    "bike", "pool", "rower", "jump_rope", "foam_roller",
+)
+# Health conditions an exercise can be unsafe for.
+CONDITIONS = (
+    "knee", "back", "shoulder", "wrist", "ankle",
+    "hypertension", "cardiac", "asthma", "pregnancy",
+)
+
+# Equipment assumed when the caller does not say what is available.
+HOME_EQUIPMENT: FrozenSet[str] = frozenset({"none", "dumbbells", "band"})
+
+
+@dataclass(frozen=True)
+class Exercise:
+    name: str
+    category: str
+    muscles: FrozenSet[str]
+    primary: str             # first listed muscle group
+    equipment: str
+    contraindications: FrozenSet[str]
+    sets: int
+    reps: Optional[str]      # per set, e.g. "12" or "10 each leg"
+    duration: Optional[str]  # per set ("30s") or, with one set, in total ("30 min")
+
+
+def _items(category: str, rows: Iterable[Tuple]) -> List[Exercise]:
+    return [
+        Exercise(
+            name, category, frozenset(muscles), muscles[0], equipment, frozenset(contra),
+            sets, reps, duration,
+        )
+        for name, muscles, equipment, contra, sets, reps, duration in rows
+    ]
+
+
+# name, muscle groups, equipment, contraindicated conditions, sets, reps, duration
+CATALOG: List[Exercise] = (
+    _items("strength", [
+        ("Push-Ups", ["chest", "arms", "shoulders"], "none", ["wrist", "shoulder"], 3, "12", None),
+        ("Incline Push-Ups", ["chest", "arms"], "none", ["wrist"], 3, "12", None),
+        ("Dumbbell Bench Press", ["chest", "arms"], "dumbbells", ["shoulder"], 4, "8", None),
+        ("Dumbbell Floor Press", ["chest", "arms"], "dumbbells", [], 3, "10", None),
+        ("Band Chest Press", ["chest"], "band", [], 3, "15", None),
+        ("Bent-Over Dumbbell Row", ["back", "arms"], "dumbbells", ["back"], 4, "10", None),
+        ("Seated Band Row", ["back", "arms"], "band", [], 3, "15", None),
+        ("Lat Pulldown", ["back", "arms"], "machine", ["shoulder"], 4, "10", None),
+        ("Pull-Ups", ["back", "arms"], "pullup_bar", ["shoulder", "wrist"], 3, "6", None),
+        ("Superman Hold", ["back", "core"], "none", ["back", "pregnancy"], 3, None, "30s"),
+        ("Dumbbell Shoulder Press", ["shoulders", "arms"], "dumbbells", ["shoulder", "hypertension"], 3, "10", None),
+        ("Lateral Raises", ["shoulders"], "dumbbells", ["shoulder"], 3, "12", None),
+        ("Band Pull-Aparts", ["shoulders", "back"], "band", [], 3, "15", None),
+        ("Dumbbell Biceps Curl", ["arms"], "dumbbells", [], 3, "12", None),
+        ("Bench Triceps Dips", ["arms", "chest"], "bench", ["shoulder", "wrist"], 3, "10", None),
+        ("Band Triceps Extension", ["arms"], "band", [], 3, "15", None),
+        ("Bodyweight Squats", ["legs", "glutes"], "none", ["knee"], 3, "15", None),
+        ("Goblet Squats", ["legs", "glutes"], "dumbbells", ["knee", "back"], 4, "10", None),
+        ("Box Squats to Bench", ["legs", "glutes"], "bench", [], 3, "12", None),
+        ("Reverse Lunges", ["legs", "glutes"], "none", ["knee", "ankle"], 3, "10 each leg", None),
+        ("Dumbbell Romanian Deadlift", ["legs", "glutes", "back"], "dumbbells", ["back"], 4, "10", None),
+        ("Glute Bridges", ["glutes", "legs"], "none", [], 3, "15", None),
+        ("Seated Leg Extensions", ["legs"], "machine", [], 3, "15", None),
+        ("Step-Ups", ["legs", "glutes"], "bench", ["knee", "ankle"], 3, "10 each leg", None),
+        ("Calf Raises", ["legs"], "none", ["ankle"], 3, "20", None),
+        ("Side-Lying Leg Raises", ["glutes"], "none", [], 3, "15 each side", None),
+        ("Band Lateral Walks", ["glutes", "legs"], "band", [], 3, "12 each way", None),
+        ("Plank", ["core"], "none", ["shoulder", "pregnancy", "hypertension"], 3, None, "30s"),
+        ("Dead Bug", ["core"], "none", ["pregnancy"], 3, "10 each side", None),
+        ("Bird Dog", ["core", "back"], "none", [], 3, "10 each side", None),
+        ("Russian Twists", ["core"], "none", ["back", "pregnancy"], 3, "20", None),
+        ("Band Pallof Press", ["core"], "band", [], 3, "12 each side", None),
+        ("Dumbbell Thrusters", ["full_body", "legs", "shoulders"], "dumbbells",
+         ["knee", "shoulder", "hypertension", "cardiac"], 3, "10", None),
+    ])
+    + _items("cardio", [
+        ("Jumping Jacks", ["full_body"], "none", ["knee", "ankle", "pregnancy", "cardiac"], 3, None, "60s"),
+        ("Burpees", ["full_body"], "none",
+         ["knee", "ankle", "wrist", "back", "pregnancy", "cardiac", "hypertension"], 3, "10", None),
+        ("High Knees", ["legs", "core"], "none", ["knee", "ankle", "pregnancy", "cardiac"], 3, None, "30s"),
+        ("Mountain Climbers", ["core", "full_body"], "none", ["wrist", "shoulder", "pregnancy"], 3, None, "30s"),
+        ("Interval Sprints", ["legs"], "none",
+         ["knee", "ankle", "asthma", "cardiac", "hypertension", "pregnancy"], 8, None, "20s"),
+        ("Jump Rope", ["full_body"], "jump_rope", ["knee", "ankle", "pregnancy", "cardiac"], 10, None, "1 min"),
+        ("Shadow Boxing", ["arms", "shoulders"], "none", ["shoulder"], 3, None, "2 min"),
+        ("Brisk Walking", ["legs"], "none", [], 1, None, "30 min"),
+        ("Stationary Cycling", ["legs"], "bike", [], 1, None, "25 min"),
+        ("Swimming", ["full_body"], "pool", ["shoulder"], 1, None, "30 min"),
+        ("Rowing Machine", ["full_body", "back"], "rower", ["back"], 1, None, "20 min"),
+        ("Low-Impact Step Touch", ["legs"], "none", [], 3, None, "3 min"),
+    ])
+    + _items("mobility", [
+        ("Cat-Cow Stretch", ["back", "core"], "none", [], 2, "10", None),
+        ("Hip Flexor Stretch", ["legs"], "none", ["knee"], 2, None, "30s each side"),
+        ("Hamstring Stretch", ["legs"], "none", [], 2, None, "30s each side"),
+        ("Child's Pose", ["back"], "none", ["knee"], 2, None, "45s"),
+        ("Thoracic Rotations", ["back"], "none", [], 2, "10 each side", None),
+        ("Band Shoulder Dislocates", ["shoulders"], "band", ["shoulder"], 2, "12", None),
+        ("Yoga Flow", ["full_body"], "none", [], 1, None, "20 min"),
+        ("Foam Rolling", ["full_body"], "foam_roller", [], 1, None, "10 min"),
+        ("Diaphragmatic Breathing", ["core"], "none", [], 1, None, "5 min"),
+    ])
+)
+
+
+class ExerciseCatalog:
+    """
+    Exercise catalog with precomputed bitmasks per category, muscle group,
+    equipment and condition. Excluding every exercise unsafe for a set of
+    conditions is one AND with the OR of their masks, which is cached.
+    """
+
+    def __init__(self, items: List[Exercise]):
+        self.items = items
+        self.all_mask = (1 << len(items)) - 1
+        self.category_mask: Dict[str, int] = {c: 0 for c in CATEGORIES}
+        self.muscle_mask: Dict[str, int] = {m: 0 for m in MUSCLE_GROUPS}
+        self.equipment_mask: Dict[str, int] = {e: 0 for e in EQUIPMENT}
+        self.condition_mask: Dict[str, int] = {c: 0 for c in CONDITIONS}
+
+        for i, item in enumerate(items):
+            bit = 1 << i
+            self.category_mask[item.category] |= bit
+            self.equipment_mask[item.equipment] |= bit
+            for muscle in item.muscles:
+                self.muscle_mask[muscle] |= bit
+            for condition in item.contraindications:
+                self.condition_mask[condition] |= bit
+
+    def safe_mask(self, conditions: FrozenSet[str]) -> int:
+        """Exercises not contraindicated by any of `conditions`."""
+        return _cached_safe_mask(self, conditions)
+
+    def available_mask(self, equipment: FrozenSet[str]) -> int:
+        return _cached_available_mask(self, equipment)
+
+    def mask(self, category: str, muscle: Optional[str]) -> int:
+        mask = self.category_mask.get(category, 0)
+        if muscle is not None:
+            mask &= self.muscle_mask.get(muscle, 0)
+        return mask
+
+    def select(self, mask: int) -> Tuple[Exercise, ...]:
+        out = []
+        while mask:
+            low = mask & -mask
+            out.append(self.items[low.bit_length() - 1])
+            mask ^= low
+        return tuple(out)
+
+
+@lru_cache(maxsize=512)
+def _cached_safe_mask(catalog: ExerciseCatalog, conditions: FrozenSet[str]) -> int:
+    unsafe = 0
+    for condition in conditions:
+        unsafe |= catalog.condition_mask.get(condition, 0)
+    return catalog.all_mask & ~unsafe
+
+
+@lru_cache(maxsize=128)
+def _cached_available_mask(catalog: ExerciseCatalog, equipment: FrozenSet[str]) -> int:
+    mask = 0
+    for item in equipment:
+        mask |= catalog.equipment_mask.get(item, 0)
+    return mask
+
+
+exercise_catalog = ExerciseCatalog(CATALOG)
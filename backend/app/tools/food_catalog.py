@@ -0,0 +1,165 @@
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Tuple
+
+SLOTS = ("breakfast", "lunch", "dinner", "snack")
+
+# A dish carries every diet tag it satisfies, e.g. a vegan dish is also
+# vegetarian and pescatarian.
+DIET_TAGS: Dict[str, FrozenSet[str]] = {
+    "vegan": frozenset({"vegan", "vegetarian", "pescatarian"}),
+    "vegetarian": frozenset({"vegetarian", "pescatarian"}),
+    "pescatarian": frozenset({"pescatarian"}),
+    "omnivore": frozenset(),
+}
+
+ALLERGENS = ("gluten", "dairy", "egg", "nuts", "soy", "fish", "shellfish", "sesame")
+
+
+@dataclass(frozen=True)
+class MealItem:
+    name: str
+    slot: str
+    calories: int
+    protein: int  # grams per serving
+    fat: int
+    carbs: int
+    diet: str
+    allergens: FrozenSet[str]
+
+    @property
+    def tags(self) -> FrozenSet[str]:
+        return DIET_TAGS[self.diet]
+
+
+def _items(slot: str, rows: Iterable[Tuple]) -> List[MealItem]:
+    return [
+        MealItem(name, slot, kcal, p, f, c, diet, frozenset(allergens))
+        for name, kcal, p, f, c, diet, allergens in rows
+    ]
+
+
+# name, kcal, protein, fat, carbs, diet, allergens
+CATALOG: List[MealItem] = (
+    _items("breakfast", [
+        ("Oatmeal with berries", 320, 10, 6, 56, "vegan", ["gluten"]),
+        ("Greek yogurt with honey", 250, 18, 5, 33, "vegetarian", ["dairy"]),
+        ("Avocado toast", 350, 9, 18, 38, "vegan", ["gluten"]),
+        ("Smoothie bowl", 300, 8, 6, 54, "vegan", []),
+        ("Tofu scramble with peppers", 280, 20, 16, 14, "vegan", ["soy"]),
+        ("Chia pudding with mango", 290, 8, 14, 34, "vegan", []),
+        ("Buckwheat pancakes with fruit", 380, 12, 10, 60, "vegetarian", ["egg", "dairy"]),
+        ("Egg omelette with spinach", 260, 19, 18, 6, "vegetarian", ["egg"]),
+        ("Turkey bacon and eggs", 340, 28, 22, 6, "omnivore", ["egg"]),
+        ("Greek yogurt with nuts", 320, 20, 18, 20, "vegetarian", ["dairy", "nuts"]),
+        ("Chicken sausage wrap", 420, 26, 16, 42, "omnivore", ["gluten"]),
+        ("Smoked salmon bagel", 450, 25, 14, 56, "pescatarian", ["gluten", "fish", "dairy"]),
+        ("Peanut butter banana toast", 380, 12, 16, 48, "vegan", ["gluten", "nuts"]),
+        ("Cottage cheese with pineapple", 220, 24, 4, 22, "vegetarian", ["dairy"]),
+    ])
+    + _items("lunch", [
+        ("Vegetable stir-fry with tofu", 450, 22, 18, 50, "vegan", ["soy"]),
+        ("Quinoa salad with chickpeas", 480, 18, 16, 66, "vegan", []),
+        ("Veggie wrap", 420, 14, 14, 60, "vegetarian", ["gluten", "dairy"]),
+        ("Lentil soup", 360, 20, 6, 56, "vegan", []),
+        ("Grilled chicken salad", 420, 38, 22, 16, "omnivore", []),
+        ("Tuna sandwich", 450, 30, 14, 50, "pescatarian", ["gluten", "fish", "egg"]),
+        ("Turkey and avocado wrap", 500, 32, 20, 46, "omnivore", ["gluten"]),
+        ("Chicken noodle soup", 380, 26, 8, 48, "omnivore", ["gluten"]),
+        ("Black bean burrito bowl", 560, 20, 14, 88, "vegan", []),
+        ("Caprese sandwich", 480, 20, 20, 54, "vegetarian", ["gluten", "dairy"]),
+        ("Salmon poke bowl", 550, 32, 16, 68, "pescatarian", ["fish", "soy"]),
+        ("Beef and quinoa bowl", 580, 38, 20, 60, "omnivore", []),
+        ("Falafel salad with hummus", 520, 18, 26, 54, "vegan", ["sesame"]),
+        ("Egg fried rice with vegetables", 480, 16, 14, 72, "vegetarian", ["egg", "soy"]),
+    ])
+    + _items("dinner", [
+        ("Grilled vegetable kebabs", 380, 10, 18, 44, "vegan", []),
+        ("Paneer tikka with salad", 480, 26, 30, 24, "vegetarian", ["dairy"]),
+        ("Vegetable curry with rice", 560, 14, 16, 88, "vegan", []),
+        ("Stuffed peppers", 420, 18, 14, 54, "vegetarian", ["dairy"]),
+        ("Baked salmon with veggies", 520, 38, 28, 28, "pescatarian", ["fish"]),
+        ("Beef stir-fry", 560, 38, 24, 46, "omnivore", ["soy"]),
+        ("Chicken curry with rice", 640, 40, 20, 72, "omnivore", ["dairy"]),
+        ("Shrimp pasta", 620, 34, 16, 84, "pescatarian", ["gluten", "shellfish"]),
+        ("Lentil shepherd's pie", 500, 22, 12, 74, "vegan", []),
+        ("Tofu and broccoli teriyaki", 460, 24, 16, 54, "vegan", ["soy", "gluten"]),
+        ("Roast chicken with sweet potato", 580, 44, 20, 54, "omnivore", []),
+        ("Cod with quinoa and greens", 480, 40, 12, 50, "pescatarian", ["fish"]),
+        ("Mushroom risotto", 540, 14, 18, 80, "vegetarian", ["dairy"]),
+        ("Turkey chili", 480, 38, 14, 48, "omnivore", []),
+    ])
+    + _items("snack", [
+        ("Apple slices with peanut butter", 200, 5, 12, 20, "vegan", ["nuts"]),
+        ("Hummus and carrot sticks", 160, 5, 8, 18, "vegan", ["sesame"]),
+        ("Mixed nuts", 180, 5, 16, 6, "vegan", ["nuts"]),
+        ("Fruit salad", 120, 2, 0, 30, "vegan", []),
+        ("Hard-boiled egg", 80, 6, 5, 1, "vegetarian", ["egg"]),
+        ("Turkey jerky", 120, 16, 2, 10, "omnivore", ["soy"]),
+        ("Tuna salad on crackers", 220, 16, 10, 16, "pescatarian", ["fish", "gluten", "egg"]),
+        ("Yogurt with granola", 230, 10, 6, 34, "vegetarian", ["dairy", "gluten"]),
+        ("Edamame", 150, 12, 6, 12, "vegan", ["soy"]),
+        ("Rice cakes with avocado", 160, 3, 9, 18, "vegan", []),
+        ("Cheese and grapes", 190, 8, 10, 18, "vegetarian", ["dairy"]),
+        ("Protein shake", 160, 25, 3, 8, "vegetarian", ["dairy"]),
+        ("Roasted chickpeas", 170, 8, 5, 24, "vegan", []),
+        ("Banana", 105, 1, 0, 27, "vegan", []),
+    ])
+)
+
+
+class FoodCatalog:
+    """
+    Meal catalog with precomputed inverted indexes. Each slot, diet tag and
+    allergen maps to a bitmask over item positions, so a dietary filter is a
+    couple of integer ANDs instead of a scan.
+    """
+
+    def __init__(self, items: List[MealItem]):
+        self.items = items
+        self.slot_mask: Dict[str, int] = {slot: 0 for slot in SLOTS}
+        self.tag_mask: Dict[str, int] = {}
+        self.allergen_mask: Dict[str, int] = {a: 0 for a in ALLERGENS}
+        self.all_mask = (1 << len(items)) - 1
+
+        for i, item in enumerate(items):
+            bit = 1 << i
+            self.slot_mask[item.slot] |= bit
+            for tag in item.tags:
+                self.tag_mask[tag] = self.tag_mask.get(tag, 0) | bit
+            for allergen in item.allergens:
+                self.allergen_mask[allergen] |= bit
+
+    def mask(
+        self, slot: str, required_tags: FrozenSet[str], excluded_allergens: FrozenSet[str]
+    ) -> int:
+        mask = self.slot_mask.get(slot, 0)
+        for tag in required_tags:
+            mask &= self.tag_mask.get(tag, 0)
+        for allergen in excluded_allergens:
+            mask &= ~self.allergen_mask.get(allergen, 0)
+        return mask & self.all_mask
+
+    def candidates(
+        self, slot: str, required_tags: FrozenSet[str], excluded_allergens: FrozenSet[str]
+    ) -> Tuple[MealItem, ...]:
+        return _cached_candidates(self, slot, required_tags, excluded_allergens)
+
+
+@lru_cache(maxsize=512)
+def _cached_candidates(
+    catalog: FoodCatalog,
+    slot: str,
+    required_tags: FrozenSet[str],
+    excluded_allergens: FrozenSet[str],
+) -> Tuple[MealItem, ...]:
+    mask = catalog.mask(slot, required_tags, excluded_allergens)
+    out = []
+    while mask:
+        low = mask & -mask
+        out.append(catalog.items[low.bit_length() - 1])
+        mask ^= low
+    return tuple(out)
+
+
+food_catalog = FoodCatalog(CATALOG)
@@ -1,76 +1,356 @@
-from typing import List, Dict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import List, Dict, Any, FrozenSet, Optional, Sequence, Tuple
 import random
 
-VEGETARIAN_BREAKFASTS = [
-    "Oatmeal with berries", "Greek yogurt with honey", "Avocado toast", "Smoothie bowl"
-]
-VEGETARIAN_LUNCHES = [
-    "Vegetable stir-fry with tofu", "Quinoa salad with chickpeas", "Veggie wrap", "Lentil soup"
-]
-VEGETARIAN_DINNERS = [
-    "Grilled vegetable kebabs", "Paneer tikka with salad", "Vegetable curry with rice", "Stuffed peppers"
-]
-VEGETARIAN_SNACKS = [
-    "Apple slices with peanut butter", "Hummus and carrot sticks", "Mixed nuts", "Fruit salad"
-]
-
-NON_VEGETARIAN_BREAKFASTS = [
-    "Egg omelette with spinach", "Turkey bacon and eggs", "Greek yogurt with nuts", "Chicken sausage wrap"
-]
-NON_VEGETARIAN_LUNCHES = [
-    "Grilled chicken salad", "Tuna sandwich", "Turkey and avocado wrap", "Chicken noodle soup"
-]
-NON_VEGETARIAN_DINNERS = [
-    "Baked salmon with veggies", "Beef stir-fry", "Chicken curry with rice", "Shrimp pasta"
-]
-NON_VEGETARIAN_SNACKS = [
-    "Hard-boiled egg", "Turkey jerky", "Tuna salad on crackers", "Yogurt with granola"
-]
+from .food_catalog import MealItem, food_catalog
+
+# Share of the daily calorie target given to each meal slot. The two snacks
+# split the "snack" share.
+SLOT_SHARES = {"breakfast": 0.25, "lunch": 0.32, "dinner": 0.33, "snack": 0.10}
+
+# Energy fractions from protein / fat / carbs.
+DEFAULT_MACRO_SPLIT = {"protein": 0.25, "fat": 0.30, "carbs": 0.45}
+LOW_CARB_MACRO_SPLIT = {"protein": 0.30, "fat": 0.45, "carbs": 0.25}
+HIGH_PROTEIN_MACRO_SPLIT = {"protein": 0.35, "fat": 0.25, "carbs": 0.40}
+
+SERVING_STEPS = tuple(0.25 * i for i in range(2, 13))  # 0.5 .. 3.0
+
+# Days whose protein/fat/carb energy shares each stay within this of the
+# split count as meeting it. Each day is drawn up to DAY_ATTEMPTS times and
+# the best draw is kept.
+MACRO_TOLERANCE = 0.08
+DAY_ATTEMPTS = 4
+
+# Penalty for serving the same dish again, per previous use.
+REPEAT_PENALTY = 0.35
+
+_DIET_KEYWORDS = {
+    "vegan": "vegan",
+    "vegetarian": "vegetarian",
+    "veggie": "vegetarian",
+    "pescatarian": "pescatarian",
+    "pescetarian": "pescatarian",
+}
+
+_ALLERGEN_KEYWORDS = {
+    "gluten": "gluten", "celiac": "gluten", "coeliac": "gluten", "wheat": "gluten",
+    "dairy": "dairy", "lactose": "dairy", "milk": "dairy",
+    "egg": "egg", "eggs": "egg",
+    "nut": "nuts", "nuts": "nuts", "peanut": "nuts", "peanuts": "nuts",
+    "soy": "soy", "soya": "soy",
+    "fish": "fish",
+    "shellfish": "shellfish", "shrimp": "shellfish",
+    "sesame": "sesame",
+}
+
+
+# Words that turn a mention of an allergen into an exclusion: "no eggs",
+# "avoid dairy", "allergic to nuts and shellfish" (before it, same clause)
+# or "gluten-free", "nut allergy", "lactose intolerant" (right after it).
+_EXCLUDE_BEFORE = {"no", "avoid", "avoiding", "without", "allergic", "intolerant", "exclude"}
+_EXCLUDE_AFTER = {"free", "allergy", "allergies", "intolerance", "intolerant", "sensitivity"}
+# Conditions that imply an exclusion by themselves.
+_CONDITION_ALLERGENS = {"celiac": "gluten", "coeliac": "gluten"}
+_CLAUSE_BREAKS = (",", ";", ".", " but ")
+
+
+def _excluded_allergens(text: str) -> set:
+    excluded = set()
+    for brk in _CLAUSE_BREAKS:
+        text = text.replace(brk, "|")
+    for clause in text.split("|"):
+        words = clause.split()
+        cue_seen = False
+        for i, word in enumerate(words):
+            if word in _CONDITION_ALLERGENS:
+                excluded.add(_CONDITION_ALLERGENS[word])
+            if word in _EXCLUDE_BEFORE:
+                cue_seen = True
+            if word in _ALLERGEN_KEYWORDS:
+                following = words[i + 1] if i + 1 < len(words) else ""
+                if cue_seen or following in _EXCLUDE_AFTER:
+                    excluded.add(_ALLERGEN_KEYWORDS[word])
+    return excluded
+
+
+def parse_dietary_preferences(
+    dietary_pref: List[str],
+) -> Tuple[FrozenSet[str], FrozenSet[str], Dict[str, float]]:
+    """
+    Turn free-text preferences ("vegetarian", "nut allergy", "gluten-free",
+    "low carb", ...) into required diet tags, excluded allergens and a macro
+    split. An allergen is only excluded when the text says so ("I eat eggs"
+    excludes nothing). Unrecognised preferences are ignored.
+    """
+    tags = set()
+    allergens = set()
+    split = DEFAULT_MACRO_SPLIT
+
+    for pref in dietary_pref or []:
+        text = pref.lower().replace("-", " ").replace("_", " ")
+        words = text.split()
+        for word in words:
+            if word in _DIET_KEYWORDS:
+                tags.add(_DIET_KEYWORDS[word])
+        allergens |= _excluded_allergens(text)
+        if "keto" in words or "low carb" in text:
+            split = LOW_CARB_MACRO_SPLIT
+        elif "high protein" in text:
+            split = HIGH_PROTEIN_MACRO_SPLIT
+
+    return frozenset(tags), frozenset(allergens), split
+
+
+def _macro_distance(item: MealItem, split: Dict[str, float]) -> float:
+    kcal = item.calories or 1
+    return (
+        abs(4 * item.protein / kcal - split["protein"])
+        + abs(9 * item.fat / kcal - split["fat"])
+        + abs(4 * item.carbs / kcal - split["carbs"])
+    )
+
+
+@dataclass(frozen=True)
+class _PlanContext:
+    """
+    Everything about a set of dietary preferences that does not depend on the
+    calorie target: the eligible dishes per slot and their macro distances.
+    Shared by every plan with the same preferences.
+    """
+    candidates: Dict[str, Tuple[MealItem, ...]]
+    macro_distance: Dict[str, float]
+    split: Dict[str, float]
+
+
+@lru_cache(maxsize=256)
+def _build_context(
+    tags: FrozenSet[str], allergens: FrozenSet[str], split_items: Tuple[Tuple[str, float], ...]
+) -> _PlanContext:
+    split = dict(split_items)
+    candidates = {}
+    distances = {}
+    for slot in SLOT_SHARES:
+        candidates[slot] = food_catalog.candidates(slot, tags, allergens)
+        if not candidates[slot]:
+            raise ValueError(f"No {slot} dishes match the dietary preferences")
+        for item in candidates[slot]:
+            distances[item.name] = _macro_distance(item, split)
+    return _PlanContext(candidates=candidates, macro_distance=distances, split=split)
+
+
+def _context_for(dietary_pref: List[str]) -> _PlanContext:
+    tags, allergens, split = parse_dietary_preferences(dietary_pref)
+    return _build_context(tags, allergens, tuple(sorted(split.items())))
+
+
+def _pick(
+    candidates: Tuple[MealItem, ...],
+    slot_kcal: float,
+    ctx: _PlanContext,
+    uses: Dict[str, int],
+    rng: random.Random,
+    exclude: Optional[MealItem] = None,
+) -> MealItem:
+    best, best_score = None, float("inf")
+    for item in candidates:
+        if item is exclude:
+            continue
+        ratio = slot_kcal / item.calories
+        # Dishes that cannot reach the slot budget within the serving range
+        # are still allowed, just strongly discouraged.
+        fit = 0.0 if SERVING_STEPS[0] <= ratio <= SERVING_STEPS[-1] else 1.0
+        score = (
+            ctx.macro_distance[item.name]
+            + fit
+            + REPEAT_PENALTY * uses.get(item.name, 0)
+            + rng.random() * 0.2
+        )
+        if score < best_score:
+            best, best_score = item, score
+    return best
+
+
+def _nearest_step(value: float) -> float:
+    return min(SERVING_STEPS, key=lambda s: abs(s - value))
+
+
+def _fit_servings(
+    items: List[MealItem], budgets: List[float], target: float, tolerance: float
+) -> List[float]:
+    """
+    Start each dish at the serving closest to its slot budget, then move one
+    dish one serving step at a time, taking the move that shrinks the gap to
+    the daily target most, until within tolerance or no move helps.
+    """
+    servings = [_nearest_step(b / it.calories) for it, b in zip(items, budgets)]
+    total = sum(s * it.calories for s, it in zip(servings, items))
+
+    for _ in range(len(items) * len(SERVING_STEPS)):
+        gap = target - total
+        if abs(gap) <= tolerance * target:
+            break
+        best_move, best_gap = None, abs(gap)
+        for i, item in enumerate(items):
+            idx = SERVING_STEPS.index(servings[i])
+            for step in (idx - 1, idx + 1):
+                if 0 <= step < len(SERVING_STEPS):
+                    delta = (SERVING_STEPS[step] - servings[i]) * item.calories
+                    if abs(gap - delta) < best_gap:
+                        best_move, best_gap = (i, SERVING_STEPS[step], delta), abs(gap - delta)
+        if best_move is None:
+            break
+        i, serving, delta = best_move
+        servings[i] = serving
+        total += delta
+
+    return servings
+
 
 def generate_meal_plan(
-    calorie_target: float, dietary_pref: List[str], days: int = 7
-) -> List[Dict]:
+    calorie_target: float,
+    dietary_pref: List[str],
+    days: int = 7,
+    tolerance: float = 0.05,
+    seed: Optional[int] = None,
+) -> List[Dict[str, Any]]:
     """
-    Generate a simple weekly meal plan.
+    Generate a meal plan that hits the daily calorie target.
+
+    Dishes come from the food catalog, filtered by the diet tags and allergens
+    in `dietary_pref`. Each slot picks the dish whose macros best match the
+    target split while avoiding repeats, then servings are adjusted so the day
+    lands within `tolerance` of `calorie_target`. Each day is drawn up to
+    DAY_ATTEMPTS times; the first draw within both the calorie tolerance and
+    MACRO_TOLERANCE is kept, otherwise the closest one. Some combinations
+    (e.g. low-carb vegan) cannot meet the split with this catalog, so the
+    macro split is a best effort, unlike the calorie target.
 
     Args:
-        calorie_target: daily calorie goal (e.g., 1800)
-        dietary_pref: list of dietary tags, e.g., ["vegetarian"]
+        calorie_target: daily calorie goal (e.g., 1800); must be positive
+        dietary_pref: list of dietary tags, e.g., ["vegetarian", "nut allergy"]
         days: number of days (default 7)
+        tolerance: allowed relative deviation from the calorie target
+        seed: optional seed for reproducible plans
 
     Returns:
         A list of dicts, each with keys:
           - "day": int (1..days)
           - "meals": dict with keys "breakfast", "lunch", "dinner", "snacks" (string)
+          - "servings": servings per dish, keyed by slot ("snack_1", "snack_2" for snacks)
+          - "totals": daily "calories", "protein", "fat", "carbs"
     """
+    rng = random.Random(seed)
+    return _plan_days(calorie_target, _context_for(dietary_pref), days, tolerance, rng)
+
+
+def generate_meal_plans(
+    calorie_targets: Sequence[float],
+    dietary_prefs: Sequence[List[str]],
+    days: int = 7,
+    tolerance: float = 0.05,
+    seed: Optional[int] = None,
+) -> List[List[Dict[str, Any]]]:
+    """
+    Generate plans for many profiles. Each plan is still built on its own;
+    what is shared is the per-preferences setup (catalog filtering and macro
+    scoring), done once for all profiles with the same dietary preferences.
+
+    Returns one plan per (calorie_target, dietary_pref) pair, in input order,
+    each shaped like the output of generate_meal_plan.
+    """
+    rng = random.Random(seed)
+    contexts: Dict[Tuple[str, ...], _PlanContext] = {}
+    plans = []
+    for calorie_target, dietary_pref in zip(calorie_targets, dietary_prefs):
+        key = tuple(dietary_pref or ())
+        ctx = contexts.get(key)
+        if ctx is None:
+            ctx = contexts[key] = _context_for(list(key))
+        plans.append(_plan_days(float(calorie_target), ctx, days, tolerance, rng))
+    return plans
+
+
+def _macro_deviation(totals: Dict[str, float], split: Dict[str, float]) -> float:
+    kcal = totals["calories"] or 1
+    return max(
+        abs(4 * totals["protein"] / kcal - split["protein"]),
+        abs(9 * totals["fat"] / kcal - split["fat"]),
+        abs(4 * totals["carbs"] / kcal - split["carbs"]),
+    )
+
+
+def _draw_day(
+    calorie_target: float,
+    ctx: _PlanContext,
+    tolerance: float,
+    uses: Dict[str, int],
+    rng: random.Random,
+) -> Tuple[List[MealItem], List[float], Dict[str, float]]:
+    candidates = ctx.candidates
+    budgets = [
+        calorie_target * SLOT_SHARES["breakfast"],
+        calorie_target * SLOT_SHARES["lunch"],
+        calorie_target * SLOT_SHARES["dinner"],
+        calorie_target * SLOT_SHARES["snack"] / 2,
+        calorie_target * SLOT_SHARES["snack"] / 2,
+    ]
+    breakfast = _pick(candidates["breakfast"], budgets[0], ctx, uses, rng)
+    lunch = _pick(candidates["lunch"], budgets[1], ctx, uses, rng)
+    dinner = _pick(candidates["dinner"], budgets[2], ctx, uses, rng)
+    snack_1 = _pick(candidates["snack"], budgets[3], ctx, uses, rng)
+    snack_2 = _pick(candidates["snack"], budgets[4], ctx, uses, rng, exclude=snack_1) or snack_1
+
+    items = [breakfast, lunch, dinner, snack_1, snack_2]
+    servings = _fit_servings(items, budgets, calorie_target, tolerance)
+    totals = {
+        key: sum(s * getattr(it, key) for s, it in zip(servings, items))
+        for key in ("calories", "protein", "fat", "carbs")
+    }
+    return items, servings, totals
+
+
+def _plan_days(
+    calorie_target: float,
+    ctx: _PlanContext,
+    days: int,
+    tolerance: float,
+    rng: random.Random,
+) -> List[Dict[str, Any]]:
+    if calorie_target <= 0:
+        raise ValueError(f"calorie_target must be positive, got {calorie_target}")
+    uses: Dict[str, int] = {}
     plan = []
-    vegetarian = "vegetarian" in [pref.lower() for pref in dietary_pref]
 
     for d in range(1, days + 1):
-        if vegetarian:
-            breakfast = random.choice(VEGETARIAN_BREAKFASTS)
-            lunch = random.choice(VEGETARIAN_LUNCHES)
-            dinner = random.choice(VEGETARIAN_DINNERS)
-            
-            snacks = random.sample(VEGETARIAN_SNACKS, k=2)
-        else:
-          
-            breakfast = random.choice(NON_VEGETARIAN_BREAKFASTS)
-            lunch = random.choice(NON_VEGETARIAN_LUNCHES)
-            dinner = random.choice(NON_VEGETARIAN_DINNERS)
-            snacks = random.sample(NON_VEGETARIAN_SNACKS, k=2)
-
-        
-        snacks_str = ", ".join(snacks)
+        best, best_score = None, None
+        for _ in range(DAY_ATTEMPTS):
+            items, servings, totals = _draw_day(calorie_target, ctx, tolerance, uses, rng)
+            calorie_miss = max(0.0, abs(totals["calories"] - calorie_target) / calorie_target - tolerance)
+            macro_miss = max(0.0, _macro_deviation(totals, ctx.split) - MACRO_TOLERANCE)
+            score = (calorie_miss, macro_miss)
+            if best_score is None or score < best_score:
+                best, best_score = (items, servings, totals), score
+            if score == (0.0, 0.0):
+                break
+        items, servings, totals = best
 
+        for item in items:
+            uses[item.name] = uses.get(item.name, 0) + 1
+        breakfast, lunch, dinner, snack_1, snack_2 = items
+        snacks = [snack_1.name] if snack_2 is snack_1 else [snack_1.name, snack_2.name]
         plan.append({
             "day": d,
             "meals": {
-                "breakfast": breakfast,
-                "lunch": lunch,
-                "dinner": dinner,
-                "snacks": snacks_str
-            }
+                "breakfast": breakfast.name,
+                "lunch": lunch.name,
+                "dinner": dinner.name,
+                "snacks": ", ".join(snacks)
+            },
+            "servings": dict(zip(
+                ("breakfast", "lunch", "dinner", "snack_1", "snack_2"), servings
+            )),
+            "totals": {key: round(value) for key, value in totals.items()},
         })
 
     return plan
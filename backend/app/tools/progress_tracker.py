@@ -0,0 +1,120 @@
+import calendar
+from datetime import date, timedelta
+from typing import Any, Dict, Iterable, List, Set, Tuple
+
+# Rollup documents kept per user. "all" is the whole history and backs the
+# progress summary.
+ROLLUP_PERIODS = ("week", "month", "all")
+
+
+def period_keys(day: date) -> Dict[str, str]:
+    """ISO week, calendar month and the all-time key for a log date."""
+    year, week, _ = day.isocalendar()
+    return {"week": f"{year}-W{week:02d}", "month": f"{day.year}-{day.month:02d}", "all": "all"}
+
+
+def period_span(day: date) -> Tuple[str, str]:
+    """First and last ISO date of the week and month containing `day`."""
+    week_start = day - timedelta(days=day.weekday())
+    month_end = day.replace(day=calendar.monthrange(day.year, day.month)[1])
+    start = min(week_start, day.replace(day=1))
+    end = max(week_start + timedelta(days=6), month_end)
+    return start.isoformat(), end.isoformat()
+
+
+def rollup_id(user_id: str, period: str, key: str) -> str:
+    return f"{user_id}:{period}:{key}"
+
+
+def effective_logs(rows: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    The newest submission per date from rows sorted by (date, created_at),
+    each with `submissions`, the number of logs stored for that date.
+    """
+    latest: Dict[str, Dict[str, Any]] = {}
+    for row in rows:
+        submissions = latest[row["date"]]["submissions"] + 1 if row["date"] in latest else 1
+        latest[row["date"]] = {**row, "submissions": submissions}
+    return list(latest.values())
+
+
+def build_rollups(
+    user_id: str, logs: List[Dict[str, Any]], keys: Set[Tuple[str, str]]
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Week/month rollups for the (period, key) pairs in `keys`, computed from
+    every effective log of those periods and keyed by rollup _id.
+
+    `log_count` is the number of stored submissions behind a rollup. Logs are
+    only ever inserted, so it grows with every write and orders competing
+    recomputations (see app.repositories.progress.record_logs).
+    """
+    grouped: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+    for log in logs:
+        for period, key in period_keys(date.fromisoformat(log["date"])).items():
+            if (period, key) in keys:
+                grouped.setdefault((period, key), []).append(log)
+
+    out = {}
+    for (period, key), group in grouped.items():
+        group.sort(key=lambda log: log["date"])
+        first, last = group[0], group[-1]
+        out[rollup_id(user_id, period, key)] = {
+            "user_id": user_id,
+            "period": period,
+            "key": key,
+            "days_logged": len(group),
+            "weight_sum": sum(log["weight"] for log in group),
+            "calories_in": sum(log["calories_in"] for log in group),
+            "calories_out": sum(log["calories_out"] for log in group),
+            "first": {"date": first["date"], "weight": first["weight"]},
+            "last": {"date": last["date"], "weight": last["weight"]},
+            "log_count": sum(log["submissions"] for log in group),
+        }
+    return out
+
+
+def merge_rollups(user_id: str, rollups: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """The all-time rollup from the user's month rollups, which partition it."""
+    return {
+        "user_id": user_id,
+        "period": "all",
+        "key": "all",
+        "days_logged": sum(r["days_logged"] for r in rollups),
+        "weight_sum": sum(r["weight_sum"] for r in rollups),
+        "calories_in": sum(r["calories_in"] for r in rollups),
+        "calories_out": sum(r["calories_out"] for r in rollups),
+        "first": min((r["first"] for r in rollups), key=lambda point: point["date"]),
+        "last": max((r["last"] for r in rollups), key=lambda point: point["date"]),
+        "log_count": sum(r.get("log_count", 0) for r in rollups),
+    }
+
+
+def summary_from_rollup(rollup: Dict[str, Any]) -> Dict[str, Any]:
+    """ProgressSummary fields from the user's "all" rollup."""
+    first, last = rollup["first"], rollup["last"]
+    return {
+        "first_log_date": first["date"],
+        "first_weight": first["weight"],
+        "last_log_date": last["date"],
+        "last_weight": last["weight"],
+        "weight_change": round(last["weight"] - first["weight"], 2),
+    }
+
+
+def rollup_view(rollup: Dict[str, Any]) -> Dict[str, Any]:
+    """ProgressRollup fields from a stored week/month rollup."""
+    days = rollup["days_logged"] or 1
+    first, last = rollup["first"], rollup["last"]
+    return {
+        "period": rollup["period"],
+        "key": rollup["key"],
+        "days_logged": rollup["days_logged"],
+        "start_weight": first["weight"],
+        "end_weight": last["weight"],
+        "weight_change": round(last["weight"] - first["weight"], 2),
+        "avg_weight": round(rollup["weight_sum"] / days, 2),
+        "calories_in": rollup["calories_in"],
+        "calories_out": rollup["calories_out"],
+        "calorie_balance": rollup["calories_in"] - rollup["calories_out"],
+    }
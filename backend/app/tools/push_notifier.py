@@ -1,4 +1,4 @@
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 
 def send_push_notification(user_id: str, message: str) -> Dict[str, Any]:
 
@@ -6,4 +6,73 @@ def send_push_notification(user_id: str, message: str) -> Dict[str, Any]:
         "user_id": user_id,
         "message": message,
         "status": "sent (stub)"
-    }
\ No newline at end of file
+    }
+
+
+class PushTransport:
+    """
+    Delivers notifications for the dispatcher (app.notifications).
+
+    send_batch gets outbox documents (with "user_id" and "message") and
+    returns one entry per document, in order: None when delivered, or an
+    error string to schedule a retry.
+    """
+
+    name = "base"
+
+    async def send_batch(self, notifications: List[Dict[str, Any]]) -> List[Optional[str]]:
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        pass
+
+
+class StubPushTransport(PushTransport):
+    """Calls the send_push_notification stub; always succeeds."""
+
+    name = "stub"
+
+    async def send_batch(self, notifications: List[Dict[str, Any]]) -> List[Optional[str]]:
+        for n in notifications:
+            send_push_notification(n["user_id"], n["message"])
+        return [None] * len(notifications)
+
+
+class FakePushTransport(PushTransport):
+    """
+    In-memory transport for tests and local runs. Records every delivered
+    notification in `sent`; `fail_times` makes the first N attempts for each
+    message fail so retry behaviour can be exercised.
+    """
+
+    name = "fake"
+
+    def __init__(self, fail_times: int = 0):
+        self.fail_times = fail_times
+        self.sent: List[Dict[str, Any]] = []
+        self.attempts: Dict[Any, int] = {}
+
+    async def send_batch(self, notifications: List[Dict[str, Any]]) -> List[Optional[str]]:
+        results: List[Optional[str]] = []
+        for n in notifications:
+            key = n.get("_id")
+            self.attempts[key] = self.attempts.get(key, 0) + 1
+            if self.attempts[key] <= self.fail_times:
+                results.append("fake transport failure")
+                continue
+            self.sent.append({"user_id": n["user_id"], "message": n["message"]})
+            results.append(None)
+        return results
+
+
+TRANSPORTS = {
+    StubPushTransport.name: StubPushTransport,
+    FakePushTransport.name: FakePushTransport,
+}
+
+
+def get_transport(name: str) -> PushTransport:
+    try:
+        return TRANSPORTS[name]()
+    except KeyError:
+        raise ValueError(f"Unknown push transport '{name}', expected one of {sorted(TRANSPORTS)}")
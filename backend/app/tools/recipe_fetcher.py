@@ -1,24 +1,47 @@
-from typing import Dict, List, Any
-
-def fetch_recipe(meal_name: str) -> Dict[str, Any]:
-    """
-    Stub for recipe lookup. In a real app, replace with e.g. Spoonacular API call.
-    Returns a shape matching RecipeResponse:
-      {
-        "meal_name": str,
-        "ingredients": [str, …],
-        "instructions": str,
-        "nutrition": { "calories": int, "protein": int, "fat": int, "carbs": int }
-      }
-    """
-    return {
-        "meal_name": meal_name,
-        "ingredients": ["Ingredient A", "Ingredient B"],
-        "instructions": f"Step 1: Do something with {meal_name}.",
-        "nutrition": {
-            "calories": 400,
-            "protein": 15,
-            "fat": 10,
-            "carbs": 55
-        }
-    }
+from typing import Dict, List, Any, Iterable, Optional
+
+from ..recipe_provider import recipe_provider
+from .recipe_store import recipe_store
+
+
+def meal_plan_dish_names(days: List[Dict[str, Any]]) -> List[str]:
+    """
+    Distinct dish names in a meal plan, in order of first appearance. The
+    "snacks" slot holds a comma-separated list.
+    """
+    names: Dict[str, None] = {}
+    for day in days:
+        meals = day.get("meals") or {}
+        for slot in ("breakfast", "lunch", "dinner"):
+            if meals.get(slot):
+                names[meals[slot]] = None
+        for snack in (meals.get("snacks") or "").split(","):
+            if snack.strip():
+                names[snack.strip()] = None
+    return list(names)
+
+
+async def fetch_meal_plan_recipes(days: List[Dict[str, Any]]) -> Dict[str, Optional[Dict[str, Any]]]:
+    """
+    Recipes for every dish in a meal plan, in one batch.
+    """
+    return await find_recipes(meal_plan_dish_names(days))
+
+
+async def find_recipe(meal_name: str) -> Optional[Dict[str, Any]]:
+    """
+    Local store first, then the external recipe provider if configured.
+    """
+    return (await find_recipes([meal_name]))[meal_name]
+
+
+async def find_recipes(meal_names: Iterable[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+    """
+    Batch version of find_recipe. Dishes the local store misses go to the
+    provider together, so a whole plan costs at most a few upstream requests.
+    """
+    found = await recipe_store.lookup_many(meal_names)
+    missing = [name for name, recipe in found.items() if recipe is None]
+    if missing and recipe_provider.enabled:
+        found.update(await recipe_provider.get_many(missing))
+    return found
@@ -0,0 +1,242 @@
+import asyncio
+import difflib
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from ..dependencies import settings
+from ..ttl_cache import TTLCache
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+DATASET_PATH = DATA_DIR / "recipes.json"
+DEFAULT_DB_PATH = DATA_DIR / "recipes.sqlite3"
+
+# Minimum difflib similarity for a fuzzy name match.
+FUZZY_CUTOFF = 0.6
+
+# LRU marker for names with no match; TTLCache treats None as a miss.
+_NOT_FOUND: Dict[str, Any] = {}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS recipes (
+    id INTEGER PRIMARY KEY,
+    name_norm TEXT NOT NULL UNIQUE,
+    data TEXT NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS recipes_fts USING fts5(
+    name, ingredients, tokenize = 'unicode61', prefix = '2 3'
+);
+"""
+
+
+def normalize_name(name: str) -> str:
+    """Lowercase, drop punctuation and collapse whitespace."""
+    return " ".join(re.sub(r"[^a-z0-9]+", " ", name.lower()).split())
+
+
+def _fts_query(norm: str, any_token: bool = False) -> Optional[str]:
+    tokens = norm.split()
+    if not tokens:
+        return None
+    joiner = " OR " if any_token else " "
+    return joiner.join(f'"{t}"*' for t in tokens)
+
+
+class RecipeStore:
+    """
+    Recipes from the bundled dataset, kept in an on-disk SQLite database with
+    an FTS5 index over names and ingredients. The database is rebuilt whenever
+    the dataset file changes.
+
+    Lookups try, in order: the in-memory LRU, an exact normalized-name match,
+    an FTS prefix match on every word, then a fuzzy match against names that
+    share at least one word prefix (or all names if none do). Names with no
+    match are cached too.
+
+    The LRU lives on the event loop; SQLite and difflib work runs on a
+    single dedicated thread, so it never blocks the loop.
+    """
+
+    def __init__(
+        self,
+        dataset_path: Path = DATASET_PATH,
+        db_path: Optional[Path] = None,
+        cache_max_entries: int = 512,
+        cache_ttl_seconds: float = 3600.0,
+    ):
+        self.dataset_path = Path(dataset_path)
+        self.db_path = Path(db_path) if db_path else DEFAULT_DB_PATH
+        self._cache: TTLCache[Dict[str, Any]] = TTLCache(cache_max_entries, cache_ttl_seconds)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._names: Dict[str, int] = {}
+        self._norm_by_id: Dict[int, str] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def _run(self, fn, *args):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="recipe-store")
+        return asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    def load(self) -> None:
+        """Open the database, (re)building it from the dataset if stale."""
+        with self._lock:
+            self._ensure_loaded()
+
+    def _ensure_loaded(self) -> sqlite3.Connection:
+        if self._conn is not None:
+            return self._conn
+
+        raw = self.dataset_path.read_bytes()
+        digest = hashlib.sha256(raw).hexdigest()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        conn.executescript(_SCHEMA)
+        row = conn.execute("SELECT value FROM meta WHERE key = 'dataset_sha256'").fetchone()
+        if row is None or row[0] != digest:
+            self._rebuild(conn, json.loads(raw), digest)
+
+        self._norm_by_id = dict(conn.execute("SELECT id, name_norm FROM recipes"))
+        self._names = {norm: rowid for rowid, norm in self._norm_by_id.items()}
+        self._conn = conn
+        return conn
+
+    @staticmethod
+    def _rebuild(conn: sqlite3.Connection, recipes: List[Dict[str, Any]], digest: str) -> None:
+        with conn:
+            conn.execute("DELETE FROM recipes")
+            conn.execute("DELETE FROM recipes_fts")
+            for rowid, recipe in enumerate(recipes, start=1):
+                conn.execute(
+                    "INSERT INTO recipes (id, name_norm, data) VALUES (?, ?, ?)",
+                    (rowid, normalize_name(recipe["meal_name"]), json.dumps(recipe)),
+                )
+                conn.execute(
+                    "INSERT INTO recipes_fts (rowid, name, ingredients) VALUES (?, ?, ?)",
+                    (rowid, recipe["meal_name"], " ".join(recipe["ingredients"])),
+                )
+            conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('dataset_sha256', ?)",
+                (digest,),
+            )
+
+    def _fetch_rows(self, conn: sqlite3.Connection, rowids: List[int]) -> Dict[int, Dict[str, Any]]:
+        if not rowids:
+            return {}
+        placeholders = ",".join("?" * len(rowids))
+        return {
+            rowid: json.loads(data)
+            for rowid, data in conn.execute(
+                f"SELECT id, data FROM recipes WHERE id IN ({placeholders})", rowids
+            )
+        }
+
+    def _match(self, conn: sqlite3.Connection, norm: str) -> Optional[int]:
+        rowid = self._names.get(norm)
+        if rowid is not None:
+            return rowid
+
+        query = _fts_query(norm)
+        if query is None:
+            return None
+        row = conn.execute(
+            "SELECT rowid FROM recipes_fts WHERE recipes_fts MATCH ? ORDER BY bm25(recipes_fts, 10.0, 1.0) LIMIT 1",
+            (f"name : ({query})",),
+        ).fetchone()
+        if row is not None:
+            return row[0]
+
+        shortlist = [
+            self._norm_by_id[r]
+            for (r,) in conn.execute(
+                "SELECT rowid FROM recipes_fts WHERE recipes_fts MATCH ? LIMIT 50",
+                (f"name : ({_fts_query(norm, any_token=True)})",),
+            )
+        ] or list(self._names)
+        close = difflib.get_close_matches(norm, shortlist, n=1, cutoff=FUZZY_CUTOFF)
+        return self._names[close[0]] if close else None
+
+    async def lookup(self, meal_name: str) -> Optional[Dict[str, Any]]:
+        """Best matching recipe for `meal_name`, or None."""
+        return (await self.lookup_many([meal_name]))[meal_name]
+
+    async def lookup_many(self, meal_names: Iterable[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Resolve many names at once. Names not in the LRU are matched on the
+        store thread against the in-memory name index (and FTS when needed),
+        and their recipes read in a single query. Returns
+        {requested name: recipe or None}.
+        """
+        results: Dict[str, Optional[Dict[str, Any]]] = {}
+        misses: Dict[str, List[str]] = {}
+        for name in meal_names:
+            if name in results:
+                continue
+            norm = normalize_name(name)
+            cached = self._cache.get(norm)
+            results[name] = cached or None
+            if cached is None:
+                misses.setdefault(norm, []).append(name)
+
+        if misses:
+            found = await self._run(self._match_many, list(misses))
+            for norm, names in misses.items():
+                recipe = found.get(norm)
+                self._cache.set(norm, recipe or _NOT_FOUND)
+                for name in names:
+                    results[name] = recipe
+        return results
+
+    def _match_many(self, norms: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        with self._lock:
+            conn = self._ensure_loaded()
+            matched = {norm: self._match(conn, norm) for norm in norms}
+            rows = self._fetch_rows(conn, [r for r in set(matched.values()) if r is not None])
+        return {norm: rows.get(rowid) for norm, rowid in matched.items()}
+
+    async def search(self, text: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Prefix search over recipe names and ingredients, best first."""
+        query = _fts_query(normalize_name(text))
+        if query is None:
+            return []
+        return await self._run(self._search, query, limit)
+
+    def _search(self, query: str, limit: int) -> List[Dict[str, Any]]:
+        with self._lock:
+            conn = self._ensure_loaded()
+            rowids = [
+                rowid for (rowid,) in conn.execute(
+                    "SELECT rowid FROM recipes_fts WHERE recipes_fts MATCH ? ORDER BY bm25(recipes_fts, 10.0, 1.0) LIMIT ?",
+                    (query, limit),
+                )
+            ]
+            rows = self._fetch_rows(conn, rowids)
+        return [rows[r] for r in rowids if r in rows]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "recipes": len(self._names),
+            "db_path": str(self.db_path),
+            "cache": self._cache.stats(),
+        }
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+recipe_store = RecipeStore(
+    db_path=Path(settings.recipe_db_path) if settings.recipe_db_path else None,
+    cache_max_entries=settings.recipe_cache_max_entries,
+)
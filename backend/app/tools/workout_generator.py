@@ -1,34 +1,253 @@
-from typing import List, Dict, Any
+from functools import lru_cache
+from typing import List, Dict, Any, FrozenSet, Iterable, Optional, Tuple
+
+from .exercise_catalog import (
+    CONDITIONS,
+    HOME_EQUIPMENT,
+    Exercise,
+    exercise_catalog,
+)
+
+GOALS = ("lose_weight", "build_muscle", "endurance", "general")
+INTENSITIES = ("low", "standard", "high")
+
+# Slots per day type: (category, muscle group or None for any).
+DAY_TYPES: Dict[str, Tuple[str, Tuple[Tuple[str, Optional[str]], ...]]] = {
+    "full_body": ("Full body", (
+        ("strength", "legs"), ("strength", "chest"), ("strength", "back"),
+        ("strength", "glutes"), ("strength", "core"),
+    )),
+    "upper": ("Upper body", (
+        ("strength", "chest"), ("strength", "back"), ("strength", "shoulders"),
+        ("strength", "arms"), ("strength", "core"),
+    )),
+    "lower": ("Lower body", (
+        ("strength", "legs"), ("strength", "glutes"), ("strength", "legs"), ("strength", "core"),
+    )),
+    "push": ("Push", (
+        ("strength", "chest"), ("strength", "chest"), ("strength", "shoulders"), ("strength", "arms"),
+    )),
+    "pull": ("Pull", (
+        ("strength", "back"), ("strength", "back"), ("strength", "arms"), ("strength", "core"),
+    )),
+    "legs": ("Legs", (
+        ("strength", "legs"), ("strength", "glutes"), ("strength", "legs"), ("strength", "core"),
+    )),
+    "circuit": ("Fat-burning circuit", (
+        ("strength", "legs"), ("cardio", None), ("strength", "chest"),
+        ("strength", "back"), ("cardio", None), ("strength", "core"),
+    )),
+    "cardio": ("Cardio", (("cardio", None), ("cardio", None), ("strength", "core"))),
+    "recovery": ("Active recovery", (("mobility", None), ("mobility", None), ("mobility", None))),
+}
+
+# Weekly split per goal, indexed by days_per_week - 1.
+SPLITS: Dict[str, Tuple[Tuple[str, ...], ...]] = {
+    "build_muscle": (
+        ("full_body",),
+        ("upper", "lower"),
+        ("push", "pull", "legs"),
+        ("upper", "lower", "upper", "lower"),
+        ("push", "pull", "legs", "upper", "lower"),
+        ("push", "pull", "legs", "push", "pull", "legs"),
+        ("push", "pull", "legs", "recovery", "upper", "lower", "recovery"),
+    ),
+    "lose_weight": (
+        ("circuit",),
+        ("circuit", "cardio"),
+        ("circuit", "cardio", "circuit"),
+        ("circuit", "cardio", "circuit", "cardio"),
+        ("circuit", "cardio", "circuit", "cardio", "circuit"),
+        ("circuit", "cardio", "circuit", "cardio", "circuit", "cardio"),
+        ("circuit", "cardio", "circuit", "cardio", "circuit", "cardio", "recovery"),
+    ),
+    "endurance": (
+        ("cardio",),
+        ("cardio", "full_body"),
+        ("cardio", "full_body", "cardio"),
+        ("cardio", "full_body", "cardio", "recovery"),
+        ("cardio", "full_body", "cardio", "full_body", "cardio"),
+        ("cardio", "full_body", "cardio", "full_body", "cardio", "recovery"),
+        ("cardio", "full_body", "cardio", "recovery", "cardio", "full_body", "recovery"),
+    ),
+    "general": (
+        ("full_body",),
+        ("full_body", "cardio"),
+        ("full_body", "cardio", "full_body"),
+        ("full_body", "cardio", "full_body", "recovery"),
+        ("full_body", "cardio", "full_body", "cardio", "recovery"),
+        ("full_body", "cardio", "full_body", "cardio", "full_body", "recovery"),
+        ("full_body", "cardio", "full_body", "recovery", "full_body", "cardio", "recovery"),
+    ),
+}
+
+# Rest between sets, by goal and category.
+_REST = {
+    "build_muscle": {"strength": "90s", "cardio": "60s"},
+    "lose_weight": {"strength": "30s", "cardio": "30s"},
+    "endurance": {"strength": "45s", "cardio": "60s"},
+    "general": {"strength": "60s", "cardio": "60s"},
+}
+
+_GOAL_KEYWORDS = (
+    ("build_muscle", ("muscle", "strength", "bulk", "gain", "tone")),
+    ("lose_weight", ("lose", "loss", "fat", "cut", "slim", "lean")),
+    ("endurance", ("endurance", "cardio", "stamina", "run", "marathon")),
+)
+
+_CONDITION_KEYWORDS = {
+    "knee": "knee", "acl": "knee", "menisc": "knee",
+    "back": "back", "spine": "back", "disc": "back", "sciatica": "back",
+    "shoulder": "shoulder", "rotator": "shoulder",
+    "wrist": "wrist", "carpal": "wrist",
+    "ankle": "ankle",
+    "hypertension": "hypertension", "blood pressure": "hypertension",
+    "heart": "cardiac", "cardiac": "cardiac", "arrhythmia": "cardiac",
+    "asthma": "asthma", "copd": "asthma",
+    "pregnan": "pregnancy",
+}
+
+
+def parse_goal(goal: str) -> str:
+    """Map free-text goals ("lose weight", "build muscle", ...) onto GOALS."""
+    text = (goal or "").lower()
+    for key, words in _GOAL_KEYWORDS:
+        if any(word in text for word in words):
+            return key
+    return "general"
+
+
+def parse_conditions(conditions: Iterable[str]) -> FrozenSet[str]:
+    """
+    Map free-text conditions ("knee pain", "high blood pressure", ...) onto
+    CONDITIONS. Unrecognised conditions are ignored.
+    """
+    found = set()
+    for condition in conditions or []:
+        text = condition.lower()
+        for keyword, key in _CONDITION_KEYWORDS.items():
+            if keyword in text:
+                found.add(key)
+    return frozenset(found)
+
+
+@lru_cache(maxsize=2048)
+def weekly_split(
+    goal: str, days_per_week: int, conditions: FrozenSet[str], equipment: FrozenSet[str]
+) -> Tuple[Tuple[str, Tuple[Exercise, ...]], ...]:
+    """
+    The exercises for each training day, as (focus, exercises) pairs. Pure in
+    its (hashable) arguments, so every combination is built once and then
+    served from the cache.
+
+    Each slot takes the eligible exercise used least so far this week,
+    preferring ones that mainly train the slot's muscle group, in catalog
+    order. A slot with no safe exercise falls back to any safe exercise of
+    the category, then to mobility work; duplicates within a day are skipped.
+    """
+    allowed = exercise_catalog.safe_mask(conditions) & exercise_catalog.available_mask(equipment)
+    uses: Dict[str, int] = {}
+    days = []
+    for day_type in SPLITS[goal][days_per_week - 1]:
+        focus, slots = DAY_TYPES[day_type]
+        chosen: List[Exercise] = []
+        for category, muscle in slots:
+            for mask in (
+                exercise_catalog.mask(category, muscle),
+                exercise_catalog.mask(category, None),
+                exercise_catalog.mask("mobility", None),
+            ):
+                candidates = [
+                    ex for ex in exercise_catalog.select(mask & allowed) if ex not in chosen
+                ]
+                if candidates:
+                    pick = min(
+                        candidates,
+                        key=lambda ex: (uses.get(ex.name, 0), ex.primary != muscle),
+                    )
+                    uses[pick.name] = uses.get(pick.name, 0) + 1
+                    chosen.append(pick)
+                    break
+        days.append((focus, tuple(chosen)))
+    return tuple(days)
+
+
+def warm_cache() -> int:
+    """
+    Precompute the splits for every goal and week length, with no condition
+    and with each single condition, on the default equipment. Returns the
+    number of combinations built.
+    """
+    combos = 0
+    for goal in GOALS:
+        for days in range(1, 8):
+            for conditions in [frozenset()] + [frozenset({c}) for c in CONDITIONS]:
+                weekly_split(goal, days, conditions, HOME_EQUIPMENT)
+                combos += 1
+    return combos
+
+
+def _prescribe(ex: Exercise, goal: str, intensity: str) -> Dict[str, Any]:
+    sets = ex.sets
+    if ex.category == "strength":
+        if intensity == "low":
+            sets = max(2, sets - 1)
+        elif intensity == "high":
+            sets += 1
+    if ex.category == "cardio" and intensity == "low" and sets > 1:
+        sets = max(2, sets - sets // 3)
+
+    if ex.reps is not None:
+        reps, duration = f"{sets}x{ex.reps}", None
+    elif sets > 1:
+        reps, duration = None, f"{sets}x{ex.duration}"
+    else:
+        reps, duration = None, ex.duration
+
+    rest = _REST[goal].get(ex.category)
+    if rest and intensity == "low":
+        rest = f"{int(rest[:-1]) + 30}s"
+    return {"name": ex.name, "reps": reps, "duration": duration, "rest": rest}
+
 
 def generate_workout_plan(
     goal: str,
     days_per_week: int,
     conditions: List[str],
+    intensity: str = "standard",
+    equipment: Optional[List[str]] = None,
 ) -> List[Dict[str, Any]]:
+    """
+    Weekly workout plan from the exercise catalog.
 
-    base_exercises = []
-    if "knee pain" in conditions:
-        base_exercises = [
-            {"name": "Push-Ups", "reps": "3x12", "rest": "60s"},
-            {"name": "Seated Leg Extensions", "reps": "3x15", "rest": "45s"},
-        ]
-    else:
-        base_exercises = [
-            {"name": "Push-Ups", "reps": "3x12", "rest": "60s"},
-            {"name": "Bodyweight Squats", "reps": "3x15", "rest": "60s"},
-        ]
-
-  
-    if "lose weight" in goal.lower():
-        base_exercises.append({"name": "Jumping Jacks", "duration": "60s", "rest": "30s"})
-
-    plan = []
-    for day in range(1, days_per_week + 1):
-        plan.append(
-            {
-                "day": day,
-                "exercises": base_exercises
-            }
-        )
-
-    return plan
+    The split (which exercises on which day) comes from the cached
+    weekly_split for the goal, week length, conditions and equipment; sets
+    and rest are then adjusted for the goal and intensity.
+
+    Args:
+        goal: free text, e.g. "lose weight", "build muscle"
+        days_per_week: training days, 1..7
+        conditions: free-text health conditions, e.g. ["knee pain"]
+        intensity: "low", "standard" or "high"
+        equipment: available equipment (see exercise_catalog.EQUIPMENT);
+            defaults to bodyweight, dumbbells and bands
+
+    Returns:
+        A list of dicts, each with keys "day", "focus" and "exercises"
+        (each exercise has "name", "reps", "duration", "rest").
+    """
+    days_per_week = min(max(int(days_per_week), 1), 7)
+    goal_key = parse_goal(goal)
+    if intensity not in INTENSITIES:
+        intensity = "standard"
+    kit = frozenset(equipment) | {"none"} if equipment else HOME_EQUIPMENT
+
+    split = weekly_split(goal_key, days_per_week, parse_conditions(conditions), kit)
+    return [
+        {
+            "day": day,
+            "focus": focus,
+            "exercises": [_prescribe(ex, goal_key, intensity) for ex in exercises],
+        }
+        for day, (focus, exercises) in enumerate(split, start=1)
+    ]
@@ -0,0 +1,60 @@
+import asyncio
+import json
+import random
+from types import SimpleNamespace
+from typing import Any, AsyncIterator, Dict, List
+
+# What the fake model "plans": every tool once, plus two recipe lookups, so a
+# /plan request exercises the whole executor.
+FAKE_STEPS: Dict[str, List[Dict[str, Any]]] = {"steps": [
+    {"tool": "calculate_bmr", "args": {"age": 34, "weight": 72.0, "height": 176.0, "gender": "female"}},
+    {"tool": "generate_meal_plan", "args": {"calorie_target": 2100, "dietary_pref": ["vegetarian"], "days": 7}},
+    {"tool": "generate_workout_plan", "args": {"goal": "lose weight", "days_per_week": 4, "conditions": []}},
+    {"tool": "fetch_recipe", "args": {"meal_name": "Lentil soup"}},
+    {"tool": "fetch_recipe", "args": {"meal_name": "Greek yogurt with honey"}},
+]}
+
+
+class _FakeCompletions:
+    def __init__(self, owner: "FakeInferenceClient"):
+        self.owner = owner
+
+    async def create(self, model: str, messages: List[Dict[str, str]], stream: bool = False, **kwargs):
+        self.owner.calls += 1
+        if stream:
+            return self.owner._stream()
+        await asyncio.sleep(self.owner._latency())
+        message = SimpleNamespace(content=self.owner.content)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+class FakeInferenceClient:
+    """
+    Stand-in for huggingface_hub.AsyncInferenceClient: the same
+    chat.completions.create() surface, answering every prompt with
+    FAKE_STEPS after `latency_ms` (+/- `jitter_ms`). Streamed answers are
+    split into `stream_chunks` deltas spread over the same latency.
+    """
+
+    def __init__(self, latency_ms: float = 500.0, jitter_ms: float = 0.0, stream_chunks: int = 20):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.stream_chunks = stream_chunks
+        self.content = json.dumps(FAKE_STEPS)
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=_FakeCompletions(self))
+
+    def _latency(self) -> float:
+        jitter = random.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0.0
+        return max(0.0, self.latency_ms + jitter) / 1000
+
+    async def _stream(self) -> AsyncIterator[Any]:
+        size = max(1, -(-len(self.content) // self.stream_chunks))
+        pause = self._latency() / self.stream_chunks
+        for i in range(0, len(self.content), size):
+            await asyncio.sleep(pause)
+            delta = SimpleNamespace(content=self.content[i:i + size])
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+
+    async def close(self) -> None:
+        pass
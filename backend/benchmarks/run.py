@@ -0,0 +1,317 @@
+"""
+Load and latency benchmark for the auth, profile, meal plan and /plan endpoints.
+
+Boots the FastAPI app in-process (httpx ASGI transport, startup and shutdown
+hooks included) against mongomock-motor or a real mongod, with a fake
+inference client in place of the LLM. Registers --users users, then drives
+a weighted mix of requests from --concurrency workers for --duration seconds
+and writes p50/p95/p99 latency and requests per second per endpoint as JSON.
+
+    pip install -r benchmarks/requirements.txt
+    python -m benchmarks.run --duration 20 --concurrency 32 --output bench.json
+    python -m benchmarks.run --mongo-uri mongodb://localhost:27017 --llm-latency-ms 1500
+    python -m benchmarks.run --baseline bench.json --max-regression 0.25
+
+Run from the backend directory. With --baseline, p95 latencies are compared
+against an earlier result and the exit code is 1 if any endpoint is slower
+by more than --max-regression.
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+import numpy as np
+
+PROFILE = {
+    "age": 34,
+    "gender": "female",
+    "weight": 72.0,
+    "height": 176.0,
+    "dietary_preferences": ["vegetarian"],
+    "existing_conditions": [],
+}
+# The first two are planned by the fast path, the others go to the (fake) LLM.
+PLAN_GOALS = [
+    "lose weight",
+    "build muscle",
+    "plan my week around a desk job and weekend hikes",
+    "help me have more energy in the afternoons",
+]
+
+DEFAULT_MIX = "login=5,me=15,profile_get=20,profile_put=5,mealplan=25,workoutplan=10,plan=10"
+
+
+@dataclass
+class User:
+    username: str
+    headers: Dict[str, str]
+
+
+@dataclass
+class Operation:
+    label: str
+    call: Callable[[Any, User, random.Random], Awaitable[Any]]
+
+
+def _operations() -> Dict[str, Operation]:
+    async def login(c, user, rng):
+        return await c.post("/api/auth/login", json={"username": user.username, "password": "benchmark"})
+
+    async def profile_put(c, user, rng):
+        body = {**PROFILE, "weight": round(rng.uniform(55, 95), 1)}
+        return await c.post("/api/health/profile", json=body, headers=user.headers)
+
+    async def plan(c, user, rng):
+        return await c.post("/api/health/plan", json={"goal": rng.choice(PLAN_GOALS)}, headers=user.headers)
+
+    return {
+        "login": Operation("POST /api/auth/login", login),
+        "me": Operation("GET /api/auth/me", lambda c, u, r: c.get("/api/auth/me", headers=u.headers)),
+        "profile_get": Operation(
+            "GET /api/health/profile", lambda c, u, r: c.get("/api/health/profile", headers=u.headers)
+        ),
+        "profile_put": Operation("POST /api/health/profile", profile_put),
+        "mealplan": Operation(
+            "GET /api/health/mealplan", lambda c, u, r: c.get("/api/health/mealplan", headers=u.headers)
+        ),
+        "workoutplan": Operation(
+            "GET /api/health/workoutplan", lambda c, u, r: c.get("/api/health/workoutplan", headers=u.headers)
+        ),
+        "plan": Operation("POST /api/health/plan", plan),
+    }
+
+
+def parse_mix(mix: str) -> List[Tuple[Operation, float]]:
+    operations = _operations()
+    out = []
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        if name.strip() not in operations:
+            raise SystemExit(f"Unknown operation '{name}', expected one of {sorted(operations)}")
+        out.append((operations[name.strip()], float(weight or 1)))
+    return out
+
+
+def summarize(latencies: List[float], errors: int, seconds: float) -> Dict[str, Any]:
+    ms = np.asarray(latencies) * 1000
+    p50, p95, p99 = np.percentile(ms, [50, 95, 99]) if len(ms) else (0.0, 0.0, 0.0)
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / seconds, 2),
+        "p50_ms": round(float(p50), 3),
+        "p95_ms": round(float(p95), 3),
+        "p99_ms": round(float(p99), 3),
+        "mean_ms": round(float(ms.mean()), 3) if len(ms) else 0.0,
+        "max_ms": round(float(ms.max()), 3) if len(ms) else 0.0,
+    }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+async def setup_users(client, count: int, concurrency: int) -> List[User]:
+    semaphore = asyncio.Semaphore(concurrency)
+    run_id = f"{os.getpid()}{int(time.time())}"
+
+    async def one(i: int) -> User:
+        username = f"bench{run_id}_{i}"
+        async with semaphore:
+            r = await client.post(
+                "/api/auth/register",
+                json={"username": username, "email": f"{username}@example.com", "password": "benchmark"},
+            )
+            r.raise_for_status()
+            r = await client.post("/api/auth/login", json={"username": username, "password": "benchmark"})
+            r.raise_for_status()
+            headers = {"Authorization": f"Bearer {r.json()['access_token']}"}
+            r = await client.post("/api/health/profile", json=PROFILE, headers=headers)
+            r.raise_for_status()
+        return User(username, headers)
+
+    return await asyncio.gather(*(one(i) for i in range(count)))
+
+
+async def drive(
+    client, users: List[User], mix: List[Tuple[Operation, float]], concurrency: int, seconds: float
+) -> Tuple[Dict[str, List[float]], Dict[str, int], float]:
+    latencies: Dict[str, List[float]] = {op.label: [] for op, _ in mix}
+    errors: Dict[str, int] = {op.label: 0 for op, _ in mix}
+    operations = [op for op, _ in mix]
+    weights = [w for _, w in mix]
+    started = time.perf_counter()
+    deadline = started + seconds
+
+    async def worker(seed: int) -> None:
+        rng = random.Random(seed)
+        while time.perf_counter() < deadline:
+            op = rng.choices(operations, weights)[0]
+            t0 = time.perf_counter()
+            try:
+                r = await op.call(client, rng.choice(users), rng)
+                failed = r.status_code >= 400
+            except Exception:
+                failed = True
+            latencies[op.label].append(time.perf_counter() - t0)
+            errors[op.label] += failed
+
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    return latencies, errors, time.perf_counter() - started
+
+
+async def benchmark(args: argparse.Namespace) -> Dict[str, Any]:
+    import httpx
+
+    from app import dependencies, indexes, lmm_client
+    from app.database import database
+    from app.llm_cache import llm_cache
+    from app.main import app
+    from app.orchestration.fast_path import fast_path_planner
+
+    from .fakes import FakeInferenceClient
+
+    if args.mongo_uri:
+        mongo = "mongod"
+    else:
+        from mongomock_motor import AsyncMongoMockClient
+
+        mongo = "mongomock"
+        database.connect(dependencies.settings, client=AsyncMongoMockClient())
+        # mongomock has no time-series collections; daily_logs stays a plain one.
+        indexes.TIMESERIES_COLLECTIONS = {}
+
+    fake_llm = FakeInferenceClient(args.llm_latency_ms, args.llm_jitter_ms)
+    lmm_client._client = fake_llm
+    mix = parse_mix(args.mix)
+
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            users = await setup_users(client, args.users, args.concurrency)
+            if args.warmup > 0:
+                await drive(client, users, mix, args.concurrency, args.warmup)
+            latencies, errors, seconds = await drive(client, users, mix, args.concurrency, args.duration)
+            server = {
+                "llm_calls": fake_llm.calls,
+                "llm_cache": llm_cache.stats(),
+                "fast_path": fast_path_planner.stats(),
+            }
+        if args.mongo_uri:
+            await database.client.drop_database(database.database_name)
+
+    all_latencies = [x for values in latencies.values() for x in values]
+    return {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "mongo": mongo,
+            "config": {
+                "users": args.users,
+                "concurrency": args.concurrency,
+                "duration_seconds": args.duration,
+                "warmup_seconds": args.warmup,
+                "llm_latency_ms": args.llm_latency_ms,
+                "llm_jitter_ms": args.llm_jitter_ms,
+                "mix": args.mix,
+            },
+        },
+        "endpoints": {
+            label: summarize(values, errors[label], seconds)
+            for label, values in sorted(latencies.items())
+        },
+        "total": summarize(all_latencies, sum(errors.values()), seconds),
+        "server": server,
+    }
+
+
+def compare(result: Dict[str, Any], baseline: Dict[str, Any], max_regression: float) -> bool:
+    """Print p95 changes against `baseline`; False if any regressed too far."""
+    ok = True
+    print(f"{'endpoint':32} {'base p95':>10} {'p95':>10} {'change':>8}", file=sys.stderr)
+    for label, stats in result["endpoints"].items():
+        before = baseline.get("endpoints", {}).get(label)
+        if not before or not before["p95_ms"]:
+            continue
+        change = stats["p95_ms"] / before["p95_ms"] - 1
+        flag = ""
+        if change > max_regression:
+            ok, flag = False, "  REGRESSION"
+        print(
+            f"{label:32} {before['p95_ms']:>10.2f} {stats['p95_ms']:>10.2f} {change:>+8.1%}{flag}",
+            file=sys.stderr,
+        )
+    return ok
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--duration", type=float, default=10.0, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=2.0, help="unmeasured seconds first")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"operation weights (default {DEFAULT_MIX})")
+    parser.add_argument("--llm-latency-ms", type=float, default=500.0)
+    parser.add_argument("--llm-jitter-ms", type=float, default=100.0)
+    parser.add_argument("--mongo-uri", default="", help="use this mongod instead of mongomock")
+    parser.add_argument("--bcrypt-rounds", type=int, default=None, help="defaults to BCRYPT_ROUNDS")
+    parser.add_argument("--output", default="", help="write the JSON result here (default: stdout)")
+    parser.add_argument("--baseline", default="", help="earlier result to compare p95 latencies with")
+    parser.add_argument("--max-regression", type=float, default=0.2)
+    parser.add_argument("--verbose", action="store_true", help="keep the server's console output")
+    args = parser.parse_args()
+
+    # Settings are read when the app is imported, so configure them first.
+    os.environ["MONGODB_URI"] = args.mongo_uri or "mongodb://benchmark.invalid"
+    os.environ["DATABASE_NAME"] = f"bench_{os.getpid()}" if args.mongo_uri else "benchmark"
+    os.environ["NOTIFICATION_DISPATCHER_ENABLED"] = "false"
+    os.environ["PLAN_JOB_WORKER_IN_PROCESS"] = "false"
+    for name, value in (
+        ("JWT_SECRET_KEY", "benchmark"),
+        ("HF_PROVIDER", "fake"),
+        ("HF_API_TOKEN", "fake"),
+        ("HF_MODEL_NAME", "fake"),
+    ):
+        os.environ.setdefault(name, value)
+    if args.bcrypt_rounds is not None:
+        os.environ["BCRYPT_ROUNDS"] = str(args.bcrypt_rounds)
+
+    with contextlib.ExitStack() as quiet:
+        if not args.verbose:
+            quiet.enter_context(contextlib.redirect_stdout(io.StringIO()))
+            quiet.enter_context(contextlib.redirect_stderr(io.StringIO()))
+        result = asyncio.run(benchmark(args))
+
+    text = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if not compare(result, baseline, args.max_regression):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
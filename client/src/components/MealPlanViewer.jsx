@@ -8,7 +8,7 @@ export default function MealPlanViewer() {
 
   useEffect(() => {
     api
-      .post("/health/mealplan")
+      .get("/health/mealplan")
       .then((res) => setPlan(res.data))
       .catch((err) =>
         setError(err.response?.data?.detail || "Failed to load meal plan")
@@ -8,8 +8,8 @@ export default function WorkoutPlanViewer() {
 
   useEffect(() => {
     api
-      .post("/health/plan", { goal: "" })
-      .then((res) => setPlan(res.data.workout_plan))
+      .get("/health/workoutplan")
+      .then((res) => setPlan(res.data.days))
       .catch((err) =>
         setError(err.response?.data?.detail || "Failed to load workout plan")
       );
@@ -37,22 +37,19 @@ export default function WorkoutPlanViewer() {
             animate={{ opacity: 1, y: 0 }}
             transition={{ duration: 0.3, delay: dayObj.day * 0.05 }}
           >
-            <h3 className="text-xl font-medium mb-2">Day {dayObj.day}</h3>
-            <p className="mb-2">
-              <span className="font-semibold">Warm-up:</span> {dayObj.warmup}
-            </p>
+            <h3 className="text-xl font-medium mb-2">
+              Day {dayObj.day}
+              {dayObj.focus ? ` — ${dayObj.focus}` : ""}
+            </h3>
             <p className="font-semibold">Exercises:</p>
             <ul className="list-disc ml-5 mb-2">
               {dayObj.exercises.map((ex, i) => (
                 <li key={i}>
-                  {ex.name} — {ex.sets} (rest {ex.rest})
+                  {ex.name} — {ex.reps || ex.duration}
+                  {ex.rest ? ` (rest ${ex.rest})` : ""}
                 </li>
               ))}
             </ul>
-            <p>
-              <span className="font-semibold">Cool-down:</span>{" "}
-              {dayObj.cooldown}
-            </p>
           </motion.div>
         ))}
       </div>